@@ -1,26 +1,284 @@
-import requests
+"""Sync remote assets listed in assets.json into the project and prototypes.
+
+assets.json holds {"targets": [public dirs], "assets": [entries]}. Each
+entry is {"url", "path"[, "fallback"]}; `path` is relative to every
+target and `fallback` is tried when `url` returns 404. Target paths are
+relative to the manifest.
+
+    python download_assets.py [--manifest assets.json] [--workers 8] [--force]
+                              [--link hardlink|symlink]
+
+Connections are pooled in one session and assets are fetched a few at a
+time. The ETag and Last-Modified of every download are kept per path in
+node_modules/.cache/download-assets.json and sent back as If-None-Match /
+If-Modified-Since, so an unchanged asset costs a single 304.
+
+Bodies are streamed into a content-addressed store (.asset-store/ at the
+repository root) under their SHA-256, so a logo shared by several
+prototypes is stored once. Each target gets the asset at `path`, plus an
+immutable copy at hashed/<path with the hash in the name>, both as
+hardlinks to the blob (symlinks across filesystems), and an
+asset-manifest.json mapping `path` to the hashed URL. The apps serve
+/hashed/* with a year-long immutable Cache-Control.
+"""
+
+import argparse
+import hashlib
+import json
 import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+ROOT = Path(__file__).resolve().parent
+MANIFEST_PATH = ROOT / 'assets.json'
+CACHE_PATH = ROOT / 'node_modules' / '.cache' / 'download-assets.json'
+STORE_DIR = ROOT.parent / '.asset-store'
+
+# Served with `Cache-Control: immutable` (see next.config.ts).
+HASHED_DIR = 'hashed'
+TARGET_MANIFEST = 'asset-manifest.json'
+HASH_LENGTH = 10
+LINK_MODES = ('hardlink', 'symlink')
+
+WORKERS = 8
+TIMEOUT = (5, 30)  # connect, read (seconds)
+CHUNK_SIZE = 64 * 1024
+
+# mkstemp() creates files as 0600; blobs get the usual umask-based mode,
+# minus write access: every hardlink shares the blob's inode.
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+def load_json(path: Path, default):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def make_session(workers: int) -> requests.Session:
+    """One session whose connection pool fits every worker."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = 'adapty-asset-sync'
+    return session
+
+
+def conditional_headers(entry: dict) -> dict:
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def blob_path(store: Path, digest: str, suffix: str) -> Path:
+    return store / digest[:2] / f'{digest}{suffix}'
+
 
-assets = [
-    {
-        "url": "https://adapty.io/assets/uploads/2023/12/adapty-logo-color.svg",
-        "path": "/Users/kirniy/dev/adapty-pt2/public/logos/adapty-logo-color.svg"
-    },
-    {
-        "url": "https://adapty.io/assets/uploads/2023/12/adapty-logo-black.svg", 
-        # Guessing this URL based on naming convention, if fail, we use color
-        "path": "/Users/kirniy/dev/adapty-pt2/public/logos/adapty-logo-black.svg"
-    }
-]
-
-for asset in assets:
+def stream_to_store(response: requests.Response, store: Path, suffix: str):
+    """Write the body into the store under its SHA-256; returns (digest, size).
+
+    The body goes to a temporary file first and is renamed into place, so
+    a blob that exists is always complete.
+    """
+    tmp_dir = store / 'tmp'
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=tmp_dir, suffix='.part')
+    digest = hashlib.sha256()
+    size = 0
     try:
-        r = requests.get(asset["url"])
-        if r.status_code == 200:
-            with open(asset["path"], 'wb') as f:
-                f.write(r.content)
-            print(f"Downloaded: {asset['path']}")
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        blob = blob_path(store, digest.hexdigest(), suffix)
+        if blob.exists():
+            os.unlink(tmp)
         else:
-            print(f"Failed to download {asset['url']}: Status {r.status_code}")
-    except Exception as e:
-        print(f"Error downloading {asset['url']}: {e}")
+            blob.parent.mkdir(exist_ok=True)
+            os.chmod(tmp, 0o444 & ~UMASK)
+            os.replace(tmp, blob)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return digest.hexdigest(), size
+
+
+def store_bytes(store: Path, data: bytes, suffix: str) -> str:
+    """Put `data` into the store under its SHA-256; returns the digest."""
+    digest = hashlib.sha256(data).hexdigest()
+    blob = blob_path(store, digest, suffix)
+    if not blob.exists():
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=blob.parent, suffix='.part')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp, 0o444 & ~UMASK)
+        os.replace(tmp, blob)
+    return digest
+
+
+def fetch(session: requests.Session, asset: dict, cached: dict, store: Path, force: bool = False):
+    """Fetch one asset into the store; returns (status, cache entry or None, bytes downloaded).
+
+    status is 'downloaded', 'unchanged' or 'failed: <reason>'. `cached` is
+    the asset's cache entry; its validators are only sent for the URL that
+    produced the stored blob.
+    """
+    suffix = Path(asset['path']).suffix
+    for url in filter(None, (asset['url'], asset.get('fallback'))):
+        usable = (not force and cached.get('url') == url and 'sha256' in cached
+                  and blob_path(store, cached['sha256'], suffix).exists())
+        entry = cached if usable else {}
+        try:
+            with session.get(url, headers=conditional_headers(entry), timeout=TIMEOUT,
+                             stream=True) as response:
+                if response.status_code == 304:
+                    return 'unchanged', entry, 0
+                if response.status_code == 404 and url != asset.get('fallback') and asset.get('fallback'):
+                    continue
+                if response.status_code != 200:
+                    return f'failed: status {response.status_code} from {url}', None, 0
+                digest, size = stream_to_store(response, store, suffix)
+                entry = {'url': url, 'etag': response.headers.get('ETag'),
+                         'last_modified': response.headers.get('Last-Modified'), 'sha256': digest}
+                return 'downloaded', {key: value for key, value in entry.items() if value}, size
+        except (requests.RequestException, OSError) as e:
+            return f'failed: {e}', None, 0
+    return f"failed: status 404 from {asset['url']}", None, 0
+
+
+def hashed_name(path: str, digest: str) -> str:
+    """'logos/a.svg' -> 'hashed/logos/a.<hash>.svg'."""
+    path = Path(path)
+    return f"{HASHED_DIR}/{path.with_name(f'{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}').as_posix()}"
+
+
+def place(blob: Path, dest: Path, mode: str = 'hardlink') -> bool:
+    """Make `dest` a link to `blob`; returns False if it already was one.
+
+    Hardlinks fall back to relative symlinks when the store is on another
+    filesystem. The link is created beside `dest` and renamed over it.
+    """
+    if dest.exists() and dest.samefile(blob):
+        return False
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f'.{dest.name}.{os.getpid()}.link')
+    if tmp.is_symlink() or tmp.exists():
+        tmp.unlink()
+    try:
+        if mode != 'hardlink':
+            raise OSError('symlink requested')
+        os.link(blob, tmp)
+    except OSError:
+        os.symlink(os.path.relpath(blob, dest.parent), tmp)
+    os.replace(tmp, dest)
+    return True
+
+
+def link_targets(assets, cache: dict, targets, store: Path, mode: str = 'hardlink'):
+    """Link every stored (or optimized) asset into each target; returns the number of links changed."""
+    changed = 0
+    for target in targets:
+        manifest = load_json(target / TARGET_MANIFEST, {})
+        for asset in assets:
+            entry = cache.get(asset['path'], {})
+            # optimize_assets.py records a smaller 'served' blob for the same download.
+            digest = entry.get('served') or entry.get('sha256')
+            if not digest:
+                continue
+            blob = blob_path(store, digest, Path(asset['path']).suffix)
+            hashed = hashed_name(asset['path'], digest)
+            changed += place(blob, target / asset['path'], mode)
+            changed += place(blob, target / hashed, mode)
+            manifest[asset['path']] = f'/{hashed}'
+        save_json(target / TARGET_MANIFEST, manifest)
+    return changed
+
+
+def load_manifest(path: Path):
+    """(assets, targets) from assets.json; a bare list means the manifest's own directory."""
+    data = load_json(path, None)
+    if data is None:
+        raise SystemExit(f'Cannot read manifest {path}')
+    if isinstance(data, list):
+        data = {'targets': ['.'], 'assets': data}
+    targets = [(path.parent / target).resolve() for target in data.get('targets', ['.'])]
+    return data['assets'], targets
+
+
+def sync(assets, targets, cache_path: Path = CACHE_PATH, store: Path = STORE_DIR,
+         workers: int = WORKERS, force: bool = False, mode: str = 'hardlink') -> int:
+    """Fetch every asset into the store and link it into `targets`; returns the number that failed."""
+    cache = load_json(cache_path, {})
+    failed = 0
+    total = 0
+    with make_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch, session, asset, cache.get(asset['path'], {}), store, force): asset
+                   for asset in assets}
+        for future in as_completed(futures):
+            asset = futures[future]
+            status, entry, size = future.result()
+            if status.startswith('failed'):
+                failed += 1
+                print(f"Failed {asset['path']}: {status[len('failed: '):]}")
+                continue
+            cache[asset['path']] = entry
+            total += size
+            if status == 'downloaded':
+                print(f"Downloaded: {asset['path']} ({size / 1024:.1f} KB)")
+            else:
+                print(f"Unchanged:  {asset['path']}")
+    save_json(cache_path, cache)
+
+    changed = link_targets(assets, cache, targets, store, mode)
+    blobs = {blob_path(store, cache[asset['path']]['sha256'], Path(asset['path']).suffix)
+             for asset in assets if 'sha256' in cache.get(asset['path'], {})}
+    stored = sum(blob.stat().st_size for blob in blobs)
+    print(f"\n{len(assets) - failed}/{len(assets)} asset(s) in sync, {total / 1024:.1f} KB downloaded")
+    print(f"Store: {len(blobs)} blob(s), {stored / 1024:.1f} KB, linked into {len(targets)} "
+          f"target(s) ({changed} link(s) updated)")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--manifest', type=Path, default=MANIFEST_PATH)
+    parser.add_argument('--store', type=Path, default=STORE_DIR,
+                        help=f'content-addressed blob store (default: {STORE_DIR})')
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help=f'concurrent downloads (default: {WORKERS})')
+    parser.add_argument('--force', action='store_true',
+                        help='ignore cached ETags and download everything')
+    parser.add_argument('--link', choices=LINK_MODES, default='hardlink',
+                        help='how blobs are placed into targets (default: hardlink, '
+                             'symlink across filesystems)')
+    args = parser.parse_args(argv)
+
+    assets, targets = load_manifest(args.manifest)
+    failed = sync(assets, targets, store=args.store, workers=max(1, args.workers), force=args.force,
+                  mode=args.link)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Optimize the assets synced by download_assets.py, across a process pool.
+
+    python download_assets.py && python optimize_assets.py [--workers N] [--force]
+
+- SVGs are minified (comments, metadata, editor namespaces, inter-tag
+  whitespace and excess decimal places removed); the smaller file is what
+  the targets serve from then on.
+- Raster images get WebP and AVIF variants at the fixed WIDTHS no wider
+  than the source. AVIF needs a Pillow with AVIF support (Pillow 11.3+
+  built with libavif, or pip install pillow-avif-plugin); it is skipped
+  otherwise.
+
+Outputs go into the same content-addressed store and are linked into each
+target under hashed/. Every target gets an image-manifest.json with the
+intrinsic size and each variant's URL, size and bytes, ready for srcset.
+Work is keyed by the source blob's hash, so unchanged sources are skipped.
+"""
+
+import argparse
+import io
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from download_assets import (CACHE_PATH, MANIFEST_PATH, STORE_DIR, blob_path, hashed_name,
+                             link_targets, load_json, load_manifest, place, save_json, store_bytes)
+
+STATE_PATH = CACHE_PATH.with_name('optimize-assets.json')
+IMAGE_MANIFEST = 'image-manifest.json'
+
+RASTER_SUFFIXES = ('.png', '.jpg', '.jpeg', '.webp', '.gif')
+WIDTHS = (320, 640, 960, 1280, 1920)
+VARIANT_FORMATS = {'webp': {'quality': 80, 'method': 6}, 'avif': {'quality': 60}}
+
+SVG_REMOVE = [
+    re.compile(r'<\?xml[^>]*\?>'),
+    re.compile(r'<!DOCTYPE[^>]*>', re.I),
+    re.compile(r'<!--.*?-->', re.S),
+    re.compile(r'<metadata\b.*?</metadata>', re.S),
+    re.compile(r'<(sodipodi|inkscape):[\w-]+\b[^>]*?(/>|>.*?</\1:[\w-]+>)', re.S),
+    re.compile(r'\s(?:xmlns:)?(?:sodipodi|inkscape|sketch|serif)(?::[\w-]+)?="[^"]*"'),
+]
+# Path data and transforms rarely need more than three decimals at icon sizes.
+# Numbers are matched whole, left to right, so "1.5.25" splits as 1.5 and .25.
+SVG_NUMBER = re.compile(r'(?:\d*\.(\d+)|\d+)([eE][-+]?\d+)?')
+SVG_DECIMALS = 3
+SVG_BETWEEN_TAGS = re.compile(r'>\s+<')
+
+
+def round_number(match: re.Match) -> str:
+    """Round one SVG number to SVG_DECIMALS places; exponent forms are left alone."""
+    number, decimals, exponent = match.group(0), match.group(1), match.group(2)
+    if exponent or not decimals or len(decimals) <= SVG_DECIMALS:
+        return number
+    rounded = f'{float(number):.{SVG_DECIMALS}f}'.rstrip('0').rstrip('.')
+    if rounded.startswith('0.') and number.startswith('.'):
+        rounded = rounded[1:]
+    if '.' not in rounded:
+        # A whole number would merge with a neighbour written without a separator ("0.5.99999").
+        text, start, end = match.string, match.start(), match.end()
+        if start and (text[start - 1].isdigit() or text[start - 1] == '.'):
+            rounded = f' {rounded}'
+        if text[end:end + 1] == '.':
+            rounded = f'{rounded} '
+    return rounded
+
+
+def minify_svg(text: str) -> str:
+    for pattern in SVG_REMOVE:
+        text = pattern.sub('', text)
+    text = SVG_NUMBER.sub(round_number, text)
+    # Whitespace between tags is significant inside <text>.
+    if '<text' not in text:
+        text = SVG_BETWEEN_TAGS.sub('><', text)
+    return text.strip()
+
+
+def register_avif():
+    """Load the pillow-avif-plugin if installed; each worker process needs its own import."""
+    try:
+        import pillow_avif  # noqa: F401
+    except ImportError:
+        pass
+
+
+def avif_supported() -> bool:
+    from PIL import Image
+    register_avif()
+    # Image.SAVE only lists the built-in plugins once they have been loaded.
+    Image.init()
+    return 'AVIF' in Image.SAVE
+
+
+def optimize(source: str, suffix: str, store: str, formats) -> dict:
+    """Optimize one stored blob; runs in a worker process.
+
+    Returns {'served': digest or None, 'width', 'height', 'variants': [...]}.
+    """
+    store = Path(store)
+    data = blob_path(store, source, suffix).read_bytes()
+    if suffix.lower() == '.svg':
+        minified = minify_svg(data.decode('utf-8')).encode('utf-8')
+        if len(minified) >= len(data):
+            return {'served': None, 'bytes': len(data), 'variants': []}
+        return {'served': store_bytes(store, minified, suffix), 'bytes': len(minified),
+                'variants': []}
+
+    from PIL import Image
+    if 'avif' in formats:
+        register_avif()
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        width, height = image.size
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or 'A' in image.mode else 'RGB')
+        variants = []
+        for target_width in [w for w in WIDTHS if w < width] + [width]:
+            target_height = max(1, round(height * target_width / width))
+            resized = (image if target_width == width
+                       else image.resize((target_width, target_height), Image.LANCZOS))
+            for fmt in formats:
+                buffer = io.BytesIO()
+                resized.save(buffer, fmt.upper(), **VARIANT_FORMATS[fmt])
+                encoded = buffer.getvalue()
+                variants.append({'format': fmt, 'width': target_width, 'height': target_height,
+                                 'bytes': len(encoded), 'sha256': store_bytes(store, encoded, f'.{fmt}')})
+    return {'served': None, 'width': width, 'height': height, 'bytes': len(data),
+            'variants': variants}
+
+
+def work_key(source: str, suffix: str, formats) -> str:
+    """State key: the source blob plus what is produced from it."""
+    return f"{source}{suffix}:{'min' if suffix.lower() == '.svg' else ','.join(formats)}"
+
+
+def variant_name(path: str, variant: dict) -> str:
+    """'logos/a.png' + 640w webp -> 'hashed/logos/a-640w.<hash>.webp'."""
+    path = Path(path)
+    return hashed_name(path.with_name(f"{path.stem}-{variant['width']}w.{variant['format']}").as_posix(),
+                       variant['sha256'])
+
+
+def run(assets, targets, cache_path: Path = CACHE_PATH, store: Path = STORE_DIR,
+        state_path: Path = STATE_PATH, workers: int = None, force: bool = False):
+    cache = load_json(cache_path, {})
+    state = load_json(state_path, {})
+    formats = ['webp'] + (['avif'] if avif_supported() else [])
+    if 'avif' not in formats:
+        print("AVIF variants skipped: this Pillow has no AVIF encoder (pip install pillow-avif-plugin)")
+
+    jobs = {}
+    sources = set()
+    for asset in assets:
+        source = cache.get(asset['path'], {}).get('sha256')
+        suffix = Path(asset['path']).suffix
+        if not source or suffix.lower() not in ('.svg', *RASTER_SUFFIXES):
+            continue
+        key = work_key(source, suffix, formats)
+        sources.add(key)
+        done = state.get(key)
+        outputs = ([(done['served'], suffix)] if done and done['served'] else []) + [
+            (variant['sha256'], f".{variant['format']}") for variant in (done or {}).get('variants', [])]
+        if done and not force and all(blob_path(store, *output).exists() for output in outputs):
+            continue
+        jobs[key] = (source, suffix)
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {key: pool.submit(optimize, source, suffix, str(store), formats)
+                       for key, (source, suffix) in jobs.items()}
+            for key, future in futures.items():
+                try:
+                    state[key] = future.result()
+                except Exception as e:
+                    print(f"Failed {key.split(':')[0]}: {e}")
+        save_json(state_path, state)
+
+    images = {}
+    saved = 0
+    for asset in assets:
+        entry = cache.get(asset['path'], {})
+        suffix = Path(asset['path']).suffix
+        result = state.get(work_key(entry.get('sha256'), suffix, formats))
+        if not result:
+            continue
+        if result['served']:
+            entry['served'] = result['served']
+            saved += blob_path(store, entry['sha256'], suffix).stat().st_size - result['bytes']
+        if result['variants']:
+            images[asset['path']] = result
+    save_json(cache_path, cache)
+
+    # Re-link so targets serve the minified SVGs, then add the variants.
+    link_targets(assets, cache, targets, store)
+    for target in targets:
+        manifest = load_json(target / IMAGE_MANIFEST, {})
+        for path, result in images.items():
+            variants = []
+            for variant in result['variants']:
+                name = variant_name(path, variant)
+                place(blob_path(store, variant['sha256'], f".{variant['format']}"), target / name)
+                variants.append({'url': f'/{name}', 'format': variant['format'],
+                                 'width': variant['width'], 'height': variant['height'],
+                                 'bytes': variant['bytes']})
+            manifest[path] = {'width': result['width'], 'height': result['height'],
+                              'variants': variants}
+        save_json(target / IMAGE_MANIFEST, manifest)
+
+    variants = sum(len(result['variants']) for result in images.values())
+    print(f"Optimized {len(jobs)} source(s), {len(sources) - len(jobs)} unchanged; {saved / 1024:.1f} KB saved on SVGs, "
+          f"{variants} raster variant(s) for {len(images)} image(s) in {len(targets)} target(s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--manifest', type=Path, default=MANIFEST_PATH)
+    parser.add_argument('--store', type=Path, default=STORE_DIR)
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='re-optimize unchanged sources')
+    args = parser.parse_args(argv)
+
+    assets, targets = load_manifest(args.manifest)
+    run(assets, targets, store=args.store, workers=args.workers, force=args.force)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
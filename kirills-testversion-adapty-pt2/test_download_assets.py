@@ -0,0 +1,180 @@
+"""Tests for download_assets.py against a local HTTP stand-in server.
+
+    python -m unittest test_download_assets    (or: python -m pytest test_download_assets.py)
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+import download_assets
+
+ETAG = '"v1"'
+LAST_MODIFIED = 'Wed, 14 Jan 2026 15:00:00 GMT'
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Serves `routes` {path: (body, headers)}; see the special paths in do_GET."""
+
+    routes = {}
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, dict(self.headers)))
+        if self.path == '/slow.svg':
+            time.sleep(1)
+        if self.path == '/truncated.svg':
+            # Promise more than is sent, then drop the connection.
+            self.send_response(200)
+            self.send_header('Content-Length', '1000')
+            self.end_headers()
+            self.wfile.write(b'<svg>partial')
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        if self.path not in self.routes:
+            self.send_error(404)
+            return
+        body, headers = self.routes[self.path]
+        if ((headers.get('ETag') and self.headers.get('If-None-Match') == headers['ETag'])
+                or (headers.get('Last-Modified')
+                    and self.headers.get('If-Modified-Since') == headers['Last-Modified'])):
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class DownloadAssetsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+        cls.base = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp = Path(self.tmp.name)
+        self.store, self.cache_path, self.target = tmp / 'store', tmp / 'cache.json', tmp / 'public'
+        StandIn.routes = {
+            '/logo.svg': (b'<svg>logo</svg>', {'ETag': ETAG}),
+            '/dated.svg': (b'<svg>dated</svg>', {'Last-Modified': LAST_MODIFIED}),
+            '/fallback.svg': (b'<svg>fallback</svg>', {}),
+            '/slow.svg': (b'<svg>slow</svg>', {}),
+        }
+        StandIn.requests = []
+        # The stand-in is local; no proxy from the environment may get in between.
+        patcher = mock.patch.dict(os.environ, {'NO_PROXY': '127.0.0.1', 'no_proxy': '127.0.0.1'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sync(self, *assets):
+        return download_assets.sync(list(assets), [self.target], self.cache_path, self.store, workers=2)
+
+    def fetch(self, asset, cached=None):
+        with download_assets.make_session(1) as session:
+            return download_assets.fetch(session, asset, cached or {}, self.store)
+
+    def test_downloads_into_store_and_targets(self):
+        asset = {'url': f'{self.base}/logo.svg', 'path': 'logos/logo.svg'}
+        self.assertEqual(self.sync(asset), 0)
+
+        entry = download_assets.load_json(self.cache_path, {})['logos/logo.svg']
+        self.assertEqual(entry['etag'], ETAG)
+        blob = download_assets.blob_path(self.store, entry['sha256'], '.svg')
+        self.assertEqual(blob.read_bytes(), b'<svg>logo</svg>')
+        self.assertEqual((self.target / 'logos/logo.svg').read_bytes(), b'<svg>logo</svg>')
+        hashed = download_assets.hashed_name('logos/logo.svg', entry['sha256'])
+        self.assertTrue((self.target / hashed).samefile(blob))
+        manifest = download_assets.load_json(self.target / download_assets.TARGET_MANIFEST, {})
+        self.assertEqual(manifest['logos/logo.svg'], f'/{hashed}')
+
+    def test_second_sync_is_a_304_by_etag(self):
+        asset = {'url': f'{self.base}/logo.svg', 'path': 'logos/logo.svg'}
+        self.sync(asset)
+        status, entry, size = self.fetch(asset, download_assets.load_json(self.cache_path, {})['logos/logo.svg'])
+        self.assertEqual((status, size), ('unchanged', 0))
+        self.assertEqual(entry['etag'], ETAG)
+        self.assertEqual(StandIn.requests[-1][1].get('If-None-Match'), ETAG)
+
+    def test_second_sync_is_a_304_by_last_modified(self):
+        asset = {'url': f'{self.base}/dated.svg', 'path': 'dated.svg'}
+        self.sync(asset)
+        self.assertEqual(self.sync(asset), 0)
+        self.assertEqual(StandIn.requests[-1][1].get('If-Modified-Since'), LAST_MODIFIED)
+        status, _, size = self.fetch(asset, download_assets.load_json(self.cache_path, {})['dated.svg'])
+        self.assertEqual((status, size), ('unchanged', 0))
+
+    def test_validators_are_dropped_when_the_blob_is_missing(self):
+        asset = {'url': f'{self.base}/logo.svg', 'path': 'logos/logo.svg'}
+        cached = {'url': asset['url'], 'etag': ETAG, 'sha256': '0' * 64}
+        status, _, _ = self.fetch(asset, cached)
+        self.assertEqual(status, 'downloaded')
+        self.assertNotIn('If-None-Match', StandIn.requests[-1][1])
+
+    def test_404_falls_back(self):
+        asset = {'url': f'{self.base}/missing.svg', 'fallback': f'{self.base}/fallback.svg',
+                 'path': 'logos/black.svg'}
+        status, entry, _ = self.fetch(asset)
+        self.assertEqual(status, 'downloaded')
+        self.assertEqual(entry['url'], asset['fallback'])
+        self.assertEqual(download_assets.blob_path(self.store, entry['sha256'], '.svg').read_bytes(),
+                         b'<svg>fallback</svg>')
+        self.assertEqual([path for path, _ in StandIn.requests], ['/missing.svg', '/fallback.svg'])
+
+    def test_404_without_fallback_fails(self):
+        status, entry, _ = self.fetch({'url': f'{self.base}/missing.svg', 'path': 'x.svg'})
+        self.assertTrue(status.startswith('failed: status 404'))
+        self.assertIsNone(entry)
+
+    def test_blob_is_written_to_a_temp_file_and_renamed(self):
+        asset = {'url': f'{self.base}/logo.svg', 'path': 'logos/logo.svg'}
+        with mock.patch('download_assets.os.replace', wraps=os.replace) as replace:
+            _, entry, _ = self.fetch(asset)
+        blob = download_assets.blob_path(self.store, entry['sha256'], '.svg')
+        source, dest = replace.call_args[0]
+        self.assertEqual(Path(dest), blob)
+        self.assertEqual(Path(source).parent, self.store / 'tmp')
+        self.assertEqual(list((self.store / 'tmp').iterdir()), [])
+        self.assertFalse(blob.stat().st_mode & 0o222, 'blobs are read-only')
+
+    def test_truncated_body_leaves_no_blob(self):
+        status, entry, _ = self.fetch({'url': f'{self.base}/truncated.svg', 'path': 'cut.svg'})
+        self.assertTrue(status.startswith('failed'))
+        self.assertIsNone(entry)
+        self.assertEqual(list((self.store / 'tmp').iterdir()), [])
+        self.assertEqual([path for path in self.store.rglob('*') if path.is_file()], [])
+
+    def test_read_timeout_fails_the_asset(self):
+        with mock.patch.object(download_assets, 'TIMEOUT', (2, 0.2)):
+            status, entry, _ = self.fetch({'url': f'{self.base}/slow.svg', 'path': 'slow.svg'})
+        self.assertTrue(status.startswith('failed'), status)
+        self.assertIn('timed out', status.lower())
+        self.assertIsNone(entry)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,6 @@
+"""Report engine: message.md / report.yaml -> PDF for the messages/ folders."""
+
+from pathlib import Path
+
+# messages/, one report folder per subdirectory.
+MESSAGES_DIR = Path(__file__).resolve().parent.parent
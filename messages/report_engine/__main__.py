@@ -0,0 +1,46 @@
+"""Render every report folder under messages/ in one go.
+
+    python -m report_engine [FOLDER ...] [--out DIR] [--jobs N] [--force]
+
+Run from messages/. Folders default to every subdirectory with a
+report.yaml or message.md. Reports without an `output` option are
+written to --out as <folder>.pdf. Reports whose spec, styles, fonts and
+images are unchanged since the last build are skipped; the rest are
+rendered in parallel worker processes.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from report_engine import MESSAGES_DIR
+from report_engine.build import build_all, describe
+from report_engine.spec import find_spec
+
+OUT_DIR = MESSAGES_DIR / '_build'
+
+
+def report_folders(names=()):
+    if names:
+        return [Path(name) if Path(name).is_dir() else MESSAGES_DIR / name for name in names]
+    return sorted(path for path in MESSAGES_DIR.iterdir()
+                  if path.is_dir() and find_spec(path) and path.name != OUT_DIR.name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m report_engine', description=__doc__.split('\n\n')[0])
+    parser.add_argument('folders', nargs='*', help='report folders (default: all under messages/)')
+    parser.add_argument('--out', type=Path, default=OUT_DIR,
+                        help=f'where reports without an `output` option go (default: {OUT_DIR})')
+    parser.add_argument('--jobs', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='rebuild even unchanged reports')
+    args = parser.parse_args(argv)
+
+    stats = build_all([folder.resolve() for folder in report_folders(args.folders)], args.out,
+                      args.jobs, args.force)
+    print(f"\n{describe(stats)}")
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Incremental, parallel rendering of many reports.
+
+Each report's fingerprint covers everything its PDF depends on: the spec
+file, its resolved blocks (git_stats tables change with new commits),
+STYLE_VERSION, the font files and every referenced image or table
+source. Reports whose fingerprint matches the last build (and whose PDF
+still exists) are skipped; the rest are rendered in worker processes, since
+doc.build() is pure Python and single-core.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from report_engine.render import output_path, render
+from report_engine.spec import load_report
+from report_engine.styles import STYLE_VERSION, font_files
+
+FINGERPRINTS = '.fingerprints.json'
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def inputs(report: dict) -> list:
+    """Every file the rendered PDF depends on."""
+    files = [report['spec']]
+    files += [block['path'] for block in report['blocks'] if block['type'] == 'image']
+    files += [block['source'] for block in report['blocks'] if block.get('source')]
+    files += [Path(path) for path in font_files() if path]
+    return files
+
+
+def fingerprint(report: dict, digests: dict) -> str:
+    """Hash of the inputs; `digests` memoizes file hashes shared across reports (fonts)."""
+    digest = hashlib.sha256(f'style:{STYLE_VERSION}'.encode())
+    digest.update(repr(report['blocks']).encode())
+    for path in inputs(report):
+        key = str(path)
+        if key not in digests:
+            digests[key] = file_digest(path) if Path(path).exists() else 'missing'
+        digest.update(f'{key}:{digests[key]}'.encode())
+    return digest.hexdigest()
+
+
+def _build(report: dict, path: str):
+    """Worker: render one report; returns (pages, seconds)."""
+    started = time.perf_counter()
+    pages = render(report, Path(path))
+    return pages, time.perf_counter() - started
+
+
+def load_state(out_dir: Path) -> dict:
+    try:
+        return json.loads((Path(out_dir) / FINGERPRINTS).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(out_dir: Path, state: dict):
+    path = Path(out_dir) / FINGERPRINTS
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def build_all(folders, out_dir: Path, jobs: int = None, force: bool = False) -> dict:
+    """Render the reports in `folders` that changed; prints one line per report.
+
+    Returns {'built', 'hits', 'failed', 'wall', 'render_seconds'}.
+    """
+    started = time.perf_counter()
+    state = load_state(out_dir)
+    digests = {}
+    stats = {'built': 0, 'hits': 0, 'failed': 0, 'render_seconds': 0.0}
+
+    pending = {}
+    for folder in folders:
+        try:
+            report = load_report(folder)
+            path = output_path(report, out_dir)
+            current = fingerprint(report, digests)
+        except Exception as e:
+            stats['failed'] += 1
+            print(f"  FAILED  {folder.name}: {e}")
+            continue
+        previous = state.get(str(folder))
+        if (not force and previous and previous['fingerprint'] == current
+                and previous['output'] == str(path) and path.exists()):
+            stats['hits'] += 1
+            print(f"  hit     {folder.name}: {previous['pages']} page(s), unchanged")
+            continue
+        pending[str(folder)] = (report, path, current)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(jobs or os.cpu_count() or 1, len(pending))) as pool:
+            futures = {pool.submit(_build, report, str(path)): key
+                       for key, (report, path, _) in pending.items()}
+            for future in as_completed(futures):
+                key = futures[future]
+                report, path, current = pending[key]
+                try:
+                    pages, seconds = future.result()
+                except Exception as e:
+                    stats['failed'] += 1
+                    state.pop(key, None)
+                    print(f"  FAILED  {Path(key).name}: {e}")
+                    continue
+                stats['built'] += 1
+                stats['render_seconds'] += seconds
+                state[key] = {'fingerprint': current, 'output': str(path), 'pages': pages}
+                print(f"  built   {Path(key).name}: {pages} page(s) in {seconds:.2f}s -> {path}")
+        save_state(out_dir, state)
+
+    stats['wall'] = time.perf_counter() - started
+    return stats
+
+
+def describe(stats: dict) -> str:
+    total = stats['built'] + stats['hits']
+    hit_rate = f" ({stats['hits'] / total:.0%} hit rate)" if total else ''
+    text = (f"{stats['built']} built, {stats['hits']} up to date{hit_rate}, {stats['failed']} failed "
+            f"in {stats['wall']:.1f}s")
+    if stats['built']:
+        text += f"; {stats['render_seconds']:.1f}s of rendering across workers"
+    return text
@@ -0,0 +1,307 @@
+"""Commit statistics for reports, from a per-commit cache of `git log --numstat`.
+
+    python -m report_engine.gitstats [PATH ...] [--since '15:00 yesterday'] [--until WHEN]
+
+Each repository's commits are cached by SHA (time, parents, per-file
++/- lines) in _build/.gitstats.json. A run streams `git log --numstat`
+for only the commits not reachable from the tips seen last time, so
+after the first run collecting is one short git call; window queries
+then walk the cached parents from HEAD without touching git again.
+
+A PATH may be a repository or a directory inside one (a prototype in
+this monorepo); a directory limits the counts to the files under it.
+In report.yaml the same data becomes a table or a summary paragraph:
+
+    - git_stats: {since: 15:00 yesterday, until: 2026-01-15 12:00,
+                  paths: [../../prototypes/achromatic-proto], format: summary}
+
+Relative times ('15:00 yesterday', '24h', '3 days') count back from
+`until`, so pinning `until` keeps an old report's numbers fixed; without
+it the window ends now and uncommitted changes are listed too.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from report_engine import MESSAGES_DIR
+
+CACHE_PATH = MESSAGES_DIR / '_build' / '.gitstats.json'
+# Tips whose history is already cached; older ones only cost a --not argument.
+MAX_TIPS = 16
+RECORD = '\x1e'
+
+CLOCK = re.compile(r'^(\d{1,2}):(\d{2})$')
+RELATIVE = re.compile(r'^(\d+)\s*(m|min|minutes?|h|hours?|d|days?|w|weeks?)(?:\s+ago)?$')
+UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+
+def git(cwd: Path, *args) -> str:
+    return subprocess.run(['git', '-c', 'core.quotePath=false', *args], cwd=cwd, check=True,
+                          capture_output=True, text=True, encoding='utf-8', errors='replace').stdout
+
+
+def parse_time(text, now: datetime = None) -> datetime:
+    """'now', '2026-01-14 15:00', '15:00 yesterday', 'yesterday', '24h', '3 days ago' -> datetime."""
+    now = now or datetime.now()
+    if isinstance(text, datetime):
+        return text
+    words = str(text).strip().lower().split()
+    if words and words[0] == 'since':
+        words = words[1:]
+    phrase = ' '.join(words)
+    if phrase in ('', 'now'):
+        return now
+    match = RELATIVE.match(phrase)
+    if match:
+        return now - timedelta(**{UNITS[match.group(2)[0]]: int(match.group(1))})
+    day = now.date()
+    clock = None
+    for word in words:
+        if word in ('today', 'yesterday'):
+            day = now.date() - timedelta(days=word == 'yesterday')
+        elif CLOCK.match(word):
+            clock = CLOCK.match(word)
+        else:
+            break
+    else:
+        hour, minute = (int(clock.group(1)), int(clock.group(2))) if clock else (0, 0)
+        moment = datetime(day.year, day.month, day.day, hour, minute)
+        # A bare '15:00' before 15:00 means yesterday's.
+        if moment > now and len(words) == 1:
+            moment -= timedelta(days=1)
+        return moment
+    try:
+        return datetime.fromisoformat(phrase)
+    except ValueError:
+        raise ValueError(f"can't read time {text!r}: use e.g. '15:00 yesterday', '24h' "
+                         f"or '2026-01-14 15:00'")
+
+
+def load_cache(path: Path = CACHE_PATH) -> dict:
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache: dict, path: Path = CACHE_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(cache, separators=(',', ':')))
+    os.replace(tmp, path)
+
+
+def locate(path: Path):
+    """(repository root, path prefix inside it or '') for a repository or a directory in one."""
+    path = Path(path).resolve()
+    try:
+        root = Path(git(path, 'rev-parse', '--show-toplevel').strip())
+    except (OSError, subprocess.CalledProcessError):
+        raise ValueError(f'{path} is not inside a git repository')
+    prefix = path.relative_to(root).as_posix()
+    return root, '' if prefix == '.' else prefix + '/'
+
+
+def collect(root: Path, cache: dict) -> tuple:
+    """Bring the cache for `root` up to HEAD; returns (HEAD sha, commits parsed this run).
+
+    cache[root] = {'tips': [...], 'commits': {sha: [time, [parents], {path: [added, deleted]}]}}
+    Binary files count as changed with 0 lines.
+    """
+    repo = cache.setdefault(str(root), {'tips': [], 'commits': {}})
+    head = git(root, 'rev-parse', 'HEAD').strip()
+    if head in repo['commits']:
+        return head, 0
+
+    commits = repo['commits']
+    current = None
+    parsed = 0
+    command = ['git', '-c', 'core.quotePath=false', 'log', '--numstat', '--no-renames',
+               f'--format={RECORD}%H %ct %P', '--ignore-missing', head, '--not', *repo['tips']]
+    with subprocess.Popen(command, cwd=root, stdout=subprocess.PIPE, text=True,
+                          encoding='utf-8', errors='replace') as proc:
+        for line in proc.stdout:
+            if line.startswith(RECORD):
+                sha, time, *parents = line[1:].split()
+                current = commits[sha] = [int(time), parents, {}]
+                parsed += 1
+            elif line.strip() and current is not None:
+                added, deleted, path = line.rstrip('\n').split('\t', 2)
+                current[2][path] = [int(added) if added.isdigit() else 0,
+                                    int(deleted) if deleted.isdigit() else 0]
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, command)
+    repo['tips'] = [head] + [tip for tip in repo['tips'] if tip != head][:MAX_TIPS - 1]
+    return head, parsed
+
+
+def window(commits: dict, head: str, since: float, until: float) -> list:
+    """SHAs reachable from `head` committed in [since, until), newest first."""
+    found = []
+    stack = [head]
+    visited = set()
+    while stack:
+        sha = stack.pop()
+        if sha in visited or sha not in commits:
+            continue
+        visited.add(sha)
+        time, parents, _ = commits[sha]
+        # Like `git log --since`: history behind a commit older than the window is not walked.
+        if time < since:
+            continue
+        if time < until:
+            found.append(sha)
+        stack.extend(parents)
+    return sorted(found, key=lambda sha: commits[sha][0], reverse=True)
+
+
+def totals(changes: dict) -> dict:
+    """{'commits', 'files', 'added', 'deleted'} of {(repository, sha, path): (added, deleted)}."""
+    return {'commits': len({(root, sha) for root, sha, _ in changes}),
+            'files': len({(root, path) for root, _, path in changes}),
+            'added': sum(plus for plus, _ in changes.values()),
+            'deleted': sum(minus for _, minus in changes.values())}
+
+
+def changes(commits: dict, shas, root: str, prefix: str = '') -> dict:
+    """{(root, sha, path): (added, deleted)} for the files under `prefix`; keyed so that
+    several paths' changes merge without counting a commit or file twice."""
+    return {(root, sha, path): tuple(lines) for sha in shas
+            for path, lines in commits[sha][2].items() if path.startswith(prefix)}
+
+
+def uncommitted(root: Path, prefix: str = '') -> dict:
+    """changes() of the working tree against HEAD (sha None), untracked files included."""
+    pathspec = ['--', prefix] if prefix else []
+    found = {}
+    for line in git(root, 'diff', '--numstat', 'HEAD', *pathspec).splitlines():
+        plus, minus, path = line.split('\t', 2)
+        found[(str(root), None, path)] = (int(plus) if plus.isdigit() else 0,
+                                          int(minus) if minus.isdigit() else 0)
+    for path in git(root, 'ls-files', '--others', '--exclude-standard', *pathspec).splitlines():
+        found[(str(root), None, path)] = (0, 0)
+    return found
+
+
+def stats(paths, since='24h', until=None, cache_path: Path = CACHE_PATH) -> list:
+    """One dict per path: totals() plus 'name', 'changes', 'window', and 'pending' and
+    'uncommitted' (the working tree's changes() and totals(); None when `until` is set)."""
+    end = parse_time(until) if until else datetime.now()
+    start = parse_time(since, end)
+    cache = load_cache(cache_path)
+    heads = {}
+    results = []
+    changed = False
+    for path in paths:
+        root, prefix = locate(path)
+        if root not in heads:
+            heads[root], parsed = collect(root, cache)
+            changed = changed or parsed > 0
+        commits = cache[str(root)]['commits']
+        found = changes(commits, window(commits, heads[root], start.timestamp(), end.timestamp()),
+                        str(root), prefix)
+        result = totals(found)
+        pending = None if until else uncommitted(root, prefix)
+        result.update(name=prefix.rstrip('/') or root.name, changes=found, pending=pending,
+                      uncommitted=None if pending is None else totals(pending), window=(start, end))
+        results.append(result)
+    if changed:
+        save_cache(cache, cache_path)
+    return results
+
+
+def _lines(result: dict) -> str:
+    return f"+{result['added']:,}/-{result['deleted']:,}"
+
+
+def _uncommitted(result: dict) -> str:
+    pending = result['uncommitted']
+    return f"{pending['files']} files, {_lines(pending)} lines" if pending else '-'
+
+
+def combined(results) -> dict:
+    """totals() over several results, each commit, file and uncommitted file counted once."""
+    merged = {}
+    pending = {}
+    for result in results:
+        merged.update(result['changes'])
+        pending.update(result['pending'] or {})
+    total = totals(merged)
+    total['uncommitted'] = totals(pending) if any(result['pending'] is not None for result in results) else None
+    return total
+
+
+def table_rows(results) -> list:
+    """Metric/Value rows for one result; a row per result plus a total for several."""
+    if len(results) == 1:
+        result, = results
+        rows = [['Metric', 'Value'], ['Commits', str(result['commits'])],
+                ['Files changed', str(result['files'])], ['Lines added', f"+{result['added']:,}"],
+                ['Lines deleted', f"-{result['deleted']:,}"]]
+        if result['uncommitted']:
+            rows.append(['Uncommitted changes', _uncommitted(result)])
+        return rows
+    rows = [['Path', 'Commits', 'Files', 'Lines', 'Uncommitted']]
+    for result in results:
+        rows.append([result['name'], str(result['commits']), str(result['files']), _lines(result),
+                     _uncommitted(result)])
+    total = combined(results)
+    rows.append(['**Total**', str(total['commits']), str(total['files']), _lines(total),
+                 _uncommitted(total)])
+    return rows
+
+
+def summary(results, label: str) -> str:
+    """'**Git stats (since 15:00):** 13 commits, 59 files changed, ...' for a paragraph."""
+    total = combined(results)
+    text = (f"**Git stats ({label}):** {total['commits']} commits, {total['files']} files changed, "
+            f"+{total['added']:,} lines added, -{total['deleted']:,} deleted.")
+    pending = total['uncommitted']
+    if pending and pending['files']:
+        text += f" Plus {pending['files']} uncommitted files with {_lines(pending)} lines."
+    return text
+
+
+def blocks(options: dict, folder: Path) -> list:
+    """The blocks for a report.yaml `git_stats` entry (see the module docstring)."""
+    paths = options.get('paths') or [options.get('path', '.')]
+    since = options.get('since', '24h')
+    if isinstance(since, int):
+        # YAML 1.1 reads an unquoted 15:00 as the sexagesimal 900.
+        since = f'{since // 60}:{since % 60:02d}'
+    until = options.get('until')
+    results = stats([Path(folder) / path for path in paths], str(since), str(until) if until else None)
+    if options.get('format') == 'summary':
+        return [{'type': 'p', 'text': summary(results, options.get('label') or f'since {since}')}]
+    return [{'type': 'table', 'rows': table_rows(results), 'widths': options.get('widths'),
+             'variant': options.get('variant', 'dark')}]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m report_engine.gitstats',
+                                     description=__doc__.split('\n\n')[0])
+    parser.add_argument('paths', nargs='*', type=Path, default=[Path('.')],
+                        help='repositories or directories inside one (default: .)')
+    parser.add_argument('--since', default='24h', help="window start (default: 24h)")
+    parser.add_argument('--until', help='window end (default: now)')
+    args = parser.parse_args(argv)
+
+    results = stats(args.paths, args.since, args.until)
+    start, end = results[0]['window']
+    print(f"{start:%Y-%m-%d %H:%M} -> {end:%Y-%m-%d %H:%M}")
+    rows = [[cell.replace('*', '') for cell in row] for row in table_rows(results)]
+    widths = [max(len(row[col]) for row in rows) for col in range(len(rows[0]))]
+    for row in rows:
+        print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
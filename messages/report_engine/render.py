@@ -0,0 +1,285 @@
+"""Blocks -> reportlab flowables -> PDF.
+
+Long tables are laid out a page at a time (ChunkedTable) and images are
+embedded at PRINT_DPI through a thumbnail cache, so a report with
+thousands of audit rows or hundreds of 2x screenshots stays bounded in
+memory and size.
+"""
+
+import csv
+import hashlib
+import json
+import math
+import os
+import re
+from functools import lru_cache
+from itertools import chain, islice
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import (Flowable, HRFlowable, Image, PageBreak, Paragraph, Preformatted,
+                                SimpleDocTemplate, Spacer, Table)
+
+from report_engine import MESSAGES_DIR
+from report_engine.styles import ACCENT, fonts, stylesheet, table_style
+
+PAGE_SIZE = A4
+MARGIN = 20 * mm
+FRAME_WIDTH = PAGE_SIZE[0] - 2 * MARGIN
+# Less the frame's 6pt padding top and bottom.
+FRAME_HEIGHT = PAGE_SIZE[1] - 2 * MARGIN - 12
+
+# Tables longer than this are built page by page; a chunk should overfill a page.
+TABLE_CHUNK_ROWS = 100
+PRINT_DPI = 150
+THUMBNAIL_DIR = MESSAGES_DIR / '_build' / '.thumbnails'
+
+HEADING_STYLES = {'title': 'ReportTitle', 'subtitle': 'Subtitle', 'h1': 'SectionHeader',
+                  'h2': 'SubHeader', 'h3': 'MinorHeader', 'p': 'Body', 'quote': 'Quote'}
+
+INLINE = [
+    (re.compile(r'\*\*(.+?)\*\*|__(.+?)__'), lambda m: f'<b>{m.group(1) or m.group(2)}</b>'),
+    (re.compile(r'(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])|(?<!\w)_(?!\s)(.+?)(?<!\s)_(?!\w)'),
+     lambda m: f'<i>{m.group(1) or m.group(2)}</i>'),
+    (re.compile(r'\[([^\]]+)\]\(([^)\s]+)\)'),
+     lambda m: f'<link href="{m.group(2)}" color="{ACCENT}">{m.group(1)}</link>'),
+]
+CODE_SPAN = re.compile(r'`([^`]+)`')
+
+
+def inline(text: str) -> str:
+    """Markdown inline syntax -> reportlab paragraph markup."""
+    text = escape(text)
+    # Code spans are set aside first so their contents stay literal.
+    spans = []
+
+    def keep(match):
+        spans.append(match.group(1))
+        return f'\x00{len(spans) - 1}\x00'
+
+    text = CODE_SPAN.sub(keep, text)
+    for pattern, replace in INLINE:
+        text = pattern.sub(replace, text)
+    mono = fonts()['mono']
+    return re.sub('\x00(\\d+)\x00', lambda m: f'<font face="{mono}">{spans[int(m.group(1))]}</font>', text)
+
+
+def column_widths(rows, width: float = FRAME_WIDTH) -> list:
+    """Widths proportional to each column's longest cell, capped so no column starves.
+
+    One pass over `rows`, so a streamed table is never held in memory.
+    """
+    longest = None
+    for row in rows:
+        lengths = [len(cell) for cell in row]
+        longest = lengths if longest is None else [max(a, b) for a, b in zip(longest, lengths)]
+    if not longest:
+        return []
+    longest = [min(60, length) + 4 for length in longest]
+    return [width * length / sum(longest) for length in longest]
+
+
+def _cell(value) -> str:
+    return '' if value is None else str(value)
+
+
+def table_rows(block: dict):
+    """The header, then the data rows, of a table block: its `rows`, or streamed from
+    its `source` (CSV with a header line, or JSONL records), picking `columns`."""
+    source, columns = block.get('source'), block.get('columns')
+    if source is None:
+        yield from block['rows']
+        return
+    with open(source, newline='', encoding='utf-8') as f:
+        if Path(source).suffix.lower() == '.csv':
+            reader = csv.reader(f)
+            header = next(reader, [])
+            picks = [header.index(column) for column in columns] if columns else range(len(header))
+            yield [header[index] for index in picks]
+            for row in reader:
+                yield [row[index] if index < len(row) else '' for index in picks]
+            return
+        records = (json.loads(line) for line in f if line.strip())
+        first = next(records, None)
+        columns = columns or list(first or [])
+        yield list(columns)
+        for record in chain([first] if first else [], records):
+            yield [_cell(record.get(column)) for column in columns]
+
+
+def _table(rows, widths, variant: str) -> Table:
+    styles = stylesheet()
+    cells = [[Paragraph(inline(cell), styles['TableHeader' if index == 0 else 'TableCell'])
+              for cell in row] for index, row in enumerate(rows)]
+    flowable = Table(cells, colWidths=widths, repeatRows=1)
+    flowable.setStyle(table_style(variant))
+    return flowable
+
+
+class ChunkedTable(Flowable):
+    """A long table built one page at a time from an iterator of rows.
+
+    It never fits as a whole, so the frame asks split() for the part that
+    fits the space left: a Table of the header plus the next rows, cut
+    where the page ends. The rows past the cut go back in front of the
+    iterator for the next page. Only one chunk's Paragraphs exist at a
+    time. The first chunk is TABLE_CHUNK_ROWS rows; later ones are sized
+    from what the last page took, so few Paragraphs are built and thrown
+    away.
+    """
+
+    def __init__(self, header, rows, widths, variant: str = 'dark', chunk: int = TABLE_CHUNK_ROWS):
+        super().__init__()
+        self.header, self.rows, self.widths, self.variant = header, rows, widths, variant
+        self.chunk = chunk
+        self._built = self._split = None
+
+    def wrap(self, availWidth, availHeight):
+        return availWidth, availHeight + 1
+
+    def split(self, availWidth, availHeight):
+        # The iterator is consumed, so a repeated call must get the same answer.
+        if self._split is not None:
+            return self._split
+        if self._built is None:
+            chunk = list(islice(self.rows, self.chunk))
+            following = list(islice(self.rows, 1))
+            self._built = chunk, following, _table([self.header] + chunk, self.widths, self.variant)
+        chunk, following, flowable = self._built
+        # Table.split returns [flowable] when it fits whole, [] when not even one row fits.
+        parts = flowable.split(availWidth, availHeight)
+        if not parts:
+            # Keep the built chunk for the next frame.
+            return []
+        taken = len(chunk) if parts[0] is flowable else len(parts[0]._cellvalues) - 1
+        rest = chain(chunk[taken:], following, self.rows)
+        self._split = [parts[0]]
+        if taken < len(chunk) or following:
+            # Rows differ in height; a little over this page's count still overfills the next.
+            size = self.chunk * 2 if parts[0] is flowable else max(taken + taken // 4, 10)
+            self._split.append(ChunkedTable(self.header, rest, self.widths, self.variant, size))
+        return self._split
+
+    def draw(self):
+        pass
+
+
+def table(block: dict) -> Flowable:
+    """A Table, or a ChunkedTable when the block is streamed or longer than a chunk.
+
+    A block without columns or data rows (say, an empty source) becomes a
+    "No rows." note instead.
+    """
+    variant = block.get('variant', 'dark')
+    rows = table_rows(block)
+    header, first = next(rows, None), next(rows, None)
+    rows.close()
+    if not header or first is None:
+        return Paragraph('No rows.', stylesheet()['Quote'])
+    if block.get('source') is None and len(block['rows']) <= TABLE_CHUNK_ROWS + 1:
+        return _table(block['rows'], block.get('widths') or column_widths(block['rows']), variant)
+    widths = block.get('widths') or column_widths(table_rows(block))
+    rows = table_rows(block)
+    return ChunkedTable(next(rows), rows, widths, variant)
+
+
+def flowables(blocks) -> list:
+    """The story for a list of spec blocks."""
+    styles = stylesheet()
+    story = []
+    for block in blocks:
+        kind = block['type']
+        if kind in HEADING_STYLES:
+            story.append(Paragraph(inline(block['text']), styles[HEADING_STYLES[kind]]))
+        elif kind == 'bullets':
+            for level, text in block['items']:
+                story.append(Paragraph(inline(text), styles['ReportBullet'], bulletText='•')
+                             if level == 0 else
+                             Paragraph(inline(text), _indented(level), bulletText='–'))
+        elif kind == 'table':
+            story.append(table(block))
+            story.append(Spacer(1, 10))
+        elif kind == 'code':
+            story.append(Preformatted(block['text'], styles['ReportCode']))
+        elif kind == 'image':
+            story.append(_image(block))
+        elif kind == 'rule':
+            story.append(HRFlowable(width='100%', thickness=0.5, color=HexColor('#dddddd'),
+                                    spaceBefore=8, spaceAfter=8))
+        elif kind == 'pagebreak':
+            story.append(PageBreak())
+        elif kind == 'spacer':
+            story.append(Spacer(1, block['height']))
+    return story
+
+
+@lru_cache(maxsize=None)
+def _indented(level: int) -> ParagraphStyle:
+    """Bullet style for a nested list level."""
+    base = stylesheet()['ReportBullet']
+    return ParagraphStyle(f'ReportBullet{level}', parent=base, leftIndent=base.leftIndent + 14 * level,
+                          bulletIndent=base.bulletIndent + 14 * level)
+
+
+def thumbnail(path: Path, width: float) -> Path:
+    """`path` downscaled to `width` points at PRINT_DPI, via THUMBNAIL_DIR; `path`
+    itself when it has no more pixels than that. Opaque images become JPEGs."""
+    from PIL import Image as Picture
+
+    pixels = math.ceil(width / 72 * PRINT_DPI)
+    with Picture.open(path) as picture:
+        if picture.width <= pixels:
+            return path
+        alpha = picture.mode in ('RGBA', 'LA', 'PA') or 'transparency' in picture.info
+        stat = path.stat()
+        key = hashlib.sha256(f'{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}:{pixels}'.encode())
+        target = THUMBNAIL_DIR / f"{key.hexdigest()[:24]}{'.png' if alpha else '.jpg'}"
+        if target.exists():
+            return target
+        height = max(1, round(picture.height * pixels / picture.width))
+        # JPEG sources decode straight at a reduced scale.
+        picture.draft('RGB', (pixels, height))
+        picture = picture.convert('RGBA' if alpha else 'RGB').resize((pixels, height), Picture.LANCZOS)
+    THUMBNAIL_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+    picture.save(tmp, 'PNG' if alpha else 'JPEG', **({'optimize': True} if alpha else {'quality': 85}))
+    os.replace(tmp, target)
+    return target
+
+
+def _image(block: dict) -> Image:
+    """An image scaled to `width` points, or to fit the frame, embedded at PRINT_DPI at most."""
+    from PIL import Image as Picture
+
+    path = Path(block['path'])
+    with Picture.open(path) as picture:
+        pixel_width, pixel_height = picture.size
+    width = min(block.get('width') or pixel_width, FRAME_WIDTH)
+    height = pixel_height * width / pixel_width
+    if height > FRAME_HEIGHT:
+        # A full-page capture is shrunk to one page rather than failing the layout.
+        width, height = width * FRAME_HEIGHT / height, FRAME_HEIGHT
+    # lazy=2: the file is opened when drawn and released straight after.
+    return Image(str(thumbnail(path, width)), width=width, height=height, lazy=2)
+
+
+def output_path(report: dict, out_dir: Path) -> Path:
+    """The spec's `output` (relative to its folder), else <out_dir>/<folder>.pdf."""
+    if report.get('output'):
+        return report['folder'] / report['output']
+    return Path(out_dir) / f"{report['folder'].name}.pdf"
+
+
+def render(report: dict, path: Path) -> int:
+    """Write the report's PDF to `path`; returns the page count."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = SimpleDocTemplate(str(path), pagesize=PAGE_SIZE, rightMargin=MARGIN, leftMargin=MARGIN,
+                            topMargin=MARGIN, bottomMargin=MARGIN, title=report['title'],
+                            author=report.get('author', ''))
+    doc.build(flowables(report['blocks']))
+    return doc.page
@@ -0,0 +1,234 @@
+"""Report specs: a folder's report.yaml, or its message.md, as a list of blocks.
+
+Both inputs turn into the same plain dicts, which render.py maps onto
+flowables:
+
+    {'type': 'title' | 'subtitle' | 'h1' | 'h2' | 'h3' | 'p' | 'quote', 'text': str}
+    {'type': 'bullets', 'items': [(level, text)]}
+    {'type': 'table', 'rows': [[str]], 'widths': [pt] or None, 'variant': 'dark' | 'accent'}
+    {'type': 'table', 'rows': None, 'source': Path (.csv or .jsonl), 'columns': [str] or None, ...}
+    {'type': 'code', 'text': str}
+    {'type': 'image', 'path': Path, 'width': pt or None}
+    {'type': 'rule'} | {'type': 'pagebreak'} | {'type': 'spacer', 'height': pt}
+
+Text uses Markdown inline syntax (**bold**, *italic*, `code`, [link](url)).
+
+report.yaml (needs PyYAML) holds the document options and a list of
+one-key blocks (git_stats is computed from the repository, see
+gitstats.py):
+
+    title: Daily Report - January 15, 2026
+    subtitle: Adapty Website Redesign Project
+    output: 2026-01-15-REPORT-Daily-Update.pdf
+    blocks:
+      - h1: SUMMARY
+      - p: Today, after receiving ...
+      - table: {variant: accent, widths: [70, 270, 40], rows: [[App, Port], [Dashboard, '3000']]}
+      - table: {source: ../../prototypes/achromatic-proto/results.jsonl, columns: [label, error]}
+      - pagebreak
+      - git_stats: {since: 15:00 yesterday, until: 2026-01-15 12:00}
+      - markdown: |
+          Any Markdown, parsed like message.md.
+
+message.md may start with `key: value` front matter between two `---`
+lines; its first `#` heading becomes the title.
+"""
+
+import re
+from pathlib import Path
+
+from report_engine import gitstats
+
+SPEC_NAMES = ('report.yaml', 'report.yml', 'message.md')
+
+HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*$')
+BULLET = re.compile(r'^(\s*)(?:[-*+]|\d+[.)])\s+(.*)$')
+IMAGE = re.compile(r'^!\[([^\]]*)\]\(([^)\s]+)(?:\s+"[^"]*")?\)$')
+TABLE_SEPARATOR = re.compile(r'^\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?$')
+RULE = re.compile(r'^(?:-{3,}|\*{3,}|_{3,})$')
+PAGEBREAK = ('<!-- pagebreak -->', '\\pagebreak', '\\newpage')
+
+
+def find_spec(folder: Path):
+    """The spec file of a report folder, or None."""
+    for name in SPEC_NAMES:
+        if (folder / name).is_file():
+            return folder / name
+    return None
+
+
+def split_row(line: str) -> list:
+    return [cell.strip() for cell in line.strip().strip('|').split('|')]
+
+
+def parse_markdown(text: str, folder: Path, first_heading_is_title: bool = True) -> list:
+    """Markdown -> blocks."""
+    blocks = []
+    paragraph = []
+    lines = text.splitlines()
+
+    def flush():
+        if paragraph:
+            blocks.append({'type': 'p', 'text': ' '.join(paragraph)})
+            paragraph.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if not stripped:
+            flush()
+            i += 1
+            continue
+
+        if stripped.startswith('```'):
+            flush()
+            code = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith('```'):
+                code.append(lines[i])
+                i += 1
+            blocks.append({'type': 'code', 'text': '\n'.join(code)})
+            i += 1
+            continue
+
+        if stripped in PAGEBREAK:
+            flush()
+            blocks.append({'type': 'pagebreak'})
+        elif RULE.match(stripped):
+            flush()
+            blocks.append({'type': 'rule'})
+        elif HEADING.match(stripped):
+            flush()
+            hashes, title = HEADING.match(stripped).groups()
+            if len(hashes) == 1 and first_heading_is_title and not any(
+                    block['type'] == 'title' for block in blocks):
+                blocks.append({'type': 'title', 'text': title})
+            else:
+                blocks.append({'type': {1: 'h1', 2: 'h2'}.get(len(hashes), 'h3'), 'text': title})
+        elif IMAGE.match(stripped):
+            flush()
+            blocks.append({'type': 'image', 'path': folder / IMAGE.match(stripped).group(2),
+                           'width': None})
+        elif stripped.startswith('|') and i + 1 < len(lines) and TABLE_SEPARATOR.match(lines[i + 1].strip()):
+            flush()
+            rows = [split_row(stripped)]
+            i += 2
+            while i < len(lines) and lines[i].strip().startswith('|'):
+                rows.append(split_row(lines[i]))
+                i += 1
+            width = len(rows[0])
+            rows = [(row + [''] * width)[:width] for row in rows]
+            blocks.append({'type': 'table', 'rows': rows, 'widths': None, 'variant': 'dark'})
+            continue
+        elif BULLET.match(line):
+            flush()
+            items = []
+            while i < len(lines) and lines[i].strip():
+                match = BULLET.match(lines[i])
+                if match:
+                    items.append((len(match.group(1).expandtabs(4)) // 2, match.group(2)))
+                elif items and lines[i].startswith((' ', '\t')):
+                    # Continuation of the previous item.
+                    level, item = items[-1]
+                    items[-1] = (level, f'{item} {lines[i].strip()}')
+                else:
+                    break
+                i += 1
+            blocks.append({'type': 'bullets', 'items': items})
+            continue
+        elif stripped.startswith('>'):
+            flush()
+            quote = []
+            while i < len(lines) and lines[i].strip().startswith('>'):
+                quote.append(lines[i].strip().lstrip('>').strip())
+                i += 1
+            blocks.append({'type': 'quote', 'text': ' '.join(quote)})
+            continue
+        else:
+            paragraph.append(stripped)
+        i += 1
+    flush()
+    return blocks
+
+
+def front_matter(text: str):
+    """(options, body) for Markdown with `key: value` front matter."""
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != '---':
+        return {}, text
+    for end in range(1, len(lines)):
+        if lines[end].strip() == '---':
+            options = {}
+            for line in lines[1:end]:
+                key, sep, value = line.partition(':')
+                if sep:
+                    options[key.strip()] = value.strip().strip('"\'')
+            return options, '\n'.join(lines[end + 1:])
+    return {}, text
+
+
+def _yaml_blocks(items, folder: Path) -> list:
+    blocks = []
+    for item in items:
+        if isinstance(item, str):
+            item = {item: True}
+        (kind, value), = item.items()
+        if kind == 'markdown':
+            blocks.extend(parse_markdown(value, folder, first_heading_is_title=False))
+        elif kind == 'table':
+            value = value if isinstance(value, dict) else {'rows': value}
+            block = {'type': 'table', 'widths': value.get('widths'), 'variant': value.get('variant', 'dark')}
+            if value.get('source'):
+                # Streamed at render time, so thousands of rows never sit in the spec.
+                block.update(rows=None, source=folder / value['source'], columns=value.get('columns'))
+            else:
+                block['rows'] = [[str(cell) for cell in row] for row in value['rows']]
+            blocks.append(block)
+        elif kind == 'bullets':
+            blocks.append({'type': 'bullets', 'items': [(0, str(text)) for text in value]})
+        elif kind == 'image':
+            value = value if isinstance(value, dict) else {'path': value}
+            blocks.append({'type': 'image', 'path': folder / value['path'], 'width': value.get('width')})
+        elif kind == 'git_stats':
+            blocks.extend(gitstats.blocks(value or {}, folder))
+        elif kind == 'spacer':
+            blocks.append({'type': 'spacer', 'height': float(value)})
+        elif kind in ('pagebreak', 'rule'):
+            blocks.append({'type': kind})
+        elif kind in ('title', 'subtitle', 'h1', 'h2', 'h3', 'p', 'quote', 'code'):
+            blocks.append({'type': kind, 'text': str(value)})
+        else:
+            raise ValueError(f'unknown block type: {kind}')
+    return blocks
+
+
+def load_report(folder: Path) -> dict:
+    """{'folder', 'spec', 'title', 'subtitle', 'author', 'output', 'blocks'} of a report folder."""
+    folder = Path(folder)
+    path = find_spec(folder)
+    if path is None:
+        raise FileNotFoundError(f'no {" / ".join(SPEC_NAMES)} in {folder}')
+    text = path.read_text(encoding='utf-8')
+
+    if path.suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit('YAML report specs need PyYAML: pip install pyyaml')
+        options = yaml.safe_load(text) or {}
+        blocks = _yaml_blocks(options.pop('blocks', []), folder)
+    else:
+        options, body = front_matter(text)
+        blocks = parse_markdown(body, folder)
+
+    # The title (from the options or the first heading) and subtitle lead the document.
+    titles = [block['text'] for block in blocks if block['type'] == 'title']
+    title = options.get('title') or (titles[0] if titles else None)
+    head = [{'type': 'title', 'text': title}] if title else []
+    if options.get('subtitle'):
+        head.append({'type': 'subtitle', 'text': options['subtitle']})
+    blocks = head + [block for block in blocks if block['type'] != 'title']
+    title = title or folder.name
+    return {'folder': folder, 'spec': path, 'title': title, 'subtitle': options.get('subtitle'),
+            'author': options.get('author', ''), 'output': options.get('output'), 'blocks': blocks}
@@ -0,0 +1,119 @@
+"""Fonts, paragraph styles and table styles shared by every report.
+
+Everything here is built once per process and cached: a batch of reports
+reuses the same stylesheet and TableStyle objects instead of rebuilding
+them per document (Table.setStyle copies the commands, so sharing is
+safe). Bump STYLE_VERSION whenever the output of this module or of
+render.py's layout changes.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import TableStyle
+
+STYLE_VERSION = 2
+
+ACCENT = '#6720FF'
+TABLE_HEADERS = {'dark': '#333333', 'accent': ACCENT}
+
+# The reports are mostly Russian; the built-in Helvetica has no Cyrillic.
+# First family whose files all exist wins: regular, bold, italic, bold italic.
+FONT_CANDIDATES = [
+    ['/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+     '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+     '/usr/share/fonts/truetype/dejavu/DejaVuSans-Oblique.ttf',
+     '/usr/share/fonts/truetype/dejavu/DejaVuSans-BoldOblique.ttf'],
+    ['/System/Library/Fonts/Supplemental/Arial.ttf',
+     '/System/Library/Fonts/Supplemental/Arial Bold.ttf',
+     '/System/Library/Fonts/Supplemental/Arial Italic.ttf',
+     '/System/Library/Fonts/Supplemental/Arial Bold Italic.ttf'],
+]
+MONO_CANDIDATES = ['/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf',
+                   '/System/Library/Fonts/Supplemental/Courier New.ttf']
+
+
+@lru_cache(maxsize=None)
+def font_files():
+    """(regular, bold, italic, bold italic, mono) paths that fonts() registers, or None each."""
+    mono = next((path for path in MONO_CANDIDATES if Path(path).exists()), None)
+    for files in FONT_CANDIDATES:
+        if not (Path(files[0]).exists() and Path(files[1]).exists()):
+            continue
+        # Missing italics fall back to the upright faces.
+        italic = files[2] if Path(files[2]).exists() else files[0]
+        bold_italic = files[3] if Path(files[3]).exists() else files[1]
+        return files[0], files[1], italic, bold_italic, mono
+    return None, None, None, None, mono
+
+
+@lru_cache(maxsize=None)
+def fonts() -> dict:
+    """{'regular', 'bold', 'mono'}: registered font names."""
+    regular, bold, italic, bold_italic, mono = font_files()
+    names = {'regular': 'Helvetica', 'bold': 'Helvetica-Bold', 'mono': 'Courier'}
+    if regular:
+        for name, path in (('ReportSans', regular), ('ReportSans-Bold', bold),
+                           ('ReportSans-Italic', italic), ('ReportSans-BoldItalic', bold_italic)):
+            pdfmetrics.registerFont(TTFont(name, path))
+        pdfmetrics.registerFontFamily('ReportSans', normal='ReportSans', bold='ReportSans-Bold',
+                                      italic='ReportSans-Italic', boldItalic='ReportSans-BoldItalic')
+        names.update(regular='ReportSans', bold='ReportSans-Bold')
+    if mono:
+        pdfmetrics.registerFont(TTFont('ReportMono', mono))
+        names['mono'] = 'ReportMono'
+    return names
+
+
+@lru_cache(maxsize=None)
+def stylesheet():
+    """The sample stylesheet plus the report styles, on the report font."""
+    font = fonts()
+    styles = getSampleStyleSheet()
+    for name in ('Normal', 'Title', 'Heading1', 'Heading2', 'Heading3', 'Code'):
+        styles[name].fontName = font['mono'] if name == 'Code' else (
+            font['regular'] if name == 'Normal' else font['bold'])
+
+    def add(name, parent, **options):
+        styles.add(ParagraphStyle(name=name, parent=styles[parent], **options))
+
+    add('ReportTitle', 'Title', fontSize=24, leading=28, spaceAfter=10,
+        textColor=HexColor('#1a1a1a'), alignment=TA_CENTER)
+    add('Subtitle', 'Normal', fontSize=12, spaceAfter=20, textColor=HexColor('#666666'),
+        alignment=TA_CENTER)
+    add('SectionHeader', 'Heading1', fontSize=16, leading=20, spaceBefore=25, spaceAfter=12,
+        textColor=HexColor(ACCENT))
+    add('SubHeader', 'Heading2', fontSize=12, spaceBefore=15, spaceAfter=8,
+        textColor=HexColor('#333333'), fontName=font['bold'])
+    add('MinorHeader', 'Heading3', fontSize=10.5, spaceBefore=10, spaceAfter=6,
+        textColor=HexColor('#333333'), fontName=font['bold'])
+    add('Body', 'Normal', fontSize=10, spaceBefore=6, spaceAfter=6, leading=14,
+        alignment=TA_JUSTIFY)
+    add('BodyBold', 'Body', fontName=font['bold'], alignment=0)
+    add('ReportBullet', 'Body', spaceBefore=2, spaceAfter=2, alignment=0, leftIndent=14,
+        bulletIndent=4, bulletFontName=font['regular'])
+    add('Quote', 'Body', leftIndent=12, textColor=HexColor('#555555'), alignment=0)
+    add('ReportCode', 'Code', fontSize=8, leading=10, backColor=HexColor('#f5f5f5'),
+        borderPadding=4, spaceBefore=6, spaceAfter=6)
+    add('TableCell', 'Normal', fontSize=9, leading=11)
+    add('TableHeader', 'TableCell', fontName=font['bold'], textColor=HexColor('#ffffff'))
+    return styles
+
+
+@lru_cache(maxsize=None)
+def table_style(variant: str = 'dark') -> TableStyle:
+    """The one table look, with a dark or accent header row."""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), HexColor(TABLE_HEADERS[variant])),
+        ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
+        ('FONTNAME', (0, 0), (-1, -1), fonts()['regular']),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 0.5, HexColor('#cccccc')),
+        ('PADDING', (0, 0), (-1, -1), 6),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ])
@@ -56,6 +56,13 @@ const nextConfig: NextConfig = {
           ],
           referrerPolicy: 'same-origin'
         })
+      },
+      {
+        // Content-hashed assets from download_assets.py never change under the same name.
+        source: '/hashed/:path*',
+        headers: [
+          { key: 'Cache-Control', value: 'public, max-age=31536000, immutable' }
+        ]
       }
     ];
   }
@@ -1,9 +1,32 @@
 #!/usr/bin/env python3
 """Batch mobile responsiveness testing for all pages."""
 
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
 import os
-from playwright.sync_api import sync_playwright
+import queue
+import time
+from playwright.async_api import async_playwright
 
+from mobile_audit import blocking as request_blocking
+from mobile_audit import routes as route_discovery
+from mobile_audit import vitals
+from mobile_audit.cache import DEFAULT_MAX_BYTES, ResultCache, page_fingerprint
+from mobile_audit.har import ARCHIVE_DIR, HarArchive
+from mobile_audit.history import TIMEOUT_CEILING_MS, RouteHistory
+from mobile_audit.overflow import OVERFLOW_DETECTOR, audit_scroll_positions, find_overflowing
+from mobile_audit.readiness import READINESS_PROBE, describe, wait_until_ready
+from mobile_audit.results import ResultStream, read_stream, write_junit
+from mobile_audit.screenshots import FORMATS, MODES, ScreenshotWriter
+from mobile_audit.screenshots import describe as describe_screenshots
+from mobile_audit.sharding import plan_shards
+from mobile_audit.timing import Timeline, print_phase_stats, write_trace
+from mobile_audit.warmup import ProductionServer, print_ttfb_report, warm_routes
+
+# Fallback when routes cannot be discovered (--routes static).
 PAGES = [
     # Feature pages
     '/paywall-ab-testing',
@@ -34,85 +57,465 @@ PAGES = [
     '/integrations',
 ]
 
-def test_all_pages():
-    output_dir = '/tmp/mobile-tests'
-    os.makedirs(output_dir, exist_ok=True)
+VIEWPORTS = [
+    {'name': '375px', 'width': 375, 'height': 812},
+]
+
+BASE_URL = 'http://localhost:3011'
+OUTPUT_DIR = '/tmp/mobile-tests'
+CACHE_DIR = f'{OUTPUT_DIR}/.cache'
+HISTORY_PATH = f'{OUTPUT_DIR}/history.json'
+RESULTS_PATH = f'{OUTPUT_DIR}/results.jsonl'
+JUNIT_PATH = f'{OUTPUT_DIR}/junit.xml'
+TRACE_PATH = f'{OUTPUT_DIR}/trace.json'
+
+# Navigation timeout for routes without enough history (see RouteHistory.timeout_ms).
+DEFAULT_TIMEOUT_MS = 30000
+# Transient failures are retried this many times, after 2s, 4s, ...
+RETRIES = 2
+RETRY_BACKOFF_SECONDS = 2.0
+TRANSIENT_ERRORS = ('Timeout', 'net::ERR_', 'Target closed', 'Target page, context or browser has been closed',
+                    'Navigation failed because page crashed')
+
+OVERFLOW_PROBE = '''() => {
+    const body = document.body;
+    return {
+        hasHorizontalOverflow: body.scrollWidth > window.innerWidth,
+        bodyWidth: body.scrollWidth,
+        windowWidth: window.innerWidth
+    };
+}'''
+
+# Changing any probe invalidates cached verdicts.
+AUDIT_SALT = hashlib.sha1(
+    (OVERFLOW_PROBE + OVERFLOW_DETECTOR + READINESS_PROBE).encode()
+).hexdigest()[:12]
+
+
+def cache_salt(setup=None) -> str:
+    """AUDIT_SALT plus the blocking profile: a widget blocked in one run may be what overflows in another."""
+    blocking = (setup or {}).get('blocking')
+    if not blocking or blocking['dry_run']:
+        # A dry run lets every request through, like no blocking at all.
+        return AUDIT_SALT
+    profile = json.dumps(blocking['profile'], sort_keys=True)
+    return hashlib.sha1(f'{AUDIT_SALT}|{profile}'.encode()).hexdigest()[:12]
+
+
+def make_jobs(pages=PAGES, viewports=VIEWPORTS, base_url: str = BASE_URL):
+    """One job per page x viewport, indexed in the order results are printed."""
+    jobs = []
+    for page_path in pages:
+        for vp in viewports:
+            jobs.append({'index': len(jobs), 'page': page_path, 'viewport': vp,
+                         'url': f'{base_url}{page_path}'})
+    return jobs
+
+
+def viewport_key(vp: dict) -> str:
+    return f"{vp['width']}x{vp['height']}@2x-mobile"
 
-    issues = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+def job_key(job: dict) -> str:
+    """Stable identifier for history and cache lookups."""
+    return f"{job['page']}|{job['viewport']['name']}"
 
-        for page_path in PAGES:
-            context = browser.new_context(
-                viewport={'width': 375, 'height': 812},
+
+def job_label(job: dict) -> str:
+    """How a job is named in the output; just the path for single-viewport runs."""
+    if len(VIEWPORTS) == 1:
+        return job['page']
+    return f"{job['page']} @ {job['viewport']['name']}"
+
+
+async def audit_page(browser, job: dict, output_dir: str = OUTPUT_DIR, setup=None) -> dict:
+    """Audit one page at one viewport in its own context and return the result.
+
+    `setup` configures the context's network:
+      'blocking': {'profile': dict, 'dry_run': bool} to abort non-layout
+                  requests (see mobile_audit/blocking.py)
+      'har':      a HarArchive to record the traffic to, or replay it from
+      'vitals':   True to collect Web Vitals and runtime metrics
+      'timing':   True to record per-phase timings in result['phases']
+      'scroll_sweep': True to also scroll through the page, probing lazily
+                  mounted and scroll-animated sections (result['sweep'])
+      'screenshot_writer': the ScreenshotWriter run_audits() opened for the
+                  'screenshots' options (mode, fmt, quality)
+    """
+    setup = setup or {}
+    blocking, har = setup.get('blocking'), setup.get('har')
+    page_path, vp = job['page'], job['viewport']
+    timeline, track = Timeline(setup.get('timing', False)), job_label(job)
+    started = time.perf_counter()
+    result = {'page': page_path, 'viewport': vp['name']}
+    context = blocker = None
+
+    url = job['url']
+    try:
+        # Inside the try: a crashed or closed browser fails here, and that is retryable.
+        with timeline.phase('new_context', track):
+            context = await browser.new_context(
+                viewport={'width': vp['width'], 'height': vp['height']},
                 device_scale_factor=2,
                 is_mobile=True,
-                has_touch=True
+                has_touch=True,
+                **(har.context_options(job_key(job)) if har else {})
             )
-            page = context.new_page()
+        with timeline.phase('new_page', track):
+            # Routes run last-registered first: the blocker sees requests before the HAR.
+            if har:
+                await har.attach_async(context, job_key(job))
+            if blocking:
+                blocker = request_blocking.RequestBlocker(blocking['profile'], url, blocking['dry_run'])
+                await blocker.attach_async(context)
+            if setup.get('vitals'):
+                await context.add_init_script(script=vitals.VITALS_INIT)
+            page = await context.new_page()
+        with timeline.phase('goto', track):
+            load_started = time.perf_counter()
+            await page.goto(url, wait_until='networkidle',
+                            timeout=job.get('timeout_ms', DEFAULT_TIMEOUT_MS))
+            result['load'] = round(time.perf_counter() - load_started, 3)
+        with timeline.phase('ready', track):
+            result['readiness'] = await wait_until_ready(page)
 
-            url = f'http://localhost:3011{page_path}'
-            print(f"Testing {page_path}...", end=' ')
+        # Check for horizontal overflow
+        with timeline.phase('evaluate', track):
+            overflow = await page.evaluate(OVERFLOW_PROBE)
+        result['overflow'] = overflow
 
-            try:
-                page.goto(url, wait_until='networkidle', timeout=30000)
-                page.wait_for_timeout(1000)
-
-                # Check for horizontal overflow
-                overflow = page.evaluate('''() => {
-                    const body = document.body;
-                    return {
-                        hasHorizontalOverflow: body.scrollWidth > window.innerWidth,
-                        bodyWidth: body.scrollWidth,
-                        windowWidth: window.innerWidth
-                    };
-                }''')
-
-                if overflow['hasHorizontalOverflow']:
-                    print(f"OVERFLOW ({overflow['bodyWidth']}px > {overflow['windowWidth']}px)")
-
-                    # Find overflowing elements
-                    overflowing = page.evaluate('''() => {
-                        const elements = [];
-                        document.querySelectorAll('*').forEach(el => {
-                            const rect = el.getBoundingClientRect();
-                            if (rect.right > window.innerWidth + 5) {
-                                elements.push({
-                                    tag: el.tagName,
-                                    className: el.className?.toString?.()?.substring?.(0, 80) || '',
-                                    right: rect.right
-                                });
-                            }
-                        });
-                        return elements.slice(0, 5);
-                    }''')
-
-                    issues.append({
-                        'page': page_path,
-                        'overflow': overflow,
-                        'elements': overflowing
-                    })
-
-                    # Take screenshot of problematic page
-                    safe_path = page_path.replace('/', '_')
-                    page.screenshot(path=f"{output_dir}/{safe_path}_ISSUE.png", full_page=True)
-                else:
-                    print("OK")
+        if setup.get('vitals'):
+            with timeline.phase('vitals', track):
+                result['vitals'] = await page.evaluate(vitals.COLLECT_VITALS)
 
+        swept = []
+        if setup.get('scroll_sweep'):
+            # After vitals: scrolling would add to CLS and INP.
+            with timeline.phase('sweep', track):
+                sweep = await audit_scroll_positions(page, limit=5, tolerance=5)
+            swept = sweep.pop('offenders')
+            result['sweep'] = sweep
+            if (swept or sweep['pageOverflow']) and not overflow['hasHorizontalOverflow']:
+                # Overflow that only shows up further down the page.
+                widths = [step['bodyWidth'] for step in sweep['pageOverflow']]
+                overflow = result['overflow'] = {
+                    **overflow, 'hasHorizontalOverflow': True,
+                    'bodyWidth': max(widths, default=overflow['bodyWidth'])}
+
+        if overflow['hasHorizontalOverflow']:
+            # Find the elements causing it
+            with timeline.phase('detect', track):
+                detected = await find_overflowing(page, limit=5, tolerance=5)
+            known = {el['selector'] for el in detected['offenders']}
+            result['elements'] = detected['offenders'] + [
+                el for el in swept if el['selector'] not in known]
+
+            # Take screenshot of problematic page
+            safe_path = page_path.replace('/', '_')
+            if len(VIEWPORTS) > 1:
+                safe_path += f"_{vp['name']}"
+            with timeline.phase('screenshot', track):
+                result['screenshot'] = await setup['screenshot_writer'].capture_async(
+                    page, f"{output_dir}/{safe_path}_ISSUE", result['elements'],
+                    overflow['bodyWidth'])
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    if context is not None:
+        with timeline.phase('close', track):
+            try:
+                await context.close()
             except Exception as e:
-                print(f"ERROR: {e}")
-                issues.append({'page': page_path, 'error': str(e)})
+                result.setdefault('error', str(e))
+    if blocker:
+        result['blocked'] = {**blocker.stats, 'dry_run': blocker.dry_run}
+        blocker.save_sizes()
+    result['duration'] = time.perf_counter() - started
+    if timeline.enabled:
+        result['phases'] = timeline.events
+    return result
+
+
+def format_status(result: dict) -> str:
+    """Render the per-page status exactly as the sequential run prints it."""
+    if 'error' in result:
+        return f"ERROR: {result['error']}"
+    overflow = result['overflow']
+    if overflow['hasHorizontalOverflow']:
+        return f"OVERFLOW ({overflow['bodyWidth']}px > {overflow['windowWidth']}px)"
+    return "OK"
+
+
+def print_result(job: dict, result: dict):
+    status = format_status(result)
+    if result.get('cached'):
+        status += " [cached]"
+    elif 'readiness' in result:
+        status += f" [{describe(result['readiness'])}]"
+    blocked = result.get('blocked')
+    if blocked and not result.get('cached'):
+        status += f" [{request_blocking.describe(blocked, blocked.get('dry_run', False))}]"
+    if 'screenshot_error' in result:
+        status += " [screenshot failed]"
+    print(f"Testing {job_label(job)}...", status, flush=True)
+
+
+def is_transient(result: dict) -> bool:
+    """Whether an errored result is worth retrying (timeouts, dropped connections, crashes)."""
+    return any(marker in result.get('error', '') for marker in TRANSIENT_ERRORS)
+
+
+def to_issue(job: dict, result: dict):
+    """Convert a page result into a SUMMARY issue, or None if it passed."""
+    if 'error' in result:
+        return {'page': job_label(job), 'error': result['error']}
+    if result['overflow']['hasHorizontalOverflow']:
+        return {
+            'page': job_label(job),
+            'overflow': result['overflow'],
+            'elements': result.get('elements', [])
+        }
+    return None
+
+
+async def cached_audit(browser, job: dict, output_dir: str, cache, force: bool, setup=None) -> dict:
+    """Reuse the stored verdict when the served page is unchanged, else audit.
+
+    Runs collecting vitals always audit (and refresh the cache).
+    """
+    if cache is None:
+        return await audit_page(browser, job, output_dir, setup)
+
+    page_path, vp = job['page'], viewport_key(job['viewport'])
+    timeline = Timeline((setup or {}).get('timing', False))
+    started = time.perf_counter()
+    try:
+        with timeline.phase('fingerprint', job_label(job)):
+            fingerprint = await asyncio.to_thread(page_fingerprint, job['url'])
+    except Exception:
+        # Unreachable page: let the real audit report the error.
+        return await audit_page(browser, job, output_dir, setup)
+
+    # Vitals are measurements of this run; a stored copy would gate `compare` on stale numbers.
+    if not force and not (setup or {}).get('vitals'):
+        cached = cache.get(page_path, vp, fingerprint)
+        # A verdict from a run without --scroll-sweep has not seen below the fold.
+        if cached and ('sweep' in cached or not (setup or {}).get('scroll_sweep')):
+            cached = {key: value for key, value in cached.items() if key not in ('phases', 'vitals')}
+            if timeline.enabled:
+                cached['phases'] = timeline.events
+            return {**cached, 'cached': True, 'duration': time.perf_counter() - started}
+
+    result = await audit_page(browser, job, output_dir, setup)
+    if 'error' not in result:
+        cache.put(page_path, vp, fingerprint, result)
+    if timeline.enabled:
+        result['phases'] = timeline.events + result['phases']
+    return result
+
+
+async def run_audits(jobs, concurrency: int = 1, output_dir: str = OUTPUT_DIR,
+                     cache=None, force: bool = False, on_result=print_result, setup=None,
+                     on_complete=None, on_phase=None):
+    """Audit jobs against one shared Chromium, at most `concurrency` at a time.
+
+    `on_result(job, result)` is called in `jobs` order as soon as every
+    earlier job is done, so the output matches the sequential run regardless
+    of completion order. `on_complete(job, result)` is called the moment each
+    job finishes, in completion order. With a `cache`, pages whose
+    fingerprint is unchanged are not re-audited unless `force` is set.
+    `on_phase(event)` receives the browser launch timing.
+
+    Each job navigates with its own `timeout_ms`. Transient failures are
+    retried up to `retries` times with exponential backoff and a doubled
+    timeout; a retry waits at the back of the queue, so it holds no slot
+    while other jobs run.
+    """
+    results = []
+    writer = ScreenshotWriter(**(setup or {}).get('screenshots', {}))
+    setup = {**(setup or {}), 'screenshot_writer': writer}
+
+    async with async_playwright() as p:
+        timeline = Timeline(on_phase is not None)
+        with timeline.phase('launch', f'browser {os.getpid()}'):
+            browser = await p.chromium.launch(headless=True)
+        for event in timeline.events:
+            on_phase(event)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def bounded(job):
+            attempt = job
+            for retry in range(job.get('retries', 0) + 1):
+                if retry:
+                    # Waiting outside `slots` puts the retry at the back of the queue.
+                    await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** (retry - 1))
+                    attempt = {**attempt, 'timeout_ms': min(
+                        TIMEOUT_CEILING_MS, 2 * attempt.get('timeout_ms', DEFAULT_TIMEOUT_MS))}
+                async with slots:
+                    result = await cached_audit(browser, attempt, output_dir, cache, force, setup)
+                if not is_transient(result):
+                    break
+            if retry:
+                result['attempts'] = retry + 1
+            if result.get('screenshot') and not result.get('cached'):
+                # Waiting here holds no slot; the record must know whether its screenshot exists.
+                error = await writer.settle_async(result['screenshot'])
+                if error:
+                    result['screenshot_error'] = f"{result.pop('screenshot')}: {error}"
+            if job.get('quarantined'):
+                result['quarantined'] = True
+            if on_complete:
+                on_complete(job, result)
+            return result
+
+        tasks = [asyncio.create_task(bounded(job)) for job in jobs]
+        for job, task in zip(jobs, tasks):
+            result = await task
+            on_result(job, result)
+            results.append(result)
+
+        await browser.close()
+
+    await asyncio.to_thread(writer.close)
+    return results
 
-            context.close()
 
-        browser.close()
+def shard_worker(jobs, concurrency: int, use_cache: bool, force: bool, cache_max_bytes: int,
+                 setup, results):
+    """Worker process: audit `jobs` with its own browser, streaming (index, result) back."""
+    cache = ResultCache(CACHE_DIR, cache_max_bytes, salt=cache_salt(setup)) if use_cache else None
 
-    # Summary
+    def forward(job, result):
+        results.put((job['index'], result))
+
+    def forward_phase(event):
+        results.put((None, event))
+
+    asyncio.run(run_audits(jobs, concurrency, cache=cache, force=force,
+                           on_result=lambda job, result: None, setup=setup, on_complete=forward,
+                           on_phase=forward_phase if (setup or {}).get('timing') else None))
+
+
+def run_sharded(jobs, shards: int, concurrency: int, use_cache: bool, force: bool,
+                cache_max_bytes: int, history: RouteHistory, setup=None, on_complete=None,
+                on_phase=None):
+    """Split `jobs` across `shards` worker processes and merge their results.
+
+    Jobs are assigned slowest-first from `history` so no shard becomes a long
+    tail. Results are printed in `jobs` order, like the single-process run;
+    `on_complete(job, result)` is called as each one arrives and
+    `on_phase(event)` for each worker's browser launch.
+    """
+    plan, loads = plan_shards(jobs, shards, lambda job: history.estimate(job_key(job)))
+    # Quarantined routes go last in their shard, off the critical path.
+    plan = [sorted(shard_jobs, key=lambda job: bool(job.get('quarantined'))) for shard_jobs in plan]
+    for number, (shard_jobs, load) in enumerate(zip(plan, loads), 1):
+        print(f"Shard {number}: {len(shard_jobs)} job(s), ~{load:.0f}s expected")
+    print()
+
+    mp = multiprocessing.get_context('spawn')
+    inbox = mp.Queue()
+    workers = [
+        mp.Process(target=shard_worker,
+                   args=(shard_jobs, concurrency, use_cache, force, cache_max_bytes, setup, inbox))
+        for shard_jobs in plan if shard_jobs
+    ]
+    for worker in workers:
+        worker.start()
+
+    position = {job['index']: number for number, job in enumerate(jobs)}
+    results = [None] * len(jobs)
+    printed = 0
+    received = 0
+    while received < len(jobs):
+        try:
+            index, result = inbox.get(timeout=1)
+        except queue.Empty:
+            if any(worker.is_alive() for worker in workers):
+                continue
+            break
+        if index is None:
+            if on_phase:
+                on_phase(result)
+            continue
+        results[position[index]] = result
+        received += 1
+        if on_complete:
+            on_complete(jobs[position[index]], result)
+        while printed < len(jobs) and results[printed] is not None:
+            print_result(jobs[printed], results[printed])
+            printed += 1
+
+    for worker in workers:
+        worker.join()
+
+    for index, job in enumerate(jobs):
+        if results[index] is None:
+            results[index] = {
+                'page': job['page'],
+                'viewport': job['viewport']['name'],
+                'error': 'shard worker exited before auditing this page',
+                'duration': 0.0,
+            }
+            if on_complete:
+                on_complete(job, results[index])
+    for job, result in zip(jobs[printed:], results[printed:]):
+        print_result(job, result)
+
+    return results
+
+
+def plan_routes(base_url: str, source: str = 'auto', changed_only: bool = False):
+    """(pages, routes) to audit: every discovered route, or with `changed_only`
+    those added or changed since the last clean run.
+
+    `routes` is the discovered {route: signature} to snapshot after the run,
+    or None when falling back to PAGES.
+    """
+    if source == 'static':
+        return PAGES, None
+    routes, used, unexpanded = route_discovery.discover_routes(base_url, source)
+    if not routes:
+        print(f"Could not discover routes from the {used}; falling back to the {len(PAGES)} static pages\n")
+        return PAGES, None
+
+    diff = route_discovery.diff_routes(route_discovery.load_snapshot(), routes)
+    print(f"Discovered {len(routes)} route(s) from the {used}: {len(diff['added'])} added, "
+          f"{len(diff['changed'])} changed, {len(diff['removed'])} removed, "
+          f"{len(diff['unchanged'])} unchanged")
+    for route in diff['removed']:
+        print(f"  - {route}")
+    if unexpanded:
+        print(f"  {len(unexpanded)} dynamic route(s) without values in "
+              f"{route_discovery.DYNAMIC_ROUTES_PATH.name}: {', '.join(unexpanded)}")
+    print()
+    pages = diff['added'] + diff['changed'] if changed_only else list(routes)
+    return pages, routes
+
+
+def save_routes(routes: dict, jobs, results):
+    """Snapshot routes whose every viewport was audited cleanly; keep the rest as before."""
+    failed = {job['page'] for job, result in zip(jobs, results) if 'error' in result}
+    audited = {job['page'] for job in jobs} - failed
+    previous = route_discovery.load_snapshot()
+    route_discovery.save_snapshot({
+        route: signature if route in audited else previous[route]
+        for route, signature in routes.items()
+        if route in audited or route in previous
+    })
+
+
+def print_summary(issues, quarantined=()):
     print("\n" + "="*50)
     print("SUMMARY")
     print("="*50)
 
+    if quarantined:
+        print(f"\n{len(quarantined)} quarantined page(s) still failing (not counted):")
+        for issue in quarantined:
+            print(f"  {issue['page']}: {issue.get('error', 'overflow')}")
+
     if issues:
         print(f"\nFound {len(issues)} page(s) with issues:\n")
         for issue in issues:
@@ -123,8 +526,246 @@ def test_all_pages():
                 print(f"    Overflow: {issue['overflow']['bodyWidth']}px")
                 for el in issue.get('elements', []):
                     print(f"      - {el['tag']}: {el['className'][:50]}...")
+                    print(f"          at {el['selector']}")
     else:
         print("\nAll pages passed mobile responsiveness check!")
 
+
+def test_all_pages(concurrency: int = 1, use_cache: bool = True, force: bool = False,
+                   cache_max_bytes: int = DEFAULT_MAX_BYTES, shards: int = 1, setup=None,
+                   allow_stale: bool = False, base_url: str = BASE_URL, warmup: bool = False,
+                   results_path: str = RESULTS_PATH, junit_path: str = JUNIT_PATH,
+                   resume: bool = False, pages=PAGES, routes=None, trace_path: str = TRACE_PATH):
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    setup = setup or {}
+    history = RouteHistory(HISTORY_PATH)
+    jobs = make_jobs(pages, base_url=base_url)
+
+    # Errored jobs are retried on resume; only finished audits are kept.
+    done = {key for key, record in read_stream(results_path).items()
+            if 'error' not in record} if resume else set()
+    pending = [job for job in jobs if job_key(job) not in done]
+    if resume:
+        print(f"Resuming from {results_path}: {len(jobs) - len(pending)}/{len(jobs)} job(s) "
+              f"already done\n")
+
+    # Timeouts adapt to each route's history; routes that keep failing run
+    # last, once, and do not count as issues until they pass again.
+    for job in pending:
+        key = job_key(job)
+        job['timeout_ms'] = history.timeout_ms(key, DEFAULT_TIMEOUT_MS)
+        job['quarantined'] = history.quarantined(key)
+        job['retries'] = 0 if job['quarantined'] else RETRIES
+    pending.sort(key=lambda job: job['quarantined'])
+    quarantined = [job_label(job) for job in pending if job['quarantined']]
+    if quarantined:
+        print(f"Quarantined after repeated failures (run last, not counted): "
+              f"{', '.join(quarantined)}\n")
+
+    if warmup:
+        print(f"Warming up {len(pages)} route(s) on {base_url}...\n")
+        print_ttfb_report(warm_routes(base_url, pages))
+        print()
+
+    har = setup.get('har')
+    if har and har.mode == 'record':
+        # A cache hit never opens a context, so it would record no archive.
+        force = True
+    if har and har.mode == 'replay':
+        stale = har.staleness()
+        if stale and not allow_stale:
+            raise SystemExit(f"HAR archive is stale: {stale}\n"
+                             f"Re-record with --har record, or pass --allow-stale.")
+        print(f"Replaying from {har.directory}" + (f" (stale: {stale})" if stale else "") + "\n")
+
+    stream = ResultStream(results_path, resume=resume)
+
+    def record(job, result):
+        stream.write(job_key(job), job['index'], job_label(job), result)
+
+    launches = Timeline(setup.get('timing', False))
+    on_phase = launches.add if launches.enabled else None
+
+    started = time.perf_counter()
+    try:
+        if shards > 1:
+            fresh = run_sharded(pending, shards, concurrency, use_cache, force, cache_max_bytes,
+                                history, setup, on_complete=record, on_phase=on_phase)
+        else:
+            cache = ResultCache(CACHE_DIR, cache_max_bytes, salt=cache_salt(setup)) if use_cache else None
+            fresh = asyncio.run(run_audits(pending, concurrency, cache=cache, force=force,
+                                           setup=setup, on_complete=record, on_phase=on_phase))
+    finally:
+        stream.close()
+    wall = time.perf_counter() - started
+
+    # Everything below reads the stream, so resumed jobs count like fresh ones.
+    records = read_stream(results_path)
+    # A job whose record never reached the stream counts as failed, not as a crash here.
+    results = [records.get(job_key(job)) or {
+        'page': job['page'], 'viewport': job['viewport']['name'],
+        'error': f"no result recorded in {results_path}"} for job in jobs]
+    if routes is not None:
+        save_routes(routes, jobs, results)
+
+    if har and har.mode == 'record':
+        # Only pages with an archive on disk can be replayed (resumed ones may have one from before).
+        har.write_manifest(job_key(job) for job, result in zip(jobs, results)
+                           if 'error' not in result and not result.get('cached')
+                           and har.path_for(job_key(job)).exists())
+        print(f"\nRecorded HAR archives to {har.directory}")
+    elif not har:
+        # Replayed timings say nothing about the live server.
+        for job, result in zip(pending, fresh):
+            if 'error' in result:
+                history.record_failure(job_key(job), result['error'])
+            elif not result.get('cached'):
+                history.record(job_key(job), result['duration'], result.get('load'))
+        history.save()
+
+    if use_cache:
+        hits = sum(1 for result in results if result.get('cached'))
+        evicted = ResultCache(CACHE_DIR, cache_max_bytes, salt=cache_salt(setup)).evict()
+        print(f"\nCache: {hits}/{len(jobs)} route(s) were hits"
+              + (f", {evicted} entr{'y' if evicted == 1 else 'ies'} evicted" if evicted else ""))
+
+    if setup.get('vitals'):
+        print()
+        vitals.record_run({job_key(job): result['vitals']
+                           for job, result in zip(jobs, results) if 'vitals' in result}, base_url)
+
+    audited = [result for result in results if 'blocked' in result and not result.get('cached')]
+    if audited:
+        skipped = sum(result['blocked']['requests'] for result in audited)
+        skipped_bytes = sum(result['blocked']['bytes'] for result in audited)
+        # Resumed records may come from a run with other blocking options than this one.
+        verb = 'Would skip' if all(result['blocked'].get('dry_run') for result in audited) else 'Skipped'
+        print(f"\n{verb} {skipped} request(s), ~{skipped_bytes / 1024 / 1024:.1f} MB "
+              f"over {len(audited)} page(s) ({skipped / len(audited):.1f} per page)")
+
+    issues, quarantined = [], []
+    for job, result in zip(jobs, results):
+        issue = to_issue(job, result)
+        if issue:
+            (quarantined if 'error' in issue and result.get('quarantined') else issues).append(issue)
+    retried = [result for result in fresh if result.get('attempts')]
+    if retried:
+        recovered = sum(1 for result in retried if 'error' not in result)
+        print(f"\nRetried {len(retried)} page(s) after transient failures; {recovered} recovered")
+
+    if (concurrency > 1 or shards > 1) and fresh:
+        serial = sum(result['duration'] for result in fresh)
+        across = f" across {shards} shards" if shards > 1 else ""
+        print(f"\nAudited {len(fresh)} pages in {wall:.1f}s with concurrency {concurrency}{across} "
+              f"(sequential estimate {serial:.1f}s, {serial / wall:.1f}x speedup)")
+
+    shots = [result['screenshot'] for result in fresh if result.get('screenshot')
+             and not result.get('cached') and os.path.exists(result['screenshot'])]
+    if shots:
+        print(f"\nScreenshots: {describe_screenshots(len(shots), sum(map(os.path.getsize, shots)))}")
+    unwritten = [(job, result['screenshot_error']) for job, result in zip(jobs, results)
+                 if 'screenshot_error' in result]
+    if unwritten:
+        print(f"\n{len(unwritten)} screenshot(s) could not be written:")
+        for job, error in unwritten:
+            print(f"  - {job_label(job)}: {error}")
+
+    if launches.enabled:
+        events = launches.events + [event for result in fresh for event in result.get('phases', [])]
+        print("\nPhase timings:")
+        print_phase_stats(events)
+        write_trace(events, trace_path)
+        print(f"Trace: {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+
+    write_junit(results, junit_path)
+    print(f"\nResults: {results_path}\nJUnit:   {junit_path}")
+
+    print_summary(issues, quarantined)
+    return issues
+
+
 if __name__ == '__main__':
-    test_all_pages()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='number of pages audited at once (default: 1, sequential)')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='split pages x viewports across N worker processes, one browser each')
+    parser.add_argument('--force', action='store_true',
+                        help='re-audit every page even if its cached fingerprint matches')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='neither read nor write the result cache')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='evict least-recently-used cache entries and screenshots past this size')
+    parser.add_argument('--block-profile', default='off',
+                        help='request blocking profile: off, layout, strict or a JSON file')
+    parser.add_argument('--block-dry-run', action='store_true',
+                        help='let matching requests through and record their sizes')
+    parser.add_argument('--har', choices=['record', 'replay'],
+                        help='record each page\'s traffic, or replay it with no server')
+    parser.add_argument('--har-dir', default=ARCHIVE_DIR)
+    parser.add_argument('--allow-stale', action='store_true',
+                        help='replay even if the sources changed since recording')
+    parser.add_argument('--base-url', default=BASE_URL,
+                        help=f'server to audit (default: {BASE_URL}, the dev server)')
+    parser.add_argument('--warmup', action='store_true',
+                        help='request every route in parallel first and report cold/warm TTFB')
+    parser.add_argument('--serve-prod', action='store_true',
+                        help='build the marketing app and audit a local `next start` instead')
+    parser.add_argument('--port', type=int, default=3111, help='port for --serve-prod')
+    parser.add_argument('--skip-build', action='store_true',
+                        help='with --serve-prod, reuse the existing .next build')
+    parser.add_argument('--vitals', action='store_true',
+                        help='collect LCP/CLS/TBT, heap, DOM size and bytes; compare with the last run')
+    parser.add_argument('--results', default=RESULTS_PATH,
+                        help=f'JSONL file each result is appended to as it finishes (default: {RESULTS_PATH})')
+    parser.add_argument('--junit', default=JUNIT_PATH,
+                        help=f'JUnit XML report built from the results (default: {JUNIT_PATH})')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip pages already audited in --results and append the rest')
+    parser.add_argument('--routes', choices=['auto', 'manifest', 'app', 'sitemap', 'static'], default='auto',
+                        help='where to find routes: the .next manifests, the page files under app/, '
+                             '/sitemap.xml (top-level pages only), or the built-in PAGES list '
+                             '(default: manifests if built, else app/)')
+    parser.add_argument('--changed-only', action='store_true',
+                        help='audit only routes whose page, layouts or imported sources changed '
+                             'since the last clean run')
+    parser.add_argument('--timing', action='store_true',
+                        help='time each phase per page, print p50/p95/max and write a Chrome trace')
+    parser.add_argument('--trace', default=TRACE_PATH, help=f'trace file for --timing (default: {TRACE_PATH})')
+    parser.add_argument('--screenshot-mode', choices=MODES, default='full',
+                        help='full page, clip to the overflowing elements, or first screen only')
+    parser.add_argument('--screenshot-format', choices=FORMATS, default='png',
+                        help='webp needs Pillow')
+    parser.add_argument('--screenshot-quality', type=int, default=80,
+                        help='JPEG/WebP quality, 1-100 (default: 80)')
+    parser.add_argument('--scroll-sweep', action='store_true',
+                        help='also scroll through each page to catch lazy and scroll-animated sections')
+    args = parser.parse_args()
+
+    setup = {'vitals': args.vitals, 'timing': args.timing, 'scroll_sweep': args.scroll_sweep,
+             'screenshots': {'mode': args.screenshot_mode, 'fmt': args.screenshot_format,
+                             'quality': args.screenshot_quality}}
+    if args.block_profile != 'off' or args.block_dry_run:
+        setup['blocking'] = {'profile': request_blocking.load_profile(args.block_profile),
+                             'dry_run': args.block_dry_run}
+    if args.har:
+        setup['har'] = HarArchive(args.har_dir, args.har)
+    options = dict(use_cache=not args.no_cache, force=args.force,
+                   cache_max_bytes=args.cache_max_mb * 1024 * 1024, shards=max(1, args.shards),
+                   setup=setup, allow_stale=args.allow_stale, warmup=args.warmup,
+                   results_path=args.results, junit_path=args.junit, resume=args.resume,
+                   trace_path=args.trace)
+
+    def run(base_url):
+        pages, routes = plan_routes(base_url, args.routes, args.changed_only)
+        if not pages:
+            print("No added or changed routes since the last run; drop --changed-only to audit them all.")
+            return
+        test_all_pages(max(1, args.concurrency), base_url=base_url, pages=pages, routes=routes,
+                       **options)
+
+    if args.serve_prod:
+        with ProductionServer(args.port, build=not args.skip_build) as base_url:
+            run(base_url)
+    else:
+        run(args.base_url)
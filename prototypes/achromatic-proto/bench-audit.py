@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark the batch audit harness against fixed local fixture pages.
+
+Serves mobile_audit/fixtures/ from a local HTTP server and runs the same
+audit pipeline as batch-mobile-test.py over it, so harness changes can be
+measured without the dev server or the real site. Prints wall time per
+round and p50/p95/max per phase, and writes a Chrome trace of all rounds.
+"""
+
+import argparse
+import asyncio
+import functools
+import importlib.util
+import statistics
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from mobile_audit.timing import Timeline, print_phase_stats, write_trace
+
+FIXTURES_DIR = Path(__file__).parent / 'mobile_audit' / 'fixtures'
+TRACE_PATH = '/tmp/mobile-tests/bench-trace.json'
+
+
+def load_batch():
+    """Import batch-mobile-test.py, whose file name is not a module name."""
+    spec = importlib.util.spec_from_file_location(
+        'batch_mobile_test', Path(__file__).parent / 'batch-mobile-test.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures():
+    """Start a background server for FIXTURES_DIR; returns (server, base_url)."""
+    handler = functools.partial(QuietHandler, directory=str(FIXTURES_DIR))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def bench(rounds: int, concurrency: int, trace_path: str):
+    batch = load_batch()
+    pages = sorted(f'/{path.name}' for path in FIXTURES_DIR.glob('*.html'))
+    server, base_url = serve_fixtures()
+    jobs = batch.make_jobs(pages, batch.VIEWPORTS, base_url)
+    timeline = Timeline()
+    walls = []
+
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            for number in range(1, rounds + 1):
+                started = time.perf_counter()
+                results = asyncio.run(batch.run_audits(
+                    jobs, concurrency, output_dir, on_result=lambda job, result: None,
+                    setup={'timing': True}, on_phase=timeline.add))
+                walls.append(time.perf_counter() - started)
+                for result in results:
+                    for event in result.get('phases', []):
+                        timeline.add({**event, 'track': f"round {number} {event['track']}"})
+                errors = [result['page'] for result in results if 'error' in result]
+                print(f"Round {number}: {walls[-1]:.2f}s for {len(jobs)} job(s)"
+                      + (f", errors on {', '.join(errors)}" if errors else ""))
+    finally:
+        server.shutdown()
+
+    print(f"\nWall time: median {statistics.median(walls):.2f}s, "
+          f"min {min(walls):.2f}s, max {max(walls):.2f}s over {rounds} round(s)\n")
+    print_phase_stats(timeline.events)
+    write_trace(timeline.events, trace_path)
+    print(f"\nTrace: {trace_path}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=3, help='full passes over the fixtures (default: 3)')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--trace', default=TRACE_PATH)
+    args = parser.parse_args()
+    bench(args.rounds, max(1, args.concurrency), args.trace)
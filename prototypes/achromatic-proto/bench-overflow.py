@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: querySelectorAll('*') overflow probe vs the pruned detector.
+
+Builds synthetic marketing-like DOMs (marquee tracks clipped by overflow:
+hidden wrappers, wrapping card grids, a few genuinely wide elements) and
+times both probes in-page with performance.now(), so IPC is not counted.
+"""
+
+import argparse
+import statistics
+from playwright.sync_api import sync_playwright
+
+from mobile_audit.overflow import OVERFLOW_DETECTOR
+
+# The probe the scripts used before mobile_audit/overflow.js.
+LEGACY_PROBE = '''(options) => {
+    const elements = [];
+    document.querySelectorAll('*').forEach(el => {
+        const rect = el.getBoundingClientRect();
+        if (rect.right > window.innerWidth + options.tolerance) {
+            elements.push({
+                tag: el.tagName,
+                className: el.className?.toString?.()?.substring?.(0, 80) || '',
+                right: rect.right
+            });
+        }
+    });
+    return { offenders: elements.slice(0, options.limit) };
+}'''
+
+BUILD_DOM = '''(total) => {
+    document.body.innerHTML = '';
+    document.body.style.margin = '0';
+    let count = 0;
+    let section = 0;
+    const add = (parent, tag) => {
+        const el = document.createElement(tag);
+        parent.appendChild(el);
+        count++;
+        return el;
+    };
+    while (count < total) {
+        const sectionEl = add(document.body, 'section');
+        sectionEl.className = `section section-${section}`;
+        const marquee = section % 2 === 0;
+        const wrap = add(sectionEl, 'div');
+        wrap.className = marquee ? 'marquee' : 'grid';
+        if (marquee) wrap.style.overflow = 'hidden';
+        const track = add(wrap, 'div');
+        track.style.display = 'flex';
+        track.style.flexWrap = marquee ? 'nowrap' : 'wrap';
+        for (let i = 0; i < 48 && count < total; i++) {
+            const card = add(track, 'div');
+            card.className = 'card';
+            if (marquee) card.style.minWidth = '160px';
+            add(card, 'span').textContent = `item ${i}`;
+        }
+        if (section % 25 === 7) {
+            const wide = add(sectionEl, 'div');
+            wide.className = 'too-wide';
+            wide.style.width = '520px';
+        }
+        section++;
+    }
+    return document.getElementsByTagName('*').length;
+}'''
+
+TIME_PROBE = '''([source, options, runs]) => {
+    const probe = (0, eval)('(' + source + ')');
+    const times = [];
+    let result;
+    for (let i = 0; i < runs; i++) {
+        // Invalidate layout so every run pays for the same reflow.
+        document.body.style.paddingRight = (i % 2) + 'px';
+        const started = performance.now();
+        result = probe(options);
+        times.push(performance.now() - started);
+    }
+    return { times, found: result.offenders.length, visited: result.visited };
+}'''
+
+
+def bench(sizes, runs: int, limit: int = 10, tolerance: int = 5):
+    options = {'limit': limit, 'tolerance': tolerance}
+    rows = []
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page(viewport={'width': 375, 'height': 812})
+
+        for size in sizes:
+            nodes = page.evaluate(BUILD_DOM, size)
+            legacy = page.evaluate(TIME_PROBE, [LEGACY_PROBE, options, runs])
+            pruned = page.evaluate(TIME_PROBE, [OVERFLOW_DETECTOR, options, runs])
+            rows.append((nodes, legacy, pruned))
+
+        browser.close()
+
+    print(f"{'nodes':>8}  {'legacy ms':>10}  {'pruned ms':>10}  {'speedup':>8}  {'visited':>8}  found")
+    for nodes, legacy, pruned in rows:
+        legacy_ms = statistics.median(legacy['times'])
+        pruned_ms = statistics.median(pruned['times'])
+        speedup = legacy_ms / pruned_ms if pruned_ms else float('inf')
+        print(f"{nodes:>8}  {legacy_ms:>10.2f}  {pruned_ms:>10.2f}  {speedup:>7.1f}x  "
+              f"{pruned['visited']:>8}  {legacy['found']}/{pruned['found']}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--runs', type=int, default=5, help='timed runs per probe (median is reported)')
+    args = parser.parse_args()
+    bench(args.sizes, args.runs)
@@ -1,86 +1,26 @@
 #!/usr/bin/env python3
 """Mobile responsiveness testing script for Adapty marketing site."""
 
-import sys
-import os
-from playwright.sync_api import sync_playwright
+from mobile_audit.single_page import BASE_URL, VIEWPORTS, PageAudit, argument_parser, run_from_args
+from mobile_audit.watch import WatchDaemon
 
-VIEWPORTS = [
-    {'name': '375px', 'width': 375, 'height': 812},
-    {'name': '390px', 'width': 390, 'height': 844},
-    {'name': '768px', 'width': 768, 'height': 1024},
-]
 
-def test_page(page_path: str):
-    """Test a page at mobile viewports."""
-    output_dir = '/tmp/mobile-tests'
-    os.makedirs(output_dir, exist_ok=True)
+class MobileTest(PageAudit):
+    """Every viewport emulates a phone; lists the elements that overflow."""
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    wait_until = 'domcontentloaded'
+    timeout_ms = 60000
+    mobile_below = None
+    list_offenders = True
 
-        for vp in VIEWPORTS:
-            context = browser.new_context(
-                viewport={'width': vp['width'], 'height': vp['height']},
-                device_scale_factor=2,
-                is_mobile=True,
-                has_touch=True
-            )
-            page = context.new_page()
-
-            url = f'http://localhost:3011{page_path}'
-            print(f"Testing {url} at {vp['name']}...")
-            page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            page.wait_for_timeout(2000)
-
-            # Check for horizontal overflow
-            overflow = page.evaluate('''() => {
-                const body = document.body;
-                return {
-                    hasHorizontalOverflow: body.scrollWidth > window.innerWidth,
-                    bodyWidth: body.scrollWidth,
-                    windowWidth: window.innerWidth
-                };
-            }''')
-
-            if overflow['hasHorizontalOverflow']:
-                print(f"  WARNING: Horizontal overflow at {vp['name']}")
-                print(f"    Body: {overflow['bodyWidth']}px, Window: {overflow['windowWidth']}px")
-
-                # Find elements causing overflow
-                overflowing = page.evaluate('''() => {
-                    const elements = [];
-                    document.querySelectorAll('*').forEach(el => {
-                        const rect = el.getBoundingClientRect();
-                        if (rect.right > window.innerWidth + 10) {
-                            elements.push({
-                                tag: el.tagName,
-                                class: el.className?.substring?.(0, 100) || '',
-                                width: rect.width,
-                                right: rect.right
-                            });
-                        }
-                    });
-                    return elements.slice(0, 10);
-                }''')
-
-                if overflowing:
-                    print("  Overflowing elements:")
-                    for el in overflowing:
-                        print(f"    - {el['tag']}.{el['class'][:50]}... right:{el['right']:.0f}px")
-            else:
-                print(f"  OK: No horizontal overflow at {vp['name']}")
-
-            # Screenshot
-            safe_path = page_path.replace('/', '_') or '_home'
-            screenshot_path = f"{output_dir}/{safe_path}_{vp['name']}.png"
-            page.screenshot(path=screenshot_path, full_page=True)
-            print(f"  Screenshot: {screenshot_path}")
-
-            context.close()
-
-        browser.close()
 
 if __name__ == '__main__':
-    page_path = sys.argv[1] if len(sys.argv) > 1 else '/'
-    test_page(page_path)
+    parser = argument_parser(__doc__)
+    parser.add_argument('--watch', action='store_true',
+                        help='keep a warm browser and re-audit the routes affected by each saved file')
+    args = parser.parse_args()
+
+    if args.watch:
+        WatchDaemon(BASE_URL, VIEWPORTS, MobileTest().context_options).run([args.page_path])
+    else:
+        run_from_args(MobileTest(), args)
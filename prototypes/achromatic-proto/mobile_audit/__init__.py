@@ -0,0 +1,6 @@
+"""Shared helpers for the mobile responsiveness audit scripts."""
+
+from pathlib import Path
+
+# The achromatic-proto workspace root (apps/, packages/).
+APP_ROOT = Path(__file__).resolve().parent.parent
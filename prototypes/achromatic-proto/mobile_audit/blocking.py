@@ -0,0 +1,169 @@
+"""Request blocking profiles for audit runs.
+
+Analytics beacons, embedded video and third-party widgets never affect
+horizontal-overflow layout, but `wait_until='networkidle'` waits for all of
+them. A profile aborts those requests by resource type or URL pattern while
+always letting the page's own document, CSS, fonts and images through.
+Iframes load 'document' requests too; those are matched like any other
+request, so video and widget embeds can be blocked.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Never blocked, whatever the profile says (nor is the main frame's document).
+LAYOUT_CRITICAL = {'stylesheet', 'font', 'image'}
+
+THIRD_PARTY_NOISE = [
+    r'google-analytics\.com', r'googletagmanager\.com', r'doubleclick\.net',
+    r'connect\.facebook\.net', r'analytics\.tiktok\.com', r'snap\.licdn\.com',
+    r'cdn\.segment\.com', r'api\.segment\.io', r'api(-js)?\.mixpanel\.com',
+    r'amplitude\.com', r'(^|\.)posthog\.com', r'(^|\.)hotjar\.com',
+    r'widget\.intercom\.io', r'js\.intercomcdn\.com', r'(^|\.)sentry\.io',
+    r'/_vercel/(insights|speed-insights)/',
+    r'youtube\.com/embed', r'player\.vimeo\.com', r'(^|\.)loom\.com/embed',
+]
+
+PROFILES = {
+    'off': {'resource_types': [], 'url_patterns': []},
+    # Default: drop media and tracking, keep everything that can move layout.
+    'layout': {
+        'resource_types': ['media', 'websocket', 'eventsource', 'manifest', 'texttrack', 'ping'],
+        'url_patterns': THIRD_PARTY_NOISE,
+    },
+    # Also drops every third-party script and XHR; first-party code still runs.
+    'strict': {
+        'resource_types': ['media', 'websocket', 'eventsource', 'manifest', 'texttrack', 'ping'],
+        'url_patterns': THIRD_PARTY_NOISE,
+        'block_third_party': ['script', 'xhr', 'fetch', 'other'],
+    },
+}
+
+SIZES_PATH = '/tmp/mobile-tests/request-sizes.json'
+
+
+def load_profile(name_or_path: str) -> dict:
+    """A profile by name, or a JSON file with the same keys as PROFILES entries."""
+    if name_or_path in PROFILES:
+        return PROFILES[name_or_path]
+    return json.loads(Path(name_or_path).read_text())
+
+
+def _strip_query(url: str) -> str:
+    return url.split('?', 1)[0].split('#', 1)[0]
+
+
+def _is_main_frame(request) -> bool:
+    try:
+        return request.frame.parent_frame is None
+    except Exception:
+        # Service worker requests have no frame; leave them alone.
+        return True
+
+
+class RequestBlocker:
+    """Aborts matching requests on a browser context and counts what was skipped.
+
+    Blocked requests never download, so their size comes from a table of
+    sizes seen earlier. Run once with `dry_run=True` to let matching requests
+    through and record their Content-Length; later runs then report bytes
+    skipped as well as request counts.
+    """
+
+    def __init__(self, profile: dict, first_party: str, dry_run: bool = False,
+                 sizes_path: str = SIZES_PATH):
+        self.resource_types = set(profile.get('resource_types', [])) - LAYOUT_CRITICAL
+        self.url_patterns = [re.compile(pattern) for pattern in profile.get('url_patterns', [])]
+        self.block_third_party = set(profile.get('block_third_party', [])) - LAYOUT_CRITICAL
+        self.first_party = urlsplit(first_party).netloc
+        self.dry_run = dry_run
+        self.sizes_path = Path(sizes_path)
+        try:
+            self.sizes = json.loads(self.sizes_path.read_text())
+        except (OSError, ValueError):
+            self.sizes = {}
+        self.reset()
+
+    def reset(self):
+        """Start counting for a new page."""
+        self.stats = {'requests': 0, 'bytes': 0, 'by_type': {}}
+
+    def matches(self, request) -> bool:
+        resource_type = request.resource_type
+        if resource_type in LAYOUT_CRITICAL:
+            return False
+        if resource_type == 'document' and _is_main_frame(request):
+            return False
+        if resource_type in self.resource_types:
+            return True
+        url = request.url
+        if any(pattern.search(url) for pattern in self.url_patterns):
+            return True
+        return (resource_type in self.block_third_party
+                and urlsplit(url).netloc != self.first_party)
+
+    def _count(self, request):
+        self.stats['requests'] += 1
+        self.stats['bytes'] += self.sizes.get(_strip_query(request.url), 0)
+        by_type = self.stats['by_type']
+        by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+
+    def _learn(self, response):
+        length = response.headers.get('content-length')
+        if length and length.isdigit() and self.matches(response.request):
+            self.sizes[_strip_query(response.url)] = int(length)
+
+    def attach(self, context):
+        """Install on a sync-API context."""
+        def handle(route):
+            if self.matches(route.request):
+                self._count(route.request)
+                if not self.dry_run:
+                    return route.abort('blockedbyclient')
+            return route.fallback()
+
+        context.route('**/*', handle)
+        if self.dry_run:
+            context.on('response', self._learn)
+
+    async def attach_async(self, context):
+        """Install on an async-API context."""
+        async def handle(route):
+            if self.matches(route.request):
+                self._count(route.request)
+                if not self.dry_run:
+                    return await route.abort('blockedbyclient')
+            await route.fallback()
+
+        await context.route('**/*', handle)
+        if self.dry_run:
+            context.on('response', self._learn)
+
+    def save_sizes(self):
+        """Merge learned sizes into the shared table (dry runs only)."""
+        if not self.dry_run:
+            return
+        try:
+            merged = json.loads(self.sizes_path.read_text())
+        except (OSError, ValueError):
+            merged = {}
+        merged.update(self.sizes)
+        self.sizes_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.sizes_path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(merged))
+        os.replace(tmp, self.sizes_path)
+
+
+def describe(stats: dict, dry_run: bool = False) -> str:
+    """e.g. 'blocked 12 request(s), ~340 KB (script 7, media 3, ping 2)'."""
+    verb = 'would block' if dry_run else 'blocked'
+    text = f"{verb} {stats['requests']} request(s)"
+    if stats['bytes']:
+        text += f", ~{stats['bytes'] / 1024:.0f} KB"
+    if stats['by_type']:
+        parts = sorted(stats['by_type'].items(), key=lambda item: -item[1])
+        text += ' (' + ', '.join(f'{kind} {count}' for kind, count in parts) + ')'
+    return text
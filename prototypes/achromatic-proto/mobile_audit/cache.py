@@ -0,0 +1,107 @@
+"""On-disk audit result cache keyed by route, viewport and page fingerprint.
+
+Next.js content-hashes its script and style chunks, so hashing the served
+HTML together with the asset URLs it references changes whenever anything
+that can affect layout changes.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+import urllib.request
+from pathlib import Path
+
+ASSET_URL = re.compile(r'<(?:script|link)\b[^>]*?\b(?:src|href)="([^"]+)"', re.IGNORECASE)
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def page_fingerprint(url: str, timeout: float = 30) -> str:
+    """sha256 of the served HTML plus the sorted script/style asset URLs."""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        html = response.read()
+    digest = hashlib.sha256(html)
+    for asset in sorted(set(ASSET_URL.findall(html.decode('utf-8', 'replace')))):
+        digest.update(b'\0' + asset.encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """JSON entries under `directory`, evicted least-recently-used past `max_bytes`.
+
+    An entry's size includes the screenshot it references, since those are
+    what make /tmp/mobile-tests grow. `salt` is mixed into every key so a
+    change to the audit probes invalidates earlier verdicts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES, salt: str = ''):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, route: str, viewport: str) -> Path:
+        key = hashlib.sha1(f'{self.salt}|{route}|{viewport}'.encode()).hexdigest()
+        return self.directory / f'{key}.json'
+
+    def get(self, route: str, viewport: str, fingerprint: str):
+        """Stored result if the fingerprint still matches, else None."""
+        path = self._path(route, viewport)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        screenshot = entry['result'].get('screenshot')
+        if entry['fingerprint'] != fingerprint or (screenshot and not os.path.exists(screenshot)):
+            self.misses += 1
+            return None
+
+        os.utime(path)
+        self.hits += 1
+        return entry['result']
+
+    def put(self, route: str, viewport: str, fingerprint: str, result: dict):
+        path = self._path(route, viewport)
+        entry = {
+            'route': route,
+            'viewport': viewport,
+            'fingerprint': fingerprint,
+            'stored_at': time.time(),
+            'result': result,
+        }
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, path)
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries (and their screenshots) until under max_bytes."""
+        entries = []
+        total = 0
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+                screenshot = json.loads(path.read_text())['result'].get('screenshot')
+            except (OSError, ValueError, KeyError):
+                continue
+            size = stat.st_size
+            if screenshot and os.path.exists(screenshot):
+                size += os.path.getsize(screenshot)
+            entries.append((stat.st_mtime, path, screenshot, size))
+            total += size
+
+        evicted = 0
+        for _, path, screenshot, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            if screenshot:
+                Path(screenshot).unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        return evicted
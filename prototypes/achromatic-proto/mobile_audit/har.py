@@ -0,0 +1,106 @@
+"""Record and replay audit network traffic with Playwright HAR archives.
+
+`record` captures every response of a job (route x viewport) into a zipped
+HAR while auditing against the live server. `replay` serves those responses
+from disk through `route_from_har`, so the suite runs with no dev server
+and no on-demand compilation. Anything not in the archive is aborted.
+
+The manifest stores a fingerprint of the app sources at record time; replay
+refuses a stale archive unless told otherwise.
+"""
+
+import hashlib
+import json
+import re
+import subprocess
+import time
+from pathlib import Path
+
+from mobile_audit import APP_ROOT
+
+ARCHIVE_DIR = '/tmp/mobile-tests/har'
+
+# Trees whose changes invalidate recordings.
+SOURCE_PATHS = ['apps/marketing', 'packages']
+
+
+def _git(*args) -> bytes:
+    return subprocess.run(['git', '-C', str(APP_ROOT), *args],
+                          check=True, capture_output=True).stdout
+
+
+def source_fingerprint() -> str:
+    """Hash of HEAD plus uncommitted and untracked changes under SOURCE_PATHS."""
+    digest = hashlib.sha256()
+    try:
+        digest.update(_git('rev-parse', 'HEAD'))
+        digest.update(_git('diff', 'HEAD', '--binary', '--', *SOURCE_PATHS))
+        untracked = _git('ls-files', '--others', '--exclude-standard', '-z', '--', *SOURCE_PATHS)
+    except (OSError, subprocess.CalledProcessError):
+        # Not a git checkout: fall back to sizes and mtimes of every file.
+        for source in SOURCE_PATHS:
+            for path in sorted((APP_ROOT / source).rglob('*')):
+                if path.is_file() and 'node_modules' not in path.parts and '.next' not in path.parts:
+                    stat = path.stat()
+                    digest.update(f'{path}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+        return digest.hexdigest()[:16]
+
+    for name in sorted(filter(None, untracked.split(b'\0'))):
+        stat = (APP_ROOT / name.decode()).stat()
+        digest.update(name + f':{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    return digest.hexdigest()[:16]
+
+
+class HarArchive:
+    """One zipped HAR per job key in `directory`, plus manifest.json."""
+
+    def __init__(self, directory: str = ARCHIVE_DIR, mode: str = 'replay'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f'unknown HAR mode: {mode}')
+        self.directory = Path(directory)
+        self.mode = mode
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / 'manifest.json'
+
+    def path_for(self, key: str) -> Path:
+        slug = re.sub(r'[^A-Za-z0-9._-]+', '_', key).strip('_') or 'home'
+        return self.directory / f'{slug}.har.zip'
+
+    def context_options(self, key: str) -> dict:
+        """Extra new_context() options; only recording needs any."""
+        if self.mode != 'record':
+            return {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return {'record_har_path': str(self.path_for(key)), 'record_har_mode': 'full'}
+
+    async def attach_async(self, context, key: str):
+        """Serve `key`'s recorded responses on an async-API context (replay only)."""
+        if self.mode != 'replay':
+            return
+        path = self.path_for(key)
+        if not path.exists():
+            raise FileNotFoundError(f'no HAR recorded for {key}; run with --har record first')
+        await context.route_from_har(str(path), not_found='abort')
+
+    def staleness(self):
+        """None if the archive matches the current sources, else a reason string."""
+        try:
+            manifest = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return f'no manifest in {self.directory}'
+        current = source_fingerprint()
+        if manifest.get('fingerprint') != current:
+            recorded = time.strftime('%Y-%m-%d %H:%M', time.localtime(manifest.get('recorded_at', 0)))
+            return (f"sources changed since recording on {recorded} "
+                    f"({manifest.get('fingerprint')} -> {current})")
+        return None
+
+    def write_manifest(self, keys):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest_path.write_text(json.dumps({
+            'fingerprint': source_fingerprint(),
+            'recorded_at': time.time(),
+            'jobs': {key: self.path_for(key).name for key in keys},
+        }, indent=2))
@@ -0,0 +1,78 @@
+"""Per-route timing and failure history kept between audit runs."""
+
+import json
+import math
+import os
+import statistics
+from pathlib import Path
+
+MAX_SAMPLES = 20
+
+# Navigation timeouts: this percentile of the recorded load times, times
+# the headroom, clamped to [floor, ceiling]. Routes with fewer samples get
+# the caller's default.
+TIMEOUT_PERCENTILE = 95
+TIMEOUT_HEADROOM = 2.0
+MIN_TIMEOUT_SAMPLES = 3
+TIMEOUT_FLOOR_MS = 10000
+TIMEOUT_CEILING_MS = 120000
+
+# Consecutive failed runs after which a route is quarantined.
+QUARANTINE_AFTER = 3
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class RouteHistory:
+    """JSON file of recent per-job durations and failures, keyed by 'route|viewport'."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        try:
+            self.data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.data = {}
+
+    def record(self, key: str, seconds: float, load_seconds: float = None):
+        """A successful audit: its duration, navigation time, and a clean failure count."""
+        entry = self.data.setdefault(key, {})
+        for name, value in (('durations', seconds), ('loads', load_seconds)):
+            if value is None:
+                continue
+            samples = entry.setdefault(name, [])
+            samples.append(round(value, 3))
+            del samples[:-MAX_SAMPLES]
+        entry.pop('failures', None)
+        entry.pop('last_error', None)
+
+    def record_failure(self, key: str, error: str):
+        entry = self.data.setdefault(key, {})
+        entry['failures'] = entry.get('failures', 0) + 1
+        entry['last_error'] = error.splitlines()[0][:200] if error else ''
+
+    def estimate(self, key: str, default=None):
+        """Median of the recorded durations, or `default` for unseen keys."""
+        samples = self.data.get(key, {}).get('durations')
+        return statistics.median(samples) if samples else default
+
+    def timeout_ms(self, key: str, default: int) -> int:
+        """Navigation timeout for `key` from its load-time history, or `default`."""
+        samples = self.data.get(key, {}).get('loads', [])
+        if len(samples) < MIN_TIMEOUT_SAMPLES:
+            return default
+        adaptive = percentile(samples, TIMEOUT_PERCENTILE) * TIMEOUT_HEADROOM * 1000
+        return int(min(TIMEOUT_CEILING_MS, max(TIMEOUT_FLOOR_MS, adaptive)))
+
+    def quarantined(self, key: str) -> bool:
+        """True once `key` failed QUARANTINE_AFTER runs in a row; one pass releases it."""
+        return self.data.get(key, {}).get('failures', 0) >= QUARANTINE_AFTER
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.data, indent=2, sort_keys=True))
+        os.replace(tmp, self.path)
@@ -0,0 +1,187 @@
+"""Import graph of the marketing app, for mapping changed files to routes.
+
+Parses import/export/require specifiers out of the TS/JS sources with a
+regex, resolves the `~/` and `@workspace/ui/` aliases from tsconfig, and
+keeps the edges per file so a save only re-parses that file. A changed
+file affects every route whose page, or a layout above it, imports the
+file directly or transitively. The same edges give each route a
+signature: a hash of every file it renders, for the batch runner's
+added/changed detection.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+from mobile_audit import APP_ROOT
+from mobile_audit import routes as route_discovery
+
+MARKETING_DIR = APP_ROOT / 'apps' / 'marketing'
+UI_SRC = APP_ROOT / 'packages' / 'ui' / 'src'
+CONTENT_DIR = MARKETING_DIR / 'content'
+
+SOURCE_ROOTS = [MARKETING_DIR / 'app', MARKETING_DIR / 'components', MARKETING_DIR / 'lib', UI_SRC,
+                CONTENT_DIR]
+ALIASES = {'~/': MARKETING_DIR, '@workspace/ui/': UI_SRC}
+# Modules generated at build time, and the sources they are generated from.
+GENERATED = {'content-collections': CONTENT_DIR}
+
+SOURCE_SUFFIXES = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.css', '.mdx')
+RESOLVE_SUFFIXES = ('.ts', '.tsx', '.js', '.jsx', '.mjs')
+
+SPECIFIER = re.compile(r'''(?:\bfrom|\bimport\s*\(?|\brequire\s*\()\s*['"]([^'"\n]+)['"]''')
+
+# Files under app/ that wrap every route below their directory.
+WRAPPERS = {'layout', 'template', 'loading', 'error', 'not-found'}
+
+
+class ImportGraph:
+    """{file: imported files} for everything under SOURCE_ROOTS."""
+
+    def __init__(self, roots=SOURCE_ROOTS, app_dir: Path = MARKETING_DIR / 'app'):
+        self.roots = [Path(root) for root in roots]
+        self.app_dir = Path(app_dir).resolve()
+        self.imports = {}
+        self.mtimes = {}
+
+    def _files(self):
+        for root in self.roots:
+            for path in root.rglob('*'):
+                if path.suffix in SOURCE_SUFFIXES and 'node_modules' not in path.parts:
+                    yield path.resolve()
+
+    def resolve(self, specifier: str, importer: Path):
+        """The file an import specifier points at, or None for packages."""
+        if specifier.startswith('.'):
+            base = importer.parent / specifier
+        else:
+            for prefix, root in ALIASES.items():
+                if specifier.startswith(prefix):
+                    base = root / specifier[len(prefix):]
+                    break
+            else:
+                return None
+        candidates = [base, *(base.with_name(base.name + suffix) for suffix in RESOLVE_SUFFIXES),
+                      *(base / f'index{suffix}' for suffix in RESOLVE_SUFFIXES)]
+        for candidate in candidates:
+            if candidate.is_file():
+                return candidate.resolve()
+        return None
+
+    def _parse(self, path: Path):
+        try:
+            source = path.read_text(errors='replace')
+        except OSError:
+            self.imports.pop(path, None)
+            return
+        specifiers = SPECIFIER.findall(source)
+        targets = {target for target in (self.resolve(spec, path) for spec in specifiers) if target}
+        for specifier in set(specifiers) & GENERATED.keys():
+            targets.update(target.resolve() for target in GENERATED[specifier].rglob('*')
+                           if target.suffix in SOURCE_SUFFIXES)
+        self.imports[path] = targets
+
+    def refresh(self) -> set:
+        """Re-parse files whose mtime changed; returns changed, added and removed files."""
+        seen, changed = set(), set()
+        for path in self._files():
+            seen.add(path)
+            try:
+                mtime = path.stat().st_mtime_ns
+            except OSError:
+                continue
+            if self.mtimes.get(path) != mtime:
+                self.mtimes[path] = mtime
+                self._parse(path)
+                changed.add(path)
+        for path in set(self.mtimes) - seen:
+            del self.mtimes[path]
+            self.imports.pop(path, None)
+            changed.add(path)
+        return changed
+
+    def dependents(self, files) -> set:
+        """`files` plus everything that imports them, transitively."""
+        importers = {}
+        for source, targets in self.imports.items():
+            for target in targets:
+                importers.setdefault(target, set()).add(source)
+        found, stack = set(files), list(files)
+        while stack:
+            for source in importers.get(stack.pop(), ()):
+                if source not in found:
+                    found.add(source)
+                    stack.append(source)
+        return found
+
+    def dependencies(self, files) -> set:
+        """`files` plus everything they import, transitively."""
+        found, stack = set(files), list(files)
+        while stack:
+            for target in self.imports.get(stack.pop(), ()):
+                if target not in found:
+                    found.add(target)
+                    stack.append(target)
+        return found
+
+    def signatures(self) -> dict:
+        """{route pattern: hash of every file the route renders}.
+
+        That is its page, the layouts and other wrappers above it, and all
+        they import, so editing a shared section changes the signature of
+        every route that uses it. Call refresh() first.
+        """
+        digests = {}
+
+        def digest(path: Path) -> str:
+            if path not in digests:
+                try:
+                    digests[path] = hashlib.sha256(path.read_bytes()).hexdigest()
+                except OSError:
+                    digests[path] = ''
+            return digests[path]
+
+        wrappers = {}
+        for path in self.imports:
+            if path.stem in WRAPPERS and self.app_dir in path.parents:
+                wrappers.setdefault(path.parent, []).append(path)
+        signatures = {}
+        for page in self.imports:
+            if page.stem != 'page' or self.app_dir not in page.parents:
+                continue
+            rendered = {page}
+            for directory in [page.parent, *page.parent.parents]:
+                rendered.update(wrappers.get(directory, ()))
+                if directory == self.app_dir:
+                    break
+            combined = hashlib.sha256()
+            for path in sorted(self.dependencies(rendered)):
+                name = path.relative_to(APP_ROOT) if APP_ROOT in path.parents else path
+                combined.update(f'{name}:{digest(path)}\n'.encode())
+            signatures[self._route_of(page.parent)] = combined.hexdigest()[:16]
+        return signatures
+
+    def _route_of(self, directory: Path) -> str:
+        return route_discovery.normalize_route('/'.join(directory.relative_to(self.app_dir).parts))
+
+    def _patterns(self) -> set:
+        return {self._route_of(path.parent) for path in self.imports
+                if path.stem == 'page' and self.app_dir in path.parents}
+
+    def routes(self) -> list:
+        """Every route with a page file, dynamic segments expanded."""
+        return list(route_discovery.expand_dynamic(dict.fromkeys(self._patterns(), ''))[0])
+
+    def routes_for(self, changed) -> list:
+        """Routes affected by `changed` files."""
+        affected = set()
+        for path in self.dependents({Path(path).resolve() for path in changed}):
+            if self.app_dir not in path.parents:
+                continue
+            if path.stem == 'page':
+                affected.add(self._route_of(path.parent))
+            elif path.stem in WRAPPERS:
+                prefix = self._route_of(path.parent).rstrip('/')
+                affected.update(route for route in self._patterns()
+                                if route == prefix or route.startswith(prefix + '/'))
+        return sorted(route_discovery.expand_dynamic(dict.fromkeys(affected, ''))[0])
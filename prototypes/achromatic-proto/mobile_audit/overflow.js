@@ -0,0 +1,88 @@
+// Pruned single-pass horizontal overflow detector.
+//
+// Walks the tree under `root` once and reports the outermost elements whose
+// right edge passes the viewport. Subtrees are skipped when they cannot
+// contribute to page overflow:
+//   - display: none
+//   - clipped by overflow-x hidden/clip/auto/scroll or contain: paint
+//   - below an element that is already reported (its children are symptoms)
+// The walk stops after `limit` offenders.
+(options) => {
+    const { limit = 10, tolerance = 5, root = null } = options || {};
+    const viewportWidth = window.innerWidth;
+    const start = root || document.body;
+    const offenders = [];
+    let visited = 0;
+
+    const CLIPPING = new Set(['hidden', 'clip', 'auto', 'scroll']);
+    const SKIPPED_TAGS = new Set(['SCRIPT', 'STYLE', 'LINK', 'META', 'NOSCRIPT', 'TEMPLATE', 'HEAD']);
+
+    const classOf = (el) => (el.getAttribute('class') || '').trim();
+
+    const selectorPath = (el) => {
+        const parts = [];
+        while (el && el.nodeType === 1 && el !== document.documentElement) {
+            if (el.id) {
+                parts.unshift(`#${CSS.escape(el.id)}`);
+                break;
+            }
+            let part = el.tagName.toLowerCase();
+            const classes = classOf(el).split(/\s+/).filter(Boolean).slice(0, 2);
+            if (classes.length) {
+                part += classes.map((c) => `.${CSS.escape(c)}`).join('');
+            }
+            const parent = el.parentElement;
+            if (parent) {
+                const sameTag = Array.from(parent.children).filter((c) => c.tagName === el.tagName);
+                if (sameTag.length > 1) {
+                    part += `:nth-of-type(${sameTag.indexOf(el) + 1})`;
+                }
+            }
+            parts.unshift(part);
+            el = parent;
+        }
+        return parts.join(' > ');
+    };
+
+    const clips = (style) =>
+        CLIPPING.has(style.overflowX) || /\b(paint|strict|content)\b/.test(style.contain);
+
+    // Explicit stack, children pushed in reverse to keep document order.
+    const stack = Array.from(start.children).reverse();
+    while (stack.length && offenders.length < limit) {
+        const el = stack.pop();
+        if (SKIPPED_TAGS.has(el.tagName)) continue;
+        visited++;
+
+        const style = getComputedStyle(el);
+        if (style.display === 'none') continue;
+
+        const rect = el.getBoundingClientRect();
+        if (rect.right > viewportWidth + tolerance) {
+            offenders.push({
+                tag: el.tagName,
+                className: classOf(el).substring(0, 100),
+                width: rect.width,
+                right: rect.right,
+                // Document coordinates, for clipping screenshots to the offender.
+                top: rect.top + window.scrollY,
+                height: rect.height,
+                selector: selectorPath(el),
+            });
+            continue;
+        }
+
+        if (clips(style)) continue;
+
+        const children = el.children;
+        for (let i = children.length - 1; i >= 0; i--) {
+            stack.push(children[i]);
+        }
+    }
+
+    return {
+        offenders,
+        visited,
+        truncated: offenders.length >= limit && stack.length > 0,
+    };
+}
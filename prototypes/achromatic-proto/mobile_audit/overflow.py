@@ -0,0 +1,49 @@
+"""In-page horizontal overflow detection."""
+
+from pathlib import Path
+
+OVERFLOW_DETECTOR = (Path(__file__).parent / 'overflow.js').read_text()
+
+
+def find_overflowing(page, limit: int = 10, tolerance: int = 5, root=None):
+    """Return the root-cause overflow offenders on `page`.
+
+    Works with sync and async Playwright pages; on an async page the
+    result is an awaitable. `root` is an optional ElementHandle that limits
+    the walk to one subtree.
+
+    Result: {'offenders': [{tag, className, width, right, top, height, selector}, ...],
+             'visited': int, 'truncated': bool}
+    """
+    return page.evaluate(OVERFLOW_DETECTOR, {
+        'limit': limit,
+        'tolerance': tolerance,
+        'root': root,
+    })
+
+
+SCROLL_SWEEP = (Path(__file__).parent / 'scroll_sweep.js').read_text()
+
+
+def audit_scroll_positions(page, limit: int = 10, tolerance: int = 5, settle_ms: int = 150,
+                           step_timeout_ms: int = 1500, max_steps: int = 200):
+    """Scroll through `page` a viewport at a time, probing sections as they appear.
+
+    Catches overflow in lazily mounted and scroll-animated sections that a
+    check right after load misses. Each step waits only for sections that
+    just entered the viewport, and only they (plus newly mounted nodes) are
+    probed. Scrolls back to the top when done. Sync or async page, like
+    find_overflowing().
+
+    Result: {'steps', 'roots', 'elapsedMs', 'truncated',
+             'offenders': [{..., step, scrollY}],
+             'pageOverflow': [{step, scrollY, bodyWidth}]}
+    """
+    return page.evaluate(SCROLL_SWEEP, {
+        'detector': OVERFLOW_DETECTOR,
+        'limit': limit,
+        'tolerance': tolerance,
+        'settleMs': settle_ms,
+        'stepTimeoutMs': step_timeout_ms,
+        'maxSteps': max_steps,
+    })
@@ -0,0 +1,56 @@
+// Resolves as soon as the page is visually settled, or when `timeoutMs` runs out:
+//   1. document.fonts.ready has resolved
+//   2. running finite Web Animations have finished (infinite ones such as
+//      marquees are ignored, they never finish)
+//   3. no resize of <html>/<body> and no nodes added or removed for `quietMs`
+// Attribute mutations are not watched: JS-driven motion rewrites inline styles
+// every frame without necessarily changing layout.
+async (options) => {
+    const { quietMs = 250, timeoutMs = 5000 } = options || {};
+    const started = performance.now();
+    const remaining = () => Math.max(0, started + timeoutMs - performance.now());
+
+    const withinDeadline = (promise) => Promise.race([
+        promise.then(() => true, () => true),
+        new Promise((resolve) => setTimeout(() => resolve(false), remaining())),
+    ]);
+
+    const fonts = await withinDeadline(document.fonts ? document.fonts.ready : Promise.resolve());
+
+    const finite = document.getAnimations().filter((animation) => {
+        if (animation.playState !== 'running') return false;
+        const timing = animation.effect && animation.effect.getComputedTiming();
+        return timing && Number.isFinite(timing.endTime);
+    });
+    const animations = await withinDeadline(Promise.all(finite.map((animation) => animation.finished)));
+
+    const quiet = await new Promise((resolve) => {
+        let timer;
+        const resizes = new ResizeObserver(() => arm());
+        const mutations = new MutationObserver(() => arm());
+        const finish = (settled) => {
+            resizes.disconnect();
+            mutations.disconnect();
+            clearTimeout(timer);
+            clearTimeout(deadline);
+            resolve(settled);
+        };
+        const arm = () => {
+            clearTimeout(timer);
+            timer = setTimeout(() => finish(true), quietMs);
+        };
+        const deadline = setTimeout(() => finish(false), remaining());
+        resizes.observe(document.documentElement);
+        resizes.observe(document.body);
+        mutations.observe(document.body, { childList: true, subtree: true });
+        arm();
+    });
+
+    return {
+        waitedMs: Math.round(performance.now() - started),
+        fonts,
+        animations,
+        quiet,
+        timedOut: !(fonts && animations && quiet),
+    };
+}
@@ -0,0 +1,29 @@
+"""Deterministic "page is settled" detection, replacing fixed sleeps."""
+
+from pathlib import Path
+
+READINESS_PROBE = (Path(__file__).parent / 'readiness.js').read_text()
+
+# Upper bound for one wait; fonts, animations and the quiet window share it.
+READY_TIMEOUT_MS = 5000
+QUIET_MS = 250
+
+
+def wait_until_ready(page, quiet_ms: int = QUIET_MS, timeout_ms: int = READY_TIMEOUT_MS):
+    """Wait for fonts, finite Web Animations and a layout-quiet window.
+
+    Works with sync and async Playwright pages; on an async page the
+    result is an awaitable.
+
+    Result: {'waitedMs': int, 'fonts': bool, 'animations': bool,
+             'quiet': bool, 'timedOut': bool}
+    """
+    return page.evaluate(READINESS_PROBE, {'quietMs': quiet_ms, 'timeoutMs': timeout_ms})
+
+
+def describe(readiness: dict) -> str:
+    """Short human-readable form, e.g. 'ready in 412ms' or 'not settled after 5000ms (animations)'."""
+    if not readiness['timedOut']:
+        return f"ready in {readiness['waitedMs']}ms"
+    pending = [name for name in ('fonts', 'animations', 'quiet') if not readiness[name]]
+    return f"not settled after {readiness['waitedMs']}ms ({', '.join(pending)})"
@@ -0,0 +1,110 @@
+"""Streaming machine-readable audit results.
+
+Every finished job is appended to a JSONL file and flushed immediately, so
+CI can tail progress and an aborted run can be resumed from what is
+already on disk. The SUMMARY and the JUnit XML report are built from the
+stream rather than from in-memory state.
+"""
+
+import json
+import os
+from pathlib import Path
+from xml.etree import ElementTree
+
+
+class ResultStream:
+    """Append-only JSONL of {'key', 'index', 'label', **result} records."""
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume:
+            self._drop_partial_line()
+        self.file = open(self.path, 'a' if resume else 'w')
+
+    def _drop_partial_line(self):
+        """Cut a last line an aborted run left half-written, so the next record starts on its own line."""
+        try:
+            with open(self.path, 'rb+') as f:
+                data = f.read()
+                end = data.rfind(b'\n') + 1
+                if end < len(data):
+                    f.truncate(end)
+        except FileNotFoundError:
+            pass
+
+    def write(self, key: str, index: int, label: str, result: dict):
+        record = {'key': key, 'index': index, 'label': label, **result}
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+def read_stream(path: str) -> dict:
+    """Records by key; later records win, a truncated last line is ignored."""
+    records = {}
+    try:
+        lines = Path(path).read_text().splitlines()
+    except OSError:
+        return records
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        records[record['key']] = record
+    return records
+
+
+def write_junit(records, path: str, suite: str = 'mobile-overflow'):
+    """One testcase per record: overflow is a failure, an exception an error.
+
+    Errors of quarantined routes are reported as skipped.
+    """
+    records = list(records)
+    failures = sum(1 for r in records if 'error' not in r and r['overflow']['hasHorizontalOverflow'])
+    skipped = sum(1 for r in records if 'error' in r and r.get('quarantined'))
+    errors = sum(1 for r in records if 'error' in r) - skipped
+
+    testsuite = ElementTree.Element('testsuite', {
+        'name': suite,
+        'tests': str(len(records)),
+        'failures': str(failures),
+        'errors': str(errors),
+        'skipped': str(skipped),
+        'time': f"{sum(r.get('duration', 0) for r in records):.3f}",
+    })
+    for record in records:
+        testcase = ElementTree.SubElement(testsuite, 'testcase', {
+            'classname': f"{suite}.{record.get('viewport', 'default')}",
+            'name': record['page'],
+            'time': f"{record.get('duration', 0):.3f}",
+        })
+        if 'error' in record and record.get('quarantined'):
+            ElementTree.SubElement(testcase, 'skipped', {
+                'message': f"quarantined after repeated failures: {record['error'][:200]}",
+            })
+        elif 'error' in record:
+            error = ElementTree.SubElement(testcase, 'error', {'message': record['error'][:200]})
+            error.text = record['error']
+        elif record['overflow']['hasHorizontalOverflow']:
+            overflow = record['overflow']
+            failure = ElementTree.SubElement(testcase, 'failure', {
+                'message': f"horizontal overflow: {overflow['bodyWidth']}px > {overflow['windowWidth']}px",
+            })
+            failure.text = '\n'.join(
+                f"{el['tag']} right:{el['right']:.0f}px at {el['selector']}"
+                for el in record.get('elements', [])
+            )
+        if record.get('screenshot'):
+            ElementTree.SubElement(testcase, 'system-out').text = f"[[ATTACHMENT|{record['screenshot']}]]"
+        elif record.get('screenshot_error'):
+            ElementTree.SubElement(testcase, 'system-err').text = f"screenshot failed: {record['screenshot_error']}"
+
+    tree = ElementTree.ElementTree(testsuite)
+    ElementTree.indent(tree)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tree.write(path, encoding='utf-8', xml_declaration=True)
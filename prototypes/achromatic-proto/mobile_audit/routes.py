@@ -0,0 +1,190 @@
+"""Discover the routes the marketing app serves instead of hand-keeping a list.
+
+Routes come from the production build's manifests when there is one
+(`.next/server/app-paths-manifest.json` plus the concrete paths in
+`.next/prerender-manifest.json`), otherwise from the page files under
+app/ (found through the import graph). The server's /sitemap.xml is only
+used on request: it lists top-level folders only, so it misses nested
+routes such as /compare/*.
+Dynamic segments are expanded from DYNAMIC_ROUTES_PATH:
+
+    {"/blog/[...slug]": ["a-post", "nested/post"], "/docs/[[...slug]]": ["", "using-mdx"]}
+
+Every route carries a signature, so `diff_routes()` can tell what was
+added or changed since the last audited snapshot. The signature hashes
+every source file the route renders (ImportGraph.signatures), so editing
+a shared section marks every route using it as changed. For the
+manifests it also covers the compiled page entry. The sitemap's lastmod
+is not used: it is the request time for some routes and the page.tsx
+mtime for others, which misses component edits.
+"""
+
+import hashlib
+import json
+import os
+import re
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlsplit
+from xml.etree import ElementTree
+
+from mobile_audit import APP_ROOT
+
+NEXT_DIR = APP_ROOT / 'apps' / 'marketing' / '.next'
+DYNAMIC_ROUTES_PATH = Path(__file__).parent / 'dynamic-routes.json'
+SNAPSHOT_PATH = '/tmp/mobile-tests/routes.json'
+
+DYNAMIC_SEGMENT = re.compile(r'\[\[?(?:\.\.\.)?[^\]]+\]\]?')
+
+
+def normalize_route(route: str) -> str:
+    """Drop route groups `(name)` and parallel slots `@name`; '/' for the root."""
+    parts = [part for part in route.split('/')
+             if part and not (part.startswith('(') and part.endswith(')')) and not part.startswith('@')]
+    return '/' + '/'.join(parts)
+
+
+def _file_signature(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+    except OSError:
+        return ''
+
+
+def from_manifest(next_dir: Path = NEXT_DIR) -> dict:
+    """{route: signature} from a production build, or {} if there is none."""
+    next_dir = Path(next_dir)
+    try:
+        app_paths = json.loads((next_dir / 'server' / 'app-paths-manifest.json').read_text())
+    except (OSError, ValueError):
+        return {}
+
+    routes = {}
+    for entry, chunk in app_paths.items():
+        if not entry.endswith('/page') or entry.startswith('/_'):
+            continue
+        routes[normalize_route(entry[:-len('/page')])] = _file_signature(next_dir / 'server' / chunk)
+
+    # Prerendered params of dynamic routes are concrete paths already.
+    try:
+        prerendered = json.loads((next_dir / 'prerender-manifest.json').read_text())['routes']
+    except (OSError, ValueError, KeyError):
+        prerendered = {}
+    for route, info in prerendered.items():
+        source = normalize_route(info.get('srcRoute') or route)
+        if route != source and source in routes:
+            routes[normalize_route(route)] = routes[source]
+    return routes
+
+
+def from_sources() -> dict:
+    """{route pattern: source signature} for every page under app/, or {} without sources."""
+    # Imported here: imports.py builds on this module's normalize_route().
+    from mobile_audit.imports import ImportGraph
+
+    graph = ImportGraph()
+    graph.refresh()
+    return graph.signatures()
+
+
+def from_sitemap(base_url: str, timeout: float = 30) -> dict:
+    """{route: ''} from the server's sitemap, or {} if it cannot be read."""
+    try:
+        with urllib.request.urlopen(f'{base_url}/sitemap.xml', timeout=timeout) as response:
+            root = ElementTree.fromstring(response.read())
+    except (OSError, ElementTree.ParseError):
+        return {}
+
+    namespace = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+    routes = {}
+    for url in root.findall('sm:url', namespace):
+        loc = url.findtext('sm:loc', '', namespace).strip()
+        if loc:
+            routes[normalize_route(urlsplit(loc).path)] = ''
+    return routes
+
+
+def expand_dynamic(routes: dict, config_path: Path = DYNAMIC_ROUTES_PATH):
+    """Replace dynamic patterns by their configured values.
+
+    Returns (routes, unexpanded): patterns without config are dropped and,
+    unless prerendered instances were found, listed in `unexpanded`.
+    Optional catch-alls without config fall back to their base path.
+    """
+    try:
+        config = json.loads(Path(config_path).read_text())
+    except (OSError, ValueError):
+        config = {}
+
+    expanded, unexpanded = {}, []
+    for route, signature in routes.items():
+        match = DYNAMIC_SEGMENT.search(route)
+        if not match:
+            expanded.setdefault(route, signature)
+            continue
+        values = config.get(route)
+        if values is None:
+            if not match.group().startswith('[['):
+                # Fine if the build prerendered some of its params already.
+                instance = re.compile(re.escape(route[:match.start()]) + '.+'
+                                      + re.escape(route[match.end():]) + '$')
+                if not any(instance.match(other) and not DYNAMIC_SEGMENT.search(other) for other in routes):
+                    unexpanded.append(route)
+                continue
+            values = ['']
+        for value in values:
+            concrete = normalize_route(route[:match.start()] + value + route[match.end():])
+            # The value is part of the signature so editing the config re-audits.
+            expanded[concrete] = f'{signature}:{value}'
+    return dict(sorted(expanded.items())), unexpanded
+
+
+def discover_routes(base_url: str, source: str = 'auto', next_dir: Path = NEXT_DIR):
+    """(routes, source_used, unexpanded) for `source` in 'auto', 'manifest', 'app' or 'sitemap'.
+
+    'auto' uses the manifests only when a production build exists, since
+    `next dev` writes them for compiled routes only, and the app/ tree
+    otherwise. Whatever lists the routes, their signatures come from the
+    sources; routes the sources do not know (e.g. a sitemap entry without
+    a page file) get an empty signature and never count as changed.
+    """
+    signatures, unexpanded = expand_dynamic(from_sources())
+    routes, used = {}, source
+    if source == 'manifest' or (source == 'auto' and (Path(next_dir) / 'BUILD_ID').exists()):
+        built, unexpanded = expand_dynamic(from_manifest(next_dir))
+        routes = {route: f"{entry}:{signatures.get(route, '')}" for route, entry in built.items()}
+        used = 'manifest'
+    if not routes and source in ('auto', 'app'):
+        routes, used = signatures, 'app'
+    if not routes and source in ('auto', 'sitemap'):
+        routes = {route: signatures.get(route, '')
+                  for route in expand_dynamic(from_sitemap(base_url))[0]}
+        used, unexpanded = 'sitemap', []
+    return routes, used, unexpanded
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> dict:
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_snapshot(routes: dict, path: str = SNAPSHOT_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(routes, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def diff_routes(previous: dict, current: dict) -> dict:
+    """{'added', 'changed', 'removed', 'unchanged'}: sorted route lists."""
+    return {
+        'added': sorted(current.keys() - previous.keys()),
+        'changed': sorted(route for route in current.keys() & previous.keys()
+                          if current[route] != previous[route]),
+        'removed': sorted(previous.keys() - current.keys()),
+        'unchanged': sorted(route for route in current.keys() & previous.keys()
+                            if current[route] == previous[route]),
+    }
@@ -0,0 +1,156 @@
+"""Screenshot capture with clipping, lossy formats and off-thread writes.
+
+Full-page 2x PNGs of long marketing pages are several MB each. A
+ScreenshotWriter can instead:
+  - clip to the union of the overflow offenders' boxes ('clip' mode; the
+    first screen when nothing overflows), or capture the first screen only
+    ('viewport' mode)
+  - save JPEG (encoded by the browser) or WebP (re-encoded with Pillow,
+    an optional dependency: pip install pillow; captures taller or wider
+    than WebP's WEBP_MAX_SIZE are scaled down to fit)
+  - write, and transcode, on a background thread pool so the next
+    navigation does not wait for the disk
+
+Files appear atomically, so a path that exists is always complete. A
+failed write is recorded in `errors` rather than raised, so one bad
+capture cannot abort a run.
+"""
+
+import asyncio
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MODES = ('full', 'clip', 'viewport')
+FORMATS = ('png', 'jpeg', 'webp')
+EXTENSIONS = {'png': '.png', 'jpeg': '.jpg', 'webp': '.webp'}
+
+# Context kept around clipped offenders, in CSS pixels.
+CLIP_PADDING = 24
+
+# Largest width or height a WebP image can have, in pixels.
+WEBP_MAX_SIZE = 16383
+
+
+def clip_for(offenders, page_width: float, padding: int = CLIP_PADDING):
+    """Union of the offenders' boxes in document coordinates, or None.
+
+    Starts at x=0 so the viewport edge the element crosses is in the shot.
+    """
+    boxes = [el for el in offenders if 'top' in el]
+    if not boxes:
+        return None
+    top = max(0, min(el['top'] for el in boxes) - padding)
+    bottom = max(el['top'] + el['height'] for el in boxes) + padding
+    right = min(max(el['right'] for el in boxes) + padding, page_width)
+    return {'x': 0, 'y': top, 'width': max(1, right), 'height': max(1, bottom - top)}
+
+
+class ScreenshotWriter:
+    """Captures screenshots and hands encoding and writing to worker threads.
+
+    `capture()` (sync API) and `capture_async()` return the final file path
+    immediately; `settle_async(path)` waits for that one write and
+    `close()` for all of them. `files` and `bytes_written` count what was
+    written; `errors` maps each path that could not be written to why.
+    """
+
+    def __init__(self, mode: str = 'full', fmt: str = 'png', quality: int = 80, workers: int = 2):
+        if mode not in MODES:
+            raise ValueError(f'unknown screenshot mode: {mode}')
+        if fmt not in FORMATS:
+            raise ValueError(f'unknown screenshot format: {fmt}')
+        if fmt == 'webp':
+            try:
+                import PIL.Image  # noqa: F401
+            except ImportError:
+                raise SystemExit('WebP screenshots need Pillow: pip install pillow')
+        self.mode = mode
+        self.fmt = fmt
+        self.quality = quality
+        self.extension = EXTENSIONS[fmt]
+        self.files = 0
+        self.bytes_written = 0
+        self.errors = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='screenshot')
+        self._pending = {}
+
+    def _options(self, offenders, page_width: float) -> dict:
+        options = {'full_page': self.mode == 'full'}
+        if self.mode == 'clip':
+            clip = clip_for(offenders or [], page_width)
+            if clip:
+                options.update(full_page=True, clip=clip)
+        if self.fmt == 'jpeg':
+            options.update(type='jpeg', quality=self.quality)
+        else:
+            # WebP is transcoded from a lossless capture.
+            options['type'] = 'png'
+        return options
+
+    def _encode_webp(self, data: bytes) -> bytes:
+        from PIL import Image
+        image = Image.open(io.BytesIO(data))
+        scale = WEBP_MAX_SIZE / max(image.size)
+        if scale < 1:
+            # A long full-page capture at 2x easily passes the limit.
+            image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))),
+                                 Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, 'WEBP', quality=self.quality, method=4)
+        return buffer.getvalue()
+
+    def _write(self, data: bytes, path: str):
+        """Encode and write one capture; returns the error message, or None."""
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            if self.fmt == 'webp':
+                data = self._encode_webp(data)
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except Exception as e:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            with self._lock:
+                self.errors[path] = str(e)
+            return str(e)
+        with self._lock:
+            self.files += 1
+            self.bytes_written += len(data)
+        return None
+
+    def _submit(self, data: bytes, path: str):
+        self._pending[path] = self._pool.submit(self._write, data, path)
+
+    def capture(self, page, stem: str, offenders=None, page_width: float = None) -> str:
+        """Screenshot a sync-API page to `stem` + extension."""
+        path = stem + self.extension
+        width = page_width or page.viewport_size['width']
+        self._submit(page.screenshot(**self._options(offenders, width)), path)
+        return path
+
+    async def capture_async(self, page, stem: str, offenders=None, page_width: float = None) -> str:
+        """Screenshot an async-API page to `stem` + extension."""
+        path = stem + self.extension
+        width = page_width or page.viewport_size['width']
+        self._submit(await page.screenshot(**self._options(offenders, width)), path)
+        return path
+
+    async def settle_async(self, path: str):
+        """Wait for the write of `path`; returns its error message, or None."""
+        future = self._pending.get(path)
+        return await asyncio.wrap_future(future) if future else self.errors.get(path)
+
+    def close(self) -> dict:
+        """Wait for pending writes; returns `errors`."""
+        self._pending = {}
+        self._pool.shutdown(wait=True)
+        return self.errors
+
+
+def describe(files: int, total_bytes: int) -> str:
+    """e.g. '12 screenshot(s), 3.4 MB written'."""
+    return f"{files} screenshot(s), {total_bytes / 1024 / 1024:.1f} MB written"
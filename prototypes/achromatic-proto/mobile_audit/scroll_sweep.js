@@ -0,0 +1,164 @@
+// Scroll-sweep overflow audit for lazy and scroll-triggered sections.
+//
+// Scrolls through the page one viewport at a time. An IntersectionObserver
+// reports which sections just entered the viewport; only those are waited
+// for (their finite animations and a short mutation-quiet window), and the
+// overflow detector runs on them and on nodes mounted since the last step
+// instead of rescanning the whole document. The page grows as lazy content
+// mounts, so its height is re-read at every step.
+//
+// options: { detector: <overflow.js source>, limit, tolerance, settleMs,
+//            stepTimeoutMs, maxSteps }
+async (options) => {
+    const {
+        detector, limit = 10, tolerance = 5, settleMs = 150, stepTimeoutMs = 1500, maxSteps = 200,
+    } = options;
+    const detect = (0, eval)('(' + detector + ')');
+    const viewportWidth = window.innerWidth;
+    const started = performance.now();
+
+    const CLIPPING = new Set(['hidden', 'clip', 'auto', 'scroll']);
+    const clipped = (el) => {
+        for (let node = el.parentElement; node && node !== document.body; node = node.parentElement) {
+            const style = getComputedStyle(node);
+            if (CLIPPING.has(style.overflowX) || /\b(paint|strict|content)\b/.test(style.contain)) {
+                return true;
+            }
+        }
+        return false;
+    };
+    const selectorOf = (el) => {
+        const parts = [];
+        for (let node = el; node && node !== document.body && parts.length < 4;
+             node = node.parentElement) {
+            if (node.id) {
+                parts.unshift(`#${CSS.escape(node.id)}`);
+                break;
+            }
+            const classes = (node.getAttribute('class') || '').split(/\s+/).filter(Boolean).slice(0, 2);
+            parts.unshift(node.tagName.toLowerCase() + classes.map((c) => `.${CSS.escape(c)}`).join(''));
+        }
+        return parts.join(' > ');
+    };
+    const frame = () => new Promise((resolve) => requestAnimationFrame(() => resolve()));
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+    // Sections: direct children of <main> (or <body>) plus explicit <section>s.
+    const container = document.querySelector('main') || document.body;
+    const observed = new WeakSet();
+    const entered = new Set();
+    const intersections = new IntersectionObserver((entries) => {
+        for (const entry of entries) {
+            if (entry.isIntersecting) entered.add(entry.target);
+        }
+    });
+    const observe = (el) => {
+        if (el.nodeType !== 1 || observed.has(el)) return;
+        observed.add(el);
+        intersections.observe(el);
+    };
+    Array.from(container.children).forEach(observe);
+    document.querySelectorAll('section').forEach(observe);
+
+    // Nodes mounted after the initial scan are probed at the next step.
+    let mounted = [];
+    let lastMutation = performance.now();
+    const mutations = new MutationObserver((records) => {
+        lastMutation = performance.now();
+        for (const record of records) {
+            for (const node of record.addedNodes) {
+                if (node.nodeType !== 1) continue;
+                mounted.push(node);
+                if (node.parentElement === container || node.tagName === 'SECTION') observe(node);
+            }
+        }
+    });
+    mutations.observe(document.body, { childList: true, subtree: true });
+
+    const scannedAt = new WeakMap();
+    const offenders = [];
+    const seen = new Set();
+    let roots = 0;
+    const probe = (root, step) => {
+        if (!root.isConnected || scannedAt.has(root) || clipped(root)) return;
+        // Skip roots inside a subtree walked at this step; earlier walks
+        // happened before the root was mounted.
+        for (let node = root.parentElement; node; node = node.parentElement) {
+            if (scannedAt.get(node) === step) return;
+        }
+        scannedAt.set(root, step);
+        roots++;
+        // The detector walks below `root`, so the root itself is checked here.
+        const rect = root.getBoundingClientRect();
+        const found = rect.right > viewportWidth + tolerance && getComputedStyle(root).display !== 'none'
+            ? [{
+                tag: root.tagName,
+                className: (root.getAttribute('class') || '').trim().substring(0, 100),
+                width: rect.width,
+                right: rect.right,
+                top: rect.top + window.scrollY,
+                height: rect.height,
+                selector: selectorOf(root),
+            }]
+            : detect({ limit, tolerance, root }).offenders;
+        for (const offender of found) {
+            if (seen.has(offender.selector) || offenders.length >= limit) continue;
+            seen.add(offender.selector);
+            offenders.push({ ...offender, step, scrollY: Math.round(window.scrollY) });
+        }
+    };
+
+    const settle = async (sections) => {
+        const deadline = performance.now() + stepTimeoutMs;
+        const finite = sections.flatMap((el) => el.getAnimations({ subtree: true })).filter((a) => {
+            const timing = a.effect && a.effect.getComputedTiming();
+            return a.playState === 'running' && timing && Number.isFinite(timing.endTime);
+        });
+        await Promise.race([
+            Promise.all(finite.map((a) => a.finished.catch(() => null))),
+            sleep(Math.max(0, deadline - performance.now())),
+        ]);
+        while (performance.now() - lastMutation < settleMs && performance.now() < deadline) {
+            await sleep(Math.min(settleMs, deadline - performance.now()));
+        }
+    };
+
+    const pageOverflow = [];
+    let steps = 0;
+    let y = 0;
+    while (steps < maxSteps && offenders.length < limit) {
+        const step = steps++;
+        window.scrollTo(0, y);
+        // IntersectionObserver callbacks are delivered after the next frames.
+        await frame();
+        await frame();
+        const fresh = Array.from(entered);
+        entered.clear();
+        if (fresh.length) await settle(fresh);
+
+        const pending = mounted;
+        mounted = [];
+        for (const root of [...fresh, ...pending]) probe(root, step);
+
+        const bodyWidth = document.body.scrollWidth;
+        if (bodyWidth > viewportWidth) {
+            pageOverflow.push({ step, scrollY: Math.round(window.scrollY), bodyWidth });
+        }
+
+        const height = document.documentElement.scrollHeight;
+        if (y + window.innerHeight >= height) break;
+        y = Math.min(y + window.innerHeight, height - window.innerHeight);
+    }
+
+    intersections.disconnect();
+    mutations.disconnect();
+    window.scrollTo(0, 0);
+    return {
+        steps,
+        roots,
+        offenders,
+        pageOverflow,
+        truncated: offenders.length >= limit || steps >= maxSteps,
+        elapsedMs: Math.round(performance.now() - started),
+    };
+}
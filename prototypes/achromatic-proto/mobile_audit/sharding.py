@@ -0,0 +1,30 @@
+"""Split audit jobs across worker processes."""
+
+# Expected seconds for a job with no history at all.
+DEFAULT_ESTIMATE = 10.0
+
+
+def plan_shards(jobs, shards: int, estimate):
+    """Longest-processing-time-first assignment of `jobs` to `shards` buckets.
+
+    Jobs are taken slowest first and each goes to the least-loaded shard,
+    so every shard starts with its slowest routes and no shard ends up
+    with a long tail. `estimate(job)` returns expected seconds or None.
+
+    Returns (plan, loads): the job list per shard, slowest first, and the
+    expected seconds per shard.
+    """
+    known = [seconds for seconds in map(estimate, jobs) if seconds is not None]
+    fallback = sum(known) / len(known) if known else DEFAULT_ESTIMATE
+
+    def expected(job):
+        seconds = estimate(job)
+        return fallback if seconds is None else seconds
+
+    plan = [[] for _ in range(shards)]
+    loads = [0.0] * shards
+    for job in sorted(jobs, key=expected, reverse=True):
+        shard = loads.index(min(loads))
+        plan[shard].append(job)
+        loads[shard] += expected(job)
+    return plan, loads
@@ -0,0 +1,267 @@
+"""The one-route viewport audit behind mobile-test.py and test-mobile.py.
+
+Both scripts load a page at each of VIEWPORTS, check it for horizontal
+overflow and screenshot it, with the same sweep, blocking, vitals, timing
+and screenshot options. They differ only in how they navigate, which
+viewports emulate a phone and what they print; each script subclasses
+PageAudit and sets those class attributes.
+"""
+
+import argparse
+import os
+
+from playwright.sync_api import sync_playwright
+
+from mobile_audit import blocking as request_blocking
+from mobile_audit import vitals
+from mobile_audit.history import RouteHistory
+from mobile_audit.overflow import audit_scroll_positions, find_overflowing
+from mobile_audit.readiness import describe, wait_until_ready
+from mobile_audit.screenshots import FORMATS, MODES, ScreenshotWriter
+from mobile_audit.screenshots import describe as describe_screenshots
+from mobile_audit.timing import Timeline, print_phase_stats, write_trace
+
+BASE_URL = 'http://localhost:3011'
+OUTPUT_DIR = '/tmp/mobile-tests'
+HISTORY_PATH = '/tmp/mobile-tests/history.json'
+
+VIEWPORTS = [
+    {'name': '375px', 'width': 375, 'height': 812},  # iPhone SE
+    {'name': '390px', 'width': 390, 'height': 844},  # iPhone 14
+    {'name': '768px', 'width': 768, 'height': 1024},  # Tablet
+]
+
+# Upper bound for settling after set_viewport_size() in sweep mode.
+RESIZE_READY_TIMEOUT_MS = 1500
+
+
+class PageAudit:
+    """Audits one route across `viewports`; see run().
+
+    Subclasses set:
+      wait_until      the page.goto() load state
+      timeout_ms      navigation timeout until batch-mobile-test.py has
+                      recorded enough load times for the route to adapt it
+                      (see RouteHistory.timeout_ms)
+      mobile_below    viewports narrower than this get is_mobile/has_touch
+                      (None: all of them)
+      list_offenders  always look for and print the overflowing elements;
+                      otherwise they are only found to clip screenshots
+      *_message       the wording; a None message is not printed
+    """
+
+    viewports = VIEWPORTS
+    wait_until = 'domcontentloaded'
+    timeout_ms = 60000
+    mobile_below = None
+    list_offenders = True
+    overflow_message = "  WARNING: Horizontal overflow at {name}"
+    widths_message = "    Body: {bodyWidth}px, Window: {windowWidth}px"
+    clean_message = "  OK: No horizontal overflow at {name}"
+    screenshot_message = "  Screenshot: {path}"
+
+    def context_options(self, vp: dict) -> dict:
+        """Browser context options for a viewport."""
+        mobile = self.mobile_below is None or vp['width'] < self.mobile_below
+        return {
+            'viewport': {'width': vp['width'], 'height': vp['height']},
+            'device_scale_factor': 2,
+            'is_mobile': mobile,
+            'has_touch': mobile,
+        }
+
+    def device_key(self, vp: dict) -> tuple:
+        """Options that cannot change on a live context; a change needs a new one."""
+        options = self.context_options(vp)
+        return (options['device_scale_factor'], options['is_mobile'], options['has_touch'])
+
+    def check_viewport(self, page, page_path: str, vp: dict, output_dir: str, screenshots,
+                       timeline=None, scroll_sweep: bool = False):
+        """Run the overflow check and take the screenshot at the current viewport.
+
+        With `scroll_sweep`, the page is also scrolled through to catch
+        sections that mount or animate in below the fold.
+        """
+        timeline = timeline or Timeline(enabled=False)
+        overflowing = []
+        # Check for horizontal overflow
+        with timeline.phase('evaluate', vp['name']):
+            overflow = page.evaluate('''() => {
+                const body = document.body;
+                return {
+                    hasHorizontalOverflow: body.scrollWidth > window.innerWidth,
+                    bodyWidth: body.scrollWidth,
+                    windowWidth: window.innerWidth
+                };
+            }''')
+
+        if overflow['hasHorizontalOverflow']:
+            print(self.overflow_message.format(**vp))
+            print(self.widths_message.format(**overflow))
+            if self.list_offenders or screenshots.mode == 'clip':
+                with timeline.phase('detect', vp['name']):
+                    overflowing = find_overflowing(page, limit=10, tolerance=10)['offenders']
+            if self.list_offenders and overflowing:
+                print("  Overflowing elements:")
+                for el in overflowing:
+                    print(f"    - {el['tag']}.{el['className'][:50]}... right:{el['right']:.0f}px")
+                    print(f"      at {el['selector']}")
+        elif self.clean_message:
+            print(self.clean_message.format(**vp))
+
+        if scroll_sweep:
+            with timeline.phase('sweep', vp['name']):
+                sweep = audit_scroll_positions(page, limit=10, tolerance=10)
+            print(f"  Scroll sweep: {sweep['steps']} step(s), {sweep['roots']} section(s) probed "
+                  f"in {sweep['elapsedMs']}ms")
+            known = {el['selector'] for el in overflowing}
+            for el in sweep['offenders']:
+                if el['selector'] in known:
+                    continue
+                print(f"    - {el['tag']}.{el['className'][:50]}... right:{el['right']:.0f}px "
+                      f"(after scrolling to {el['scrollY']}px)")
+                print(f"      at {el['selector']}")
+                overflowing.append(el)
+
+        # Screenshot
+        safe_path = page_path.replace('/', '_') or '_home'
+        with timeline.phase('screenshot', vp['name']):
+            screenshot_path = screenshots.capture(page, f"{output_dir}/{safe_path}_{vp['name']}",
+                                                  overflowing, overflow['bodyWidth'])
+        print(self.screenshot_message.format(path=screenshot_path))
+
+    def load(self, page, url: str, timeline, track: str, timeout_ms: int = None):
+        with timeline.phase('goto', track):
+            page.goto(url, wait_until=self.wait_until, timeout=timeout_ms or self.timeout_ms)
+        with timeline.phase('ready', track):
+            readiness = wait_until_ready(page)
+        print(f"  Page {describe(readiness)}")
+
+    def run(self, page_path: str, output_dir: str = OUTPUT_DIR, sweep: bool = False,
+            blocker=None, collect_vitals: bool = False, timing: bool = False,
+            screenshots=None, scroll_sweep: bool = False):
+        """Test a page at every viewport.
+
+        With `sweep`, the page is loaded once and resized through the
+        viewports; a fresh context is only opened when `device_key()`
+        changes. A `blocker` (mobile_audit.blocking.RequestBlocker) aborts
+        non-layout requests on every context. `collect_vitals` records Web
+        Vitals and runtime metrics after each page load.
+        `timing` prints per-phase p50/p95/max and writes a Chrome trace to
+        `output_dir`/trace.json. `screenshots` holds ScreenshotWriter options
+        (mode, fmt, quality); the default is a full-page PNG per viewport.
+        `scroll_sweep` also audits each viewport across scroll positions.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+
+        url = f'{BASE_URL}{page_path}'
+        loads = 0
+        measured = {}
+        timeline = Timeline(timing)
+        history = RouteHistory(HISTORY_PATH)
+        writer = ScreenshotWriter(**(screenshots or {}))
+
+        with sync_playwright() as p:
+            with timeline.phase('launch', 'browser'):
+                browser = p.chromium.launch(headless=True)
+            context = None
+            key = None
+
+            for vp in self.viewports:
+                if sweep and context and self.device_key(vp) == key:
+                    print(f"Resizing {url} to {vp['name']}...")
+                    with timeline.phase('resize', vp['name']):
+                        page.set_viewport_size({'width': vp['width'], 'height': vp['height']})
+                    with timeline.phase('ready', vp['name']):
+                        readiness = wait_until_ready(page, timeout_ms=RESIZE_READY_TIMEOUT_MS)
+                    print(f"  Page {describe(readiness)}")
+                else:
+                    if context:
+                        context.close()
+                    with timeline.phase('new_context', vp['name']):
+                        context = browser.new_context(**self.context_options(vp))
+                        key = self.device_key(vp)
+                        if blocker:
+                            blocker.attach(context)
+                            blocker.reset()
+                        if collect_vitals:
+                            context.add_init_script(script=vitals.VITALS_INIT)
+                        page = context.new_page()
+
+                    print(f"Testing {url} at {vp['name']}...")
+                    self.load(page, url, timeline, vp['name'],
+                              history.timeout_ms(f"{page_path}|{vp['name']}", self.timeout_ms))
+                    loads += 1
+                    if blocker:
+                        print(f"  Requests: {request_blocking.describe(blocker.stats, blocker.dry_run)}")
+                    if collect_vitals:
+                        with timeline.phase('vitals', vp['name']):
+                            metrics = page.evaluate(vitals.COLLECT_VITALS)
+                        measured[f"{page_path}|{vp['name']}"] = metrics
+                        print(f"  Vitals: {vitals.describe(metrics)}")
+
+                self.check_viewport(page, page_path, vp, output_dir, writer, timeline, scroll_sweep)
+
+                if not sweep:
+                    with timeline.phase('close', vp['name']):
+                        context.close()
+                    context = None
+
+            if context:
+                context.close()
+            browser.close()
+        errors = writer.close()
+
+        print(f"Page loads: {loads} for {len(self.viewports)} viewport(s)")
+        print(f"Screenshots: {describe_screenshots(writer.files, writer.bytes_written)}")
+        for path, error in errors.items():
+            print(f"  Could not write {path}: {error}")
+        if blocker:
+            blocker.save_sizes()
+        if measured:
+            vitals.record_run(measured, BASE_URL)
+        if timeline.events:
+            print_phase_stats(timeline.events)
+            write_trace(timeline.events, f'{output_dir}/trace.json')
+            print(f"Trace: {output_dir}/trace.json")
+
+
+def argument_parser(description: str) -> argparse.ArgumentParser:
+    """The command line both scripts share."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('page_path', nargs='?', default='/')
+    parser.add_argument('--sweep', action='store_true',
+                        help='load once and resize through the viewports')
+    parser.add_argument('--block-profile', default='off',
+                        help='request blocking profile: off, layout, strict or a JSON file')
+    parser.add_argument('--block-dry-run', action='store_true',
+                        help='let matching requests through and record their sizes')
+    parser.add_argument('--vitals', action='store_true',
+                        help='collect LCP/CLS/TBT, heap, DOM size and bytes after each load')
+    parser.add_argument('--timing', action='store_true',
+                        help='time each phase, print p50/p95/max and write a Chrome trace')
+    parser.add_argument('--screenshot-mode', choices=MODES, default='full',
+                        help='full page, clip to overflowing elements, or first screen only')
+    parser.add_argument('--screenshot-format', choices=FORMATS, default='png',
+                        help='webp needs Pillow')
+    parser.add_argument('--screenshot-quality', type=int, default=80,
+                        help='JPEG/WebP quality, 1-100 (default: 80)')
+    parser.add_argument('--scroll-sweep', action='store_true',
+                        help='also scroll through the page to catch lazy and scroll-animated sections')
+    return parser
+
+
+def run_from_args(audit: PageAudit, args):
+    """Run `audit` with the options argument_parser() parsed."""
+    blocker = None
+    if args.block_profile != 'off' or args.block_dry_run:
+        blocker = request_blocking.RequestBlocker(
+            request_blocking.load_profile(args.block_profile),
+            BASE_URL,
+            dry_run=args.block_dry_run,
+        )
+    audit.run(args.page_path, sweep=args.sweep, blocker=blocker, collect_vitals=args.vitals,
+              timing=args.timing,
+              screenshots={'mode': args.screenshot_mode, 'fmt': args.screenshot_format,
+                           'quality': args.screenshot_quality},
+              scroll_sweep=args.scroll_sweep)
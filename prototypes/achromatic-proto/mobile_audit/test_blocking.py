@@ -0,0 +1,121 @@
+"""Tests for mobile_audit.blocking.
+
+    python -m unittest mobile_audit.test_blocking    (or: python -m pytest mobile_audit/test_blocking.py)
+
+Run from prototypes/achromatic-proto.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from mobile_audit.blocking import PROFILES, RequestBlocker
+
+FIRST_PARTY = 'http://localhost:3011'
+
+
+class Frame:
+    def __init__(self, parent_frame=None):
+        self.parent_frame = parent_frame
+
+
+MAIN_FRAME = Frame()
+SUBFRAME = Frame(parent_frame=MAIN_FRAME)
+
+
+class Request:
+    def __init__(self, url: str, resource_type: str, frame: Frame = MAIN_FRAME):
+        self.url, self.resource_type, self.frame = url, resource_type, frame
+
+
+class ServiceWorkerRequest(Request):
+    @property
+    def frame(self):
+        raise RuntimeError('Service Worker requests do not have an associated frame.')
+
+    @frame.setter
+    def frame(self, value):
+        pass
+
+
+class Route:
+    def __init__(self, request: Request):
+        self.request = request
+        self.outcome = None
+
+    def abort(self, error_code: str = 'failed'):
+        self.outcome = f'abort:{error_code}'
+
+    def fallback(self):
+        self.outcome = 'fallback'
+
+
+class Context:
+    def __init__(self):
+        self.handler = None
+
+    def route(self, pattern: str, handler):
+        self.handler = handler
+
+    def on(self, event: str, handler):
+        pass
+
+
+class RequestBlockerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def blocker(self, profile: str = 'layout', dry_run: bool = False) -> RequestBlocker:
+        return RequestBlocker(PROFILES[profile], FIRST_PARTY, dry_run=dry_run,
+                              sizes_path=str(Path(self.tmp.name) / 'sizes.json'))
+
+    def test_embed_iframes_are_blocked(self):
+        blocker = self.blocker()
+        for url in ('https://www.youtube.com/embed/dQw4w9WgXcQ', 'https://player.vimeo.com/video/76979871',
+                    'https://www.loom.com/embed/abc123', 'https://widget.intercom.io/widget/xyz'):
+            with self.subTest(url=url):
+                self.assertTrue(blocker.matches(Request(url, 'document', SUBFRAME)))
+
+    def test_embed_iframe_is_aborted_on_the_context(self):
+        blocker = self.blocker()
+        context = Context()
+        blocker.attach(context)
+        route = Route(Request('https://www.youtube.com/embed/dQw4w9WgXcQ', 'document', SUBFRAME))
+        context.handler(route)
+        self.assertEqual(route.outcome, 'abort:blockedbyclient')
+        self.assertEqual(blocker.stats['by_type'], {'document': 1})
+
+    def test_dry_run_counts_the_embed_but_lets_it_through(self):
+        blocker = self.blocker(dry_run=True)
+        context = Context()
+        blocker.attach(context)
+        route = Route(Request('https://player.vimeo.com/video/76979871', 'document', SUBFRAME))
+        context.handler(route)
+        self.assertEqual(route.outcome, 'fallback')
+        self.assertEqual(blocker.stats['requests'], 1)
+
+    def test_main_frame_document_is_never_blocked(self):
+        blocker = RequestBlocker({'resource_types': ['document'], 'url_patterns': [r'localhost']},
+                                 FIRST_PARTY, sizes_path=str(Path(self.tmp.name) / 'sizes.json'))
+        self.assertFalse(blocker.matches(Request(f'{FIRST_PARTY}/pricing', 'document')))
+        self.assertTrue(blocker.matches(Request(f'{FIRST_PARTY}/embed', 'document', SUBFRAME)))
+
+    def test_first_party_iframe_is_kept(self):
+        self.assertFalse(self.blocker('strict').matches(Request(f'{FIRST_PARTY}/embed/demo', 'document', SUBFRAME)))
+
+    def test_layout_critical_types_are_kept_even_from_blocked_hosts(self):
+        blocker = self.blocker('strict')
+        for resource_type in ('stylesheet', 'font', 'image'):
+            with self.subTest(resource_type=resource_type):
+                self.assertFalse(blocker.matches(
+                    Request('https://www.youtube.com/embed/player.css', resource_type, SUBFRAME)))
+
+    def test_request_without_a_frame_is_not_treated_as_an_embed(self):
+        request = ServiceWorkerRequest('https://www.youtube.com/embed/x', 'document')
+        self.assertFalse(self.blocker().matches(request))
+
+
+if __name__ == '__main__':
+    unittest.main()
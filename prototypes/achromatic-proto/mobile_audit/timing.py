@@ -0,0 +1,101 @@
+"""Per-phase timing for the audit scripts.
+
+A Timeline records named phases (launch, new_context, goto, ready,
+evaluate, screenshot, ...) as plain dicts, so they can travel inside
+results across processes and through the JSONL stream:
+
+    {'name': 'goto', 'start': <epoch seconds>, 'duration': <seconds>,
+     'track': '/pricing', 'pid': 1234}
+
+`print_phase_stats()` reports p50/p95/max per phase and `write_trace()`
+emits Chrome trace JSON for chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import json
+import math
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class Timeline:
+    """Collects phase events; a disabled timeline records nothing."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.events = []
+
+    @contextmanager
+    def phase(self, name: str, track: str = 'main'):
+        if not self.enabled:
+            yield
+            return
+        start = time.time()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add({'name': name, 'start': start, 'duration': time.perf_counter() - started,
+                      'track': track, 'pid': os.getpid()})
+
+    def add(self, event: dict):
+        self.events.append(event)
+
+
+def _percentile(ordered, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def phase_stats(events) -> dict:
+    """{phase: {'count', 'total', 'p50', 'p95', 'max'}} in order of first appearance."""
+    durations = {}
+    for event in events:
+        durations.setdefault(event['name'], []).append(event['duration'])
+    stats = {}
+    for name, values in durations.items():
+        values.sort()
+        stats[name] = {'count': len(values), 'total': sum(values), 'p50': _percentile(values, 0.5),
+                       'p95': _percentile(values, 0.95), 'max': values[-1]}
+    return stats
+
+
+def print_phase_stats(events):
+    stats = phase_stats(events)
+    if not stats:
+        return
+    overall = sum(row['total'] for row in stats.values()) or 1
+    width = max(len('phase'), *(len(name) for name in stats))
+    print(f"{'phase':<{width}}  {'n':>4}  {'p50 ms':>8}  {'p95 ms':>8}  {'max ms':>8}  {'share':>6}")
+    for name, row in stats.items():
+        print(f"{name:<{width}}  {row['count']:>4}  {row['p50'] * 1000:>8.0f}  "
+              f"{row['p95'] * 1000:>8.0f}  {row['max'] * 1000:>8.0f}  "
+              f"{row['total'] / overall:>6.0%}")
+
+
+def write_trace(events, path: str):
+    """Chrome trace JSON: one complete ('X') event per phase, one thread per track."""
+    events = list(events)
+    origin = min((event['start'] for event in events), default=0)
+    tids = {}
+    trace = []
+    for event in events:
+        pid = event.get('pid', 0)
+        key = (pid, event['track'])
+        if key not in tids:
+            tids[key] = len(tids) + 1
+            trace.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tids[key],
+                          'args': {'name': event['track']}})
+        trace.append({
+            'name': event['name'],
+            'cat': 'audit',
+            'ph': 'X',
+            'ts': round((event['start'] - origin) * 1e6),
+            'dur': round(event['duration'] * 1e6),
+            'pid': pid,
+            'tid': tids[key],
+        })
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'traceEvents': trace, 'displayTimeUnit': 'ms'}))
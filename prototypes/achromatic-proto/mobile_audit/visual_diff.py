@@ -0,0 +1,263 @@
+"""Tile-based visual regression diffing of screenshots against baselines.
+
+Baselines are stored as raw .npy RGB arrays so they can be memory-mapped:
+hundreds of 750x20000 px captures never sit in RAM together, and only the
+band of rows being compared is paged in. Each band is compared tile by
+tile with NumPy. Identical bands and tiles are skipped without further
+work. Differing tiles get a luma-weighted per-pixel distance, and a tile
+only counts as changed when enough pixels move by more than `tolerance`,
+which absorbs anti-aliasing and lossy-encoding noise. Heatmaps are painted
+into the changed tiles only.
+
+    python -m mobile_audit.visual_diff compare [--current DIR] [--baselines DIR]
+    python -m mobile_audit.visual_diff approve [NAME ...]
+
+Needs NumPy and Pillow (pip install numpy pillow).
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    raise SystemExit('Visual diffs need NumPy and Pillow: pip install numpy pillow')
+
+CURRENT_DIR = '/tmp/mobile-tests'
+BASELINE_DIR = '/tmp/mobile-tests/baselines'
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.webp')
+
+TILE = 64
+# Per-pixel distance (0-255 scale) below which a pixel counts as unchanged.
+TOLERANCE = 16
+# Fraction of a tile's pixels that must change for the tile to count.
+MIN_CHANGED = 0.002
+
+# Rec. 601 luma weights: a shift in green is far more visible than in blue.
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def load_image(path) -> np.ndarray:
+    """HxWx3 uint8 array of an image file."""
+    with Image.open(path) as image:
+        return np.asarray(image.convert('RGB'))
+
+
+def load_baseline(path) -> np.ndarray:
+    """Memory-mapped baseline; pages are read only for the rows compared."""
+    return np.load(path, mmap_mode='r')
+
+
+def save_baseline(image: np.ndarray, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp.npy')
+    np.save(tmp, np.ascontiguousarray(image))
+    tmp.replace(path)
+
+
+def _pad(band: np.ndarray, height: int, width: int) -> np.ndarray:
+    """Zero-pad a band to height x width so it reshapes into whole tiles."""
+    if band.shape[0] == height and band.shape[1] == width:
+        return band
+    padded = np.zeros((height, width, 3), dtype=np.uint8)
+    padded[:band.shape[0], :band.shape[1]] = band
+    return padded
+
+
+def _distance(current: np.ndarray, baseline: np.ndarray) -> np.ndarray:
+    """Luma-weighted RGB distance per pixel, 0-255."""
+    delta = current.astype(np.float32) - baseline.astype(np.float32)
+    return np.sqrt(np.square(delta) @ LUMA)
+
+
+def diff_images(current: np.ndarray, baseline: np.ndarray, tile: int = TILE,
+                tolerance: float = TOLERANCE, min_changed: float = MIN_CHANGED):
+    """Compare two HxWx3 arrays tile by tile.
+
+    Returns (report, heat): report is {'tiles', 'changed', 'max_distance',
+    'changed_tiles': [(row, col, changed_fraction)]}; heat maps each changed
+    (row, col) to its tile's per-pixel distance array. Area present in only
+    one image (a page that grew, or overflows wider) counts as changed.
+    """
+    height = max(current.shape[0], baseline.shape[0])
+    width = max(current.shape[1], baseline.shape[1])
+    cols = -(-width // tile)
+    padded_width = cols * tile
+
+    changed_tiles, heat = [], {}
+    max_distance = 0.0
+    tiles = 0
+    for row, top in enumerate(range(0, height, tile)):
+        band_height = min(tile, height - top)
+        tiles += cols
+        cur = current[top:top + tile]
+        base = baseline[top:top + tile]
+        # Early exit for the common case: the whole band is byte-identical.
+        if cur.shape == base.shape and cur.shape[0] == band_height and np.array_equal(cur, base):
+            continue
+
+        cur = _pad(cur, tile, padded_width).reshape(tile, cols, tile, 3).swapaxes(0, 1)
+        base = _pad(base, tile, padded_width).reshape(tile, cols, tile, 3).swapaxes(0, 1)
+        # Only tiles with any differing byte go on to the distance computation.
+        differing = np.flatnonzero((cur != base).reshape(cols, -1).any(axis=1))
+
+        # Pixels outside either image are changed by definition.
+        outside = np.zeros((tile, padded_width), dtype=bool)
+        outside[:band_height, min(current.shape[1], baseline.shape[1]):width] = True
+        if current.shape[0] < top + band_height or baseline.shape[0] < top + band_height:
+            covered = max(0, min(current.shape[0], baseline.shape[0]) - top)
+            outside[covered:band_height, :width] = True
+        outside = outside.reshape(tile, cols, tile).swapaxes(0, 1)
+        differing = np.union1d(differing, np.flatnonzero(outside.reshape(cols, -1).any(axis=1)))
+        if not differing.size:
+            continue
+
+        distance = _distance(cur[differing], base[differing])
+        distance[outside[differing]] = 255.0
+        fractions = (distance > tolerance).reshape(len(differing), -1).mean(axis=1)
+        for index, col in enumerate(differing):
+            if fractions[index] >= min_changed:
+                changed_tiles.append((row, int(col), float(fractions[index])))
+                heat[(row, int(col))] = distance[index]
+                max_distance = max(max_distance, float(distance[index].max()))
+
+    return {'tiles': tiles, 'changed': len(changed_tiles), 'max_distance': round(max_distance, 1),
+            'changed_tiles': changed_tiles}, heat
+
+
+def write_heatmap(current: np.ndarray, heat: dict, path, tile: int = TILE):
+    """The current image, dimmed, with red heat painted into changed tiles only."""
+    overlay = (current.astype(np.float32) * 0.35 + 255 * 0.65).astype(np.uint8)
+    height, width = current.shape[:2]
+    for (row, col), distance in heat.items():
+        top, left = row * tile, col * tile
+        h, w = min(tile, height - top), min(tile, width - left)
+        if h <= 0 or w <= 0:
+            continue
+        alpha = np.clip(distance[:h, :w] / 64.0, 0, 1)[..., None]
+        region = overlay[top:top + h, left:left + w].astype(np.float32)
+        overlay[top:top + h, left:left + w] = (region * (1 - alpha) + np.array([255, 0, 0]) * alpha)
+        # Outline the tile so isolated changes are easy to spot when zoomed out.
+        overlay[top:top + h, left] = overlay[top:top + h, left + w - 1] = (255, 64, 64)
+        overlay[top, left:left + w] = overlay[top + h - 1, left:left + w] = (255, 64, 64)
+    Image.fromarray(overlay).save(path)
+
+
+def screenshots(directory):
+    """{stem: path} of the images directly in `directory`."""
+    return {path.stem: path for path in sorted(Path(directory).iterdir())
+            if path.suffix.lower() in IMAGE_SUFFIXES and not path.stem.endswith('.diff')}
+
+
+def compare_dir(current_dir, baseline_dir, out_dir=None, tile: int = TILE,
+                tolerance: float = TOLERANCE, min_changed: float = MIN_CHANGED):
+    """Diff every screenshot in `current_dir` against `baseline_dir`/<stem>.npy.
+
+    Returns [{'name', 'status', ...}] with status 'new', 'same' or 'changed';
+    heatmaps of changed screenshots go to `out_dir` (default `current_dir`).
+    """
+    out_dir = Path(out_dir or current_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rows = []
+    for name, path in screenshots(current_dir).items():
+        baseline_path = Path(baseline_dir) / f'{name}.npy'
+        if not baseline_path.exists():
+            rows.append({'name': name, 'status': 'new'})
+            continue
+        current = load_image(path)
+        baseline = load_baseline(baseline_path)
+        report, heat = diff_images(current, baseline, tile, tolerance, min_changed)
+        row = {'name': name, 'status': 'changed' if report['changed'] else 'same',
+               'size': f'{current.shape[1]}x{current.shape[0]}',
+               'baseline_size': f'{baseline.shape[1]}x{baseline.shape[0]}',
+               **{key: report[key] for key in ('tiles', 'changed', 'max_distance')}}
+        if heat:
+            row['heatmap'] = str(out_dir / f'{name}.diff.png')
+            write_heatmap(current, heat, row['heatmap'], tile)
+        rows.append(row)
+        del baseline
+    return rows
+
+
+def approve(current_dir, baseline_dir, names=None):
+    """Store current screenshots (all, or just `names`) as the new baselines."""
+    approved = []
+    for name, path in screenshots(current_dir).items():
+        if names and name not in names:
+            continue
+        save_baseline(load_image(path), Path(baseline_dir) / f'{name}.npy')
+        approved.append(name)
+    return approved
+
+
+def print_rows(rows):
+    for row in rows:
+        if row['status'] == 'new':
+            print(f"  NEW      {row['name']} (no baseline)")
+        elif row['status'] == 'same':
+            print(f"  SAME     {row['name']}")
+        else:
+            size = '' if row['size'] == row['baseline_size'] else f", {row['baseline_size']} -> {row['size']}"
+            print(f"  CHANGED  {row['name']}: {row['changed']}/{row['tiles']} tiles, "
+                  f"max distance {row['max_distance']}{size}")
+            print(f"           {row['heatmap']}")
+
+
+def markdown(rows, relative_to='.') -> str:
+    """Results table; heatmap links are relative to the `relative_to` directory."""
+    lines = ['| Screenshot | Status | Changed tiles | Max distance | Heatmap |',
+             '|------------|--------|---------------|--------------|---------|']
+    for row in rows:
+        if row['status'] == 'new':
+            lines.append(f"| {row['name']} | new | - | - | - |")
+        else:
+            heatmap = (f"![diff]({os.path.relpath(row['heatmap'], relative_to)})"
+                       if row.get('heatmap') else '-')
+            lines.append(f"| {row['name']} | {row['status']} | {row['changed']}/{row['tiles']} "
+                         f"| {row['max_distance']} | {heatmap} |")
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mobile_audit.visual_diff')
+    parser.add_argument('--current', default=CURRENT_DIR, help='directory of new screenshots')
+    parser.add_argument('--baselines', default=BASELINE_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compare = commands.add_parser('compare', help='diff screenshots against their baselines')
+    compare.add_argument('--out', help='where heatmaps and diff-report.json go (default: --current)')
+    compare.add_argument('--tile', type=int, default=TILE)
+    compare.add_argument('--tolerance', type=float, default=TOLERANCE,
+                         help=f'per-pixel distance treated as noise, 0-255 (default: {TOLERANCE})')
+    compare.add_argument('--min-changed', type=float, default=MIN_CHANGED,
+                         help=f'fraction of a tile that must change (default: {MIN_CHANGED})')
+    compare.add_argument('--markdown', help='append a results table to this file')
+
+    approve_parser = commands.add_parser('approve', help='store screenshots as the new baselines')
+    approve_parser.add_argument('names', nargs='*', help='screenshot names (default: all)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'approve':
+        approved = approve(args.current, args.baselines, set(args.names))
+        print(f"Approved {len(approved)} baseline(s) in {args.baselines}")
+        return 0
+
+    rows = compare_dir(args.current, args.baselines, args.out, args.tile, args.tolerance,
+                       args.min_changed)
+    report_path = Path(args.out or args.current) / 'diff-report.json'
+    report_path.write_text(json.dumps(rows, indent=2))
+    print(f"Compared {len(rows)} screenshot(s) against {args.baselines}")
+    print_rows(rows)
+    if args.markdown:
+        with open(args.markdown, 'a') as f:
+            f.write(markdown(rows, os.path.dirname(os.path.abspath(args.markdown))))
+    return 1 if any(row['status'] == 'changed' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
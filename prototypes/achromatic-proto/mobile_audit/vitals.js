@@ -0,0 +1,41 @@
+// Init script: starts buffered PerformanceObservers before any page script
+// runs and accumulates into window.__auditVitals for COLLECT_VITALS.
+(() => {
+    if (window.__auditVitals) return;
+    const vitals = window.__auditVitals = { lcp: 0, cls: 0, fcp: null, longTasks: [] };
+
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(callback))
+                .observe({ type, buffered: true });
+        } catch (e) {
+            // Entry type not supported by this browser.
+        }
+    };
+
+    observe('paint', (entry) => {
+        if (entry.name === 'first-contentful-paint') vitals.fcp = entry.startTime;
+    });
+    observe('largest-contentful-paint', (entry) => {
+        vitals.lcp = entry.startTime;
+    });
+
+    // CLS is the largest session window: shifts less than 1s apart, at most 5s long.
+    let session = 0;
+    let sessionStart = 0;
+    let previous = 0;
+    observe('layout-shift', (entry) => {
+        if (entry.hadRecentInput) return;
+        if (entry.startTime - previous > 1000 || entry.startTime - sessionStart > 5000) {
+            session = 0;
+            sessionStart = entry.startTime;
+        }
+        session += entry.value;
+        previous = entry.startTime;
+        vitals.cls = Math.max(vitals.cls, session);
+    });
+
+    observe('longtask', (entry) => {
+        vitals.longTasks.push([entry.startTime, entry.duration]);
+    });
+})();
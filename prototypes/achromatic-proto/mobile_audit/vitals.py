@@ -0,0 +1,144 @@
+"""Core Web Vitals and runtime metrics per route and viewport.
+
+Install VITALS_INIT with `context.add_init_script()` before navigating, then
+evaluate COLLECT_VITALS once the page is settled. Each run is written to
+/tmp/mobile-tests/vitals/run-<timestamp>.json; the compare command flags
+routes that regressed against the previous run:
+
+    python -m mobile_audit.vitals compare [PREVIOUS CURRENT] [--threshold 10]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+VITALS_INIT = (Path(__file__).parent / 'vitals.js').read_text()
+
+COLLECT_VITALS = '''() => {
+    const vitals = window.__auditVitals || { lcp: 0, cls: 0, fcp: null, longTasks: [] };
+    const fcp = vitals.fcp || 0;
+    // Blocking time of long tasks that end after first contentful paint.
+    const tbt = vitals.longTasks.reduce((sum, [start, duration]) =>
+        start + duration > fcp ? sum + Math.max(0, duration - 50) : sum, 0);
+    const navigation = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    const transferred = resources.reduce((sum, entry) => sum + (entry.transferSize || 0),
+        navigation ? navigation.transferSize : 0);
+    return {
+        lcpMs: Math.round(vitals.lcp),
+        cls: Math.round(vitals.cls * 10000) / 10000,
+        tbtMs: Math.round(tbt),
+        longTasks: vitals.longTasks.length,
+        jsHeapBytes: performance.memory ? performance.memory.usedJSHeapSize : null,
+        domNodes: document.getElementsByTagName('*').length,
+        transferredBytes: transferred,
+        requests: resources.length + 1,
+    };
+}'''
+
+VITALS_DIR = '/tmp/mobile-tests/vitals'
+
+# Smallest absolute change that counts as a regression, so noise on tiny
+# values (0.001 CLS, one extra long task) does not trip the percentage.
+NOISE_FLOOR = {
+    'lcpMs': 100,
+    'cls': 0.02,
+    'tbtMs': 50,
+    'longTasks': 2,
+    'jsHeapBytes': 1024 * 1024,
+    'domNodes': 100,
+    'transferredBytes': 50 * 1024,
+}
+
+
+def describe(metrics: dict) -> str:
+    """One-line summary, e.g. 'LCP 1840ms CLS 0.012 TBT 120ms (3 long tasks) 2140 nodes 1.8 MB'."""
+    return (f"LCP {metrics['lcpMs']}ms CLS {metrics['cls']:.3f} TBT {metrics['tbtMs']}ms "
+            f"({metrics['longTasks']} long tasks) {metrics['domNodes']} nodes "
+            f"{metrics['transferredBytes'] / 1024 / 1024:.1f} MB")
+
+
+def write_run(pages: dict, base_url: str, directory: str = VITALS_DIR) -> Path:
+    """Write {'route|viewport': metrics} as a new run file and return its path."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / time.strftime('run-%Y%m%d-%H%M%S.json')
+    path.write_text(json.dumps({
+        'run_at': time.time(),
+        'base_url': base_url,
+        'pages': pages,
+    }, indent=2, sort_keys=True))
+    return path
+
+
+def runs(directory: str = VITALS_DIR):
+    """Run files, oldest first."""
+    return sorted(Path(directory).glob('run-*.json'))
+
+
+def compare_runs(previous: dict, current: dict, threshold_pct: float = 10.0):
+    """Metrics that got worse by more than `threshold_pct` and the noise floor.
+
+    Returns [(key, metric, before, after, change_pct)], largest change first.
+    Only keys present in both runs are compared.
+    """
+    regressions = []
+    for key in sorted(previous['pages'].keys() & current['pages'].keys()):
+        before_metrics, after_metrics = previous['pages'][key], current['pages'][key]
+        for metric, floor in NOISE_FLOOR.items():
+            before, after = before_metrics.get(metric), after_metrics.get(metric)
+            if before is None or after is None or after - before < floor:
+                continue
+            change = (after - before) / before * 100 if before else float('inf')
+            if change > threshold_pct:
+                regressions.append((key, metric, before, after, change))
+    return sorted(regressions, key=lambda item: -item[4])
+
+
+def print_regressions(regressions, previous_path, current_path):
+    print(f"Comparing {Path(current_path).name} against {Path(previous_path).name}")
+    if not regressions:
+        print("No regressions.")
+        return
+    print(f"{len(regressions)} regression(s):")
+    for key, metric, before, after, change in regressions:
+        change_text = 'new' if change == float('inf') else f'+{change:.0f}%'
+        print(f"  {key}: {metric} {before} -> {after} ({change_text})")
+
+
+def record_run(pages: dict, base_url: str, directory: str = VITALS_DIR,
+               threshold_pct: float = 10.0) -> Path:
+    """Write a run and print its regressions against the previous one."""
+    previous = runs(directory)[-1:]
+    path = write_run(pages, base_url, directory)
+    print(f"Vitals for {len(pages)} page(s) written to {path}")
+    if previous:
+        regressions = compare_runs(json.loads(previous[0].read_text()),
+                                   json.loads(path.read_text()), threshold_pct)
+        print_regressions(regressions, previous[0], path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mobile_audit.vitals')
+    commands = parser.add_subparsers(dest='command', required=True)
+    compare = commands.add_parser('compare', help='flag routes that regressed against a previous run')
+    compare.add_argument('runs', nargs='*', help='PREVIOUS CURRENT run files (default: the two latest)')
+    compare.add_argument('--threshold', type=float, default=10.0, help='percent worse to flag (default: 10)')
+    compare.add_argument('--dir', default=VITALS_DIR)
+    args = parser.parse_args(argv)
+
+    paths = args.runs or runs(args.dir)[-2:]
+    if len(paths) != 2:
+        parser.error('need two run files to compare')
+    previous, current = (json.loads(Path(path).read_text()) for path in paths)
+
+    regressions = compare_runs(previous, current, args.threshold)
+    print_regressions(regressions, *paths)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
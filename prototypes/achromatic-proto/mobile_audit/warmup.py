@@ -0,0 +1,129 @@
+"""Pre-audit stage: warm the Next.js dev compiler, or serve a production build.
+
+In dev mode the first request to each route compiles it, which used to
+happen inside the audit's goto timeout. `warm_routes()` requests every
+route in parallel up front and reports time-to-first-byte before and after.
+`ProductionServer` builds the marketing app and runs `next start` instead,
+so there is nothing to compile at all.
+"""
+
+import http.client
+import os
+import signal
+import subprocess
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from mobile_audit import APP_ROOT
+
+
+def measure_ttfb(url: str, timeout: float = 120) -> float:
+    """Seconds until the response headers arrive; the body is drained afterwards."""
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    connection = connection_class(parts.netloc, timeout=timeout)
+    try:
+        started = time.perf_counter()
+        connection.request('GET', parts.path or '/', headers={'Accept': 'text/html'})
+        response = connection.getresponse()
+        ttfb = time.perf_counter() - started
+        response.read()
+        if response.status >= 500:
+            raise RuntimeError(f'HTTP {response.status}')
+        return ttfb
+    finally:
+        connection.close()
+
+
+def _sweep(base_url: str, routes, workers: int, timeout: float) -> dict:
+    def fetch(route):
+        try:
+            return route, measure_ttfb(f'{base_url}{route}', timeout)
+        except Exception as e:
+            return route, e
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(fetch, routes))
+
+
+def warm_routes(base_url: str, routes, workers: int = 8, timeout: float = 120):
+    """Request every route twice in parallel; returns {route: (before, after)}.
+
+    Values are TTFB seconds, or the exception raised for that request.
+    """
+    before = _sweep(base_url, routes, workers, timeout)
+    after = _sweep(base_url, routes, workers, timeout)
+    return {route: (before[route], after[route]) for route in routes}
+
+
+def print_ttfb_report(timings: dict):
+    def cell(value):
+        return f'{value * 1000:>8.0f}ms' if isinstance(value, float) else f'{"ERROR":>10}'
+
+    width = max(len(route) for route in timings)
+    print(f"{'Route':<{width}}  {'cold TTFB':>10}  {'warm TTFB':>10}")
+    for route, (before, after) in timings.items():
+        print(f"{route:<{width}}  {cell(before)}  {cell(after)}")
+        for value in (before, after):
+            if not isinstance(value, float):
+                print(f"{'':<{width}}    {value}")
+                break
+
+    cold = [before for before, _ in timings.values() if isinstance(before, float)]
+    warm = [after for _, after in timings.values() if isinstance(after, float)]
+    if cold and warm:
+        print(f"{'total':<{width}}  {sum(cold):>9.1f}s  {sum(warm):>9.1f}s")
+
+
+class ProductionServer:
+    """`with ProductionServer(port) as base_url:` builds and runs `next start`."""
+
+    def __init__(self, port: int = 3111, build: bool = True, startup_timeout: float = 60):
+        self.port = port
+        self.build = build
+        self.startup_timeout = startup_timeout
+        self.process = None
+
+    @property
+    def base_url(self) -> str:
+        return f'http://localhost:{self.port}'
+
+    def __enter__(self) -> str:
+        if self.build:
+            print("Building marketing app (pnpm --filter marketing build)...")
+            subprocess.run(['pnpm', '--filter', 'marketing', 'build'], cwd=APP_ROOT, check=True)
+
+        print(f"Starting next start on port {self.port}...")
+        self.process = subprocess.Popen(
+            ['pnpm', '--filter', 'marketing', 'exec', 'next', 'start', '--port', str(self.port)],
+            cwd=APP_ROOT,
+            stdout=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        self._wait_healthy()
+        return self.base_url
+
+    def _wait_healthy(self):
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'next start exited with code {self.process.returncode}')
+            try:
+                with urllib.request.urlopen(f'{self.base_url}/api/health', timeout=2):
+                    return
+            except OSError:
+                time.sleep(0.5)
+        self.__exit__(None, None, None)
+        raise TimeoutError(f'next start did not answer /api/health within {self.startup_timeout:.0f}s')
+
+    def __exit__(self, *exc):
+        if self.process and self.process.poll() is None:
+            # pnpm forks next; stop the whole session.
+            os.killpg(self.process.pid, signal.SIGTERM)
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+        self.process = None
@@ -0,0 +1,99 @@
+"""Warm-browser watch daemon: re-audit the routes a saved file affects.
+
+Keeps one Chromium and one open page per viewport for the whole session,
+so a save costs a navigation and the probes, not Python startup, the
+Playwright import and a browser launch. Sources are polled (no extra
+dependency); the import graph maps changed files to routes, and all
+viewports of a route are audited in parallel.
+"""
+
+import asyncio
+import time
+
+from playwright.async_api import async_playwright
+
+from mobile_audit.imports import ImportGraph
+from mobile_audit.overflow import find_overflowing
+from mobile_audit.readiness import wait_until_ready
+
+POLL_SECONDS = 0.2
+# Editors often write a file in several steps; wait this long for them to finish.
+DEBOUNCE_SECONDS = 0.1
+
+BODY_OVERFLOW = '() => document.body.scrollWidth - window.innerWidth'
+
+
+class WatchDaemon:
+    """`WatchDaemon(base_url, viewports, context_options).run(['/pricing'])` until Ctrl-C."""
+
+    def __init__(self, base_url: str, viewports, context_options, graph=None,
+                 tolerance: int = 10, timeout_ms: int = 30000):
+        self.base_url = base_url
+        self.viewports = viewports
+        self.context_options = context_options
+        self.graph = graph or ImportGraph()
+        self.tolerance = tolerance
+        self.timeout_ms = timeout_ms
+        self.pages = {}
+
+    async def _check(self, vp: dict, route: str) -> str:
+        page = self.pages[vp['name']]
+        await page.goto(f'{self.base_url}{route}', wait_until='domcontentloaded',
+                        timeout=self.timeout_ms)
+        await wait_until_ready(page)
+        excess = await page.evaluate(BODY_OVERFLOW)
+        if excess <= 0:
+            return 'OK'
+        offenders = (await find_overflowing(page, limit=3, tolerance=self.tolerance))['offenders']
+        text = f'OVERFLOW +{excess}px'
+        for el in offenders:
+            text += f"\n      {el['tag']} right:{el['right']:.0f}px at {el['selector']}"
+        return text
+
+    async def audit(self, route: str):
+        started = time.perf_counter()
+        checks = await asyncio.gather(*(self._check(vp, route) for vp in self.viewports),
+                                      return_exceptions=True)
+        elapsed = time.perf_counter() - started
+        for vp, status in zip(self.viewports, checks):
+            if isinstance(status, Exception):
+                status = f'ERROR: {str(status).splitlines()[0]}'
+            print(f"  {route} @ {vp['name']}: {status}")
+        print(f"  ({elapsed:.2f}s)", flush=True)
+
+    async def _watch(self, initial_routes):
+        launched = time.perf_counter()
+        self.graph.refresh()
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            for vp in self.viewports:
+                context = await browser.new_context(**self.context_options(vp))
+                self.pages[vp['name']] = await context.new_page()
+            print(f"Watching {len(self.graph.mtimes)} file(s), {len(self.graph.routes())} route(s); "
+                  f"browser ready in {time.perf_counter() - launched:.1f}s. Ctrl-C to stop.\n")
+
+            for route in initial_routes:
+                await self.audit(route)
+
+            while True:
+                await asyncio.sleep(POLL_SECONDS)
+                changed = self.graph.refresh()
+                if not changed:
+                    continue
+                await asyncio.sleep(DEBOUNCE_SECONDS)
+                changed |= self.graph.refresh()
+
+                names = ', '.join(sorted(path.name for path in changed))
+                routes = self.graph.routes_for(changed)
+                if not routes:
+                    print(f"{time.strftime('%H:%M:%S')} {names}: no route imports it")
+                    continue
+                print(f"{time.strftime('%H:%M:%S')} {names}: {len(routes)} route(s)")
+                for route in routes:
+                    await self.audit(route)
+
+    def run(self, initial_routes=()):
+        try:
+            asyncio.run(self._watch(initial_routes))
+        except KeyboardInterrupt:
+            print("\nStopped.")
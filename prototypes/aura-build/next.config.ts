@@ -14,6 +14,17 @@ const nextConfig: NextConfig = {
       "@phosphor-icons/react/dist/ssr",
     ],
   },
+  // Content-hashed assets from download_assets.py never change under the same name.
+  async headers() {
+    return [
+      {
+        source: "/hashed/:path*",
+        headers: [
+          { key: "Cache-Control", value: "public, max-age=31536000, immutable" },
+        ],
+      },
+    ];
+  },
 };
 
 export default nextConfig;
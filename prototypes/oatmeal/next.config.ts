@@ -20,6 +20,17 @@ const nextConfig: NextConfig = {
       'tailwind-merge',
     ],
   },
+  // Content-hashed assets from download_assets.py never change under the same name.
+  async headers() {
+    return [
+      {
+        source: '/hashed/:path*',
+        headers: [
+          { key: 'Cache-Control', value: 'public, max-age=31536000, immutable' },
+        ],
+      },
+    ]
+  },
 }
 
 export default nextConfig
@@ -32,7 +32,7 @@ show_help() {
     echo "Arguments:"
     echo "  phase         Phase to compare: a, b, or all (default: all)"
     echo "  --lighthouse  Run Lighthouse audits (requires Chrome)"
-    echo "  --screenshots Capture screenshots (requires Playwright)"
+    echo "  --screenshots Capture screenshots and diff them against baselines (requires Playwright)"
     echo ""
     echo "Examples:"
     echo "  $0 a                       # Compare Phase A prototypes"
@@ -208,6 +208,18 @@ if [ "$RUN_SCREENSHOTS" = true ]; then
                 echo "" >> "$REPORT_FILE"
             fi
         done
+
+        # Diff against the approved baselines (needs numpy and pillow)
+        BASELINES_DIR="$REPORTS_DIR/baselines"
+        echo -e "${BLUE}Comparing screenshots against baselines...${NC}"
+        echo "### Visual diff" >> "$REPORT_FILE"
+        echo "" >> "$REPORT_FILE"
+        if ! (cd "$PROTOTYPES_DIR/achromatic-proto" && python3 -m mobile_audit.visual_diff \
+                --current "$SCREENSHOTS_DIR" --baselines "$BASELINES_DIR" \
+                compare --markdown "$REPORT_FILE"); then
+            echo -e "${YELLOW}Screenshots changed (or the diff could not run). To accept them:${NC}"
+            echo "  cd $PROTOTYPES_DIR/achromatic-proto && python3 -m mobile_audit.visual_diff --current $SCREENSHOTS_DIR --baselines $BASELINES_DIR approve"
+        fi
     fi
 fi
 